@@ -3,9 +3,29 @@ from phito_projen import PythonPackage
 project = PythonPackage(
     name="phitoduck-projen",
     module_name="phito_projen",
-    install_requires=["projen", "jinja2"],
+    install_requires=["projen", "jinja2", 'importlib-resources>=1.3; python_version<"3.9"'],
     version="0.1.1",
 )
 project.manifest_in.add_recursive_include("src/", "*template*", comment="include template files for rendering components")
+project.manifest_in.add_recursive_include("src/phito_projen/samples/", "*", comment="include the files of sample apps")
+project.manifest_in.add_include(
+    "src/phito_projen/template-manifest.json",
+    comment="listing of the files above; regenerate with `python -m phito_projen.template_manifest`",
+)
+project.manifest_in.add_global_exclude("*.py[co]", comment="exclude bytecode, e.g. from __pycache__ directories of samples")
+project.gitignore.add_patterns(
+    ".pytest_cache/",
+    ".mypy_cache/",
+    ".ruff_cache/",
+    ".tox/",
+    ".nox/",
+    "*.so",
+    "/benchmarks/results/",
+    "/test_output.txt",
+    "/bench_output.txt",
+    "/REVIEW_DIFF.patch",
+    "/requests.jsonl",
+    "/FEATURE_REQUESTS.md",
+)
 
 project.synth()
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Benchmark linting a generated package with pylint's defaults and with the fast ``PylintRc`` profile.
+
+A ``PythonPackage`` with a ``PylintRc`` is synthesized into a temporary directory and
+filled with ``--modules`` generated modules (plus a ``build/`` directory of copies, as
+left behind by ``python -m build``). Pylint is then run on the whole package directory,
+once with an empty ``.pylintrc`` and once with the generated one:
+
+.. code-block:: bash
+
+    python benchmarks/bench_pylint.py --modules 200 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+THIS_DIR = Path(__file__).parent
+REPO_DIR = THIS_DIR.parent
+
+MODULE_TEMPLATE = '''"""Generated module {i}."""
+
+import json
+from typing import Dict, List, Optional
+
+
+class Record{i}:
+    """A record with a few fields."""
+
+    def __init__(self, name: str, values: Optional[List[int]] = None) -> None:
+        self.name = name
+        self.values = values or []
+
+    def total(self) -> int:
+        """Sum the values."""
+        result = 0
+        for value in self.values:
+            if value > 0:
+                result += value
+            else:
+                result -= value
+        return result
+
+    def to_json(self) -> str:
+        """Serialize the record."""
+        return json.dumps({{"name": self.name, "values": self.values}})
+
+
+def load_records_{i}(payload: str) -> List[Record{i}]:
+    """Parse records from JSON."""
+    data: List[Dict] = json.loads(payload)
+    return [Record{i}(item["name"], item.get("values")) for item in data]
+'''
+
+TResult = Dict[str, Any]
+
+
+def make_package(root: Path, n_modules: int) -> Path:
+    """Synthesize a package with a fast ``.pylintrc`` into ``root`` and add ``n_modules`` modules to it."""
+    projenrc = (
+        "from phito_projen import PythonPackage\n"
+        "from phito_projen.components.pylint import PylintRc\n"
+        "package = PythonPackage(name='bench-pkg', module_name='bench_pkg', version='0.0.0')\n"
+        "PylintRc(package)\n"
+        "package.synth()\n"
+    )
+    (root / ".projenrc.py").write_text(projenrc)
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(REPO_DIR / "src"),
+        "JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION": "1",
+    }
+    subprocess.run([sys.executable, ".projenrc.py"], cwd=root, env=env, check=True, capture_output=True)
+
+    pkg_dir: Path = root / "src" / "bench_pkg"
+    for i in range(n_modules):
+        (pkg_dir / f"module_{i}.py").write_text(MODULE_TEMPLATE.format(i=i))
+    # stale build artifacts, which the default configuration lints too
+    shutil.copytree(pkg_dir, root / "build" / "lib" / "bench_pkg")
+    return root
+
+
+def time_pylint(root: Path, rcfile: Path, repeat: int) -> TResult:
+    seconds: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "pylint", f"--rcfile={rcfile}", "--recursive=y", "."],
+            cwd=root,
+            capture_output=True,
+        )
+        seconds.append(time.perf_counter() - start)
+    return {"median_seconds": statistics.median(seconds), "seconds": seconds}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", type=int, default=200, help="number of modules in the generated package")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="also save the results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="phito-projen-pylint-bench-") as tmp_dir:
+        root: Path = make_package(Path(tmp_dir), n_modules=args.modules)
+        empty_rcfile: Path = root / "empty.pylintrc"
+        empty_rcfile.write_text("")
+        results: Dict[str, TResult] = {
+            "default": time_pylint(root, rcfile=empty_rcfile, repeat=args.repeat),
+            "fast": time_pylint(root, rcfile=root / ".pylintrc", repeat=args.repeat),
+        }
+
+    default_seconds: float = results["default"]["median_seconds"]
+    fast_seconds: float = results["fast"]["median_seconds"]
+    print(f"{args.modules} modules, median of {args.repeat} runs, {os.cpu_count()} CPUs")
+    print(f"  pylint defaults: {default_seconds:8.2f} s")
+    print(f"  fast profile:    {fast_seconds:8.2f} s  ({default_seconds / fast_seconds:.1f}x faster)")
+    if args.output:
+        args.output.write_text(json.dumps({"n_modules": args.modules, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Check that importing ``phito_projen`` stays cheap.
+
+``import phito_projen`` and its standard-library-only helpers (validators, extras)
+must not start the ``projen`` runtime or import any other heavy dependency, and
+must finish within a time budget. Exits non-zero if either check fails, so it
+can gate CI:
+
+.. code-block:: bash
+
+    python benchmarks/import_time.py --budget-ms 100
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List
+
+IMPORT_STATEMENT = (
+    "import phito_projen, phito_projen.components; "
+    "from phito_projen import validate_python_module_name, union_extras_dicts, flatten_extras"
+)
+"""The imports tooling is expected to be able to do cheaply."""
+
+HEAVY_MODULES = ["projen", "jsii", "jinja2", "pydantic", "constructs"]
+"""Top-level modules that must not be imported by ``IMPORT_STATEMENT``."""
+
+DEFAULT_BUDGET_MS = 100.0
+
+
+def measure_imports(statement: str) -> Dict[str, float]:
+    """Run ``statement`` in a fresh interpreter and return the cumulative import time in ms of every module it imported."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_ms: Dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line[len("import time:") :].split("|")
+        cumulative_ms[module.strip()] = int(cumulative_us) / 1000
+    return cumulative_ms
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    cumulative_ms: Dict[str, float] = measure_imports(IMPORT_STATEMENT)
+    heavy_imports: List[str] = sorted(
+        module for module in cumulative_ms if module.split(".")[0] in HEAVY_MODULES
+    )
+    elapsed_ms: float = cumulative_ms.get("phito_projen", 0.0) + cumulative_ms.get(
+        "phito_projen.components", 0.0
+    )
+
+    print(f"import phito_projen: {elapsed_ms:.1f} ms (budget: {args.budget_ms:.1f} ms)")
+    if heavy_imports:
+        print(f"FAIL: heavy modules were imported: {', '.join(heavy_imports)}")
+        return 1
+    if elapsed_ms > args.budget_ms:
+        print("FAIL: import time is over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+Benchmark synthesizing mono-repos of ``PythonPackage`` subprojects.
+
+Each scenario synthesizes ``N`` subprojects into a fresh temporary directory, in a
+fresh interpreter (so each run pays for, and measures, its own jsii runtime), and
+records wall time, peak RSS and per-file throughput. Results are saved as JSON so
+that runs from two commits can be compared:
+
+.. code-block:: bash
+
+    python benchmarks/synth_benchmark.py run --output before.json
+    git checkout my-branch
+    python benchmarks/synth_benchmark.py run --output after.json
+    python benchmarks/synth_benchmark.py compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+THIS_DIR = Path(__file__).parent
+REPO_DIR = THIS_DIR.parent
+
+DEFAULT_SIZES = [1, 10, 100, 1000]
+SCENARIOS = ["minimal", "full"]
+"""
+``minimal``: ``PythonPackage`` with default arguments.
+``full``: additionally a ``MANIFEST.in``, the ``SampleFastAPIApp`` and large ``install_requires``/``extras_require``.
+"""
+
+N_INSTALL_REQUIRES = 100
+N_EXTRAS = 10
+N_REQUIREMENTS_PER_EXTRA = 25
+
+TResult = Dict[str, Any]
+
+
+def synthesize_scenario(scenario: str, n_packages: int, outdir: Path) -> TResult:
+    """Build and synthesize one scenario in this process; meant to run in a fresh interpreter."""
+    os.environ.setdefault("JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION", "1")
+
+    start = time.perf_counter()
+    from projen import Project
+
+    from phito_projen import PythonPackage
+    from phito_projen.samples.fastapi_app import SampleFastAPIApp
+
+    imported = time.perf_counter()
+    repo = Project(name="benchmark-repo", outdir=str(outdir))
+    for i in range(n_packages):
+        kwargs: Dict[str, Any] = {}
+        if scenario == "full":
+            kwargs["install_requires"] = [f"requirement-{j}>={j}.0" for j in range(N_INSTALL_REQUIRES)]
+            kwargs["additional_extras_require"] = {
+                f"extra-{k}": [f"extra-{k}-requirement-{j}" for j in range(N_REQUIREMENTS_PER_EXTRA)]
+                for k in range(N_EXTRAS)
+            }
+        package = PythonPackage(
+            parent=repo,
+            name=f"package-{i}",
+            module_name=f"package_{i}",
+            version="0.0.0",
+            **kwargs,
+        )
+        if scenario == "full":
+            package.manifest_in.add_recursive_include("src/", "*template*", comment="templates")
+            SampleFastAPIApp(project=package)
+
+    constructed = time.perf_counter()
+    repo.synth()
+    synthesized = time.perf_counter()
+
+    n_files = sum(len(files) for _, _, files in os.walk(outdir))
+    synth_seconds = synthesized - constructed
+    return {
+        "scenario": scenario,
+        "n_packages": n_packages,
+        "import_seconds": imported - start,
+        "construct_seconds": constructed - imported,
+        "synth_seconds": synth_seconds,
+        "wall_seconds": synthesized - start,
+        "n_files": n_files,
+        "files_per_second": n_files / synth_seconds if synth_seconds else None,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_rss_with_children_mb": _peak_rss_with_children_mb(),
+    }
+
+
+def _peak_rss_with_children_mb() -> Optional[float]:
+    """Peak RSS of this process plus its live children (i.e. the node process behind jsii); Linux only."""
+    pids: List[str] = [str(os.getpid())]
+    children_fpath = Path(f"/proc/{os.getpid()}/task/{os.getpid()}/children")
+    if not children_fpath.exists():
+        return None
+    pids.extend(children_fpath.read_text().split())
+
+    total_kb = 0
+    for pid in pids:
+        try:
+            status: str = Path(f"/proc/{pid}/status").read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith("VmHWM:"):
+                total_kb += int(line.split()[1])
+    return total_kb / 1024
+
+
+def run_in_subprocess(scenario: str, n_packages: int) -> TResult:
+    with tempfile.TemporaryDirectory(prefix="phito-projen-bench-") as tmp_dir:
+        completed = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "_worker",
+                "--scenario",
+                scenario,
+                "--n-packages",
+                str(n_packages),
+                "--outdir",
+                str(Path(tmp_dir) / "repo"),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join([str(REPO_DIR / "src"), os.environ.get("PYTHONPATH", "")])},
+        )
+    # the last line of stdout is the result; projen may log above it
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run(sizes: List[int], scenarios: List[str], repeat: int) -> Dict[str, Any]:
+    results: List[TResult] = []
+    for scenario in scenarios:
+        for n_packages in sizes:
+            runs = [run_in_subprocess(scenario, n_packages) for _ in range(repeat)]
+            result = min(runs, key=lambda r: r["synth_seconds"])
+            result["synth_seconds_median"] = statistics.median(r["synth_seconds"] for r in runs)
+            result["repeat"] = repeat
+            results.append(result)
+            print(
+                f"{scenario:>8} {n_packages:>5} packages: "
+                f"synth {result['synth_seconds']:.2f}s, wall {result['wall_seconds']:.2f}s, "
+                f"{result['files_per_second'] or 0:.0f} files/s, peak RSS {result['peak_rss_mb']:.0f} MB",
+                file=sys.stderr,
+            )
+    return {"metadata": _collect_metadata(), "results": results}
+
+
+def _collect_metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(before: Dict[str, Any], after: Dict[str, Any]) -> str:
+    """Return a table of how each scenario's metrics changed between two result files."""
+    rows: List[str] = [
+        f"before: {before['metadata'].get('commit')}",
+        f"after:  {after['metadata'].get('commit')}",
+        "",
+        f"{'scenario':>8} {'N':>5} {'synth before':>13} {'synth after':>12} {'ratio':>6} {'RSS before':>11} {'RSS after':>10}",
+    ]
+    before_by_key = {(r["scenario"], r["n_packages"]): r for r in before["results"]}
+    for result in after["results"]:
+        previous = before_by_key.get((result["scenario"], result["n_packages"]))
+        if previous is None:
+            continue
+        rows.append(
+            f"{result['scenario']:>8} {result['n_packages']:>5} "
+            f"{previous['synth_seconds']:>12.2f}s {result['synth_seconds']:>11.2f}s "
+            f"{result['synth_seconds'] / previous['synth_seconds']:>6.2f} "
+            f"{previous['peak_rss_mb']:>8.0f} MB {result['peak_rss_mb']:>7.0f} MB"
+        )
+    return "\n".join(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks and save the results")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--output", type=Path, default=None)
+
+    compare_parser = subparsers.add_parser("compare", help="compare two saved results")
+    compare_parser.add_argument("before", type=Path)
+    compare_parser.add_argument("after", type=Path)
+
+    worker_parser = subparsers.add_parser("_worker")
+    worker_parser.add_argument("--scenario", choices=SCENARIOS, required=True)
+    worker_parser.add_argument("--n-packages", type=int, required=True)
+    worker_parser.add_argument("--outdir", type=Path, required=True)
+
+    args = parser.parse_args(argv)
+    if args.command == "_worker":
+        print(json.dumps(synthesize_scenario(args.scenario, args.n_packages, args.outdir)))
+    elif args.command == "run":
+        results = run(sizes=args.sizes, scenarios=args.scenarios, repeat=args.repeat)
+        output: Path = args.output or THIS_DIR / "results" / f"{results['metadata']['commit'] or 'unknown'}.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2))
+        print(f"results written to {output}", file=sys.stderr)
+    elif args.command == "compare":
+        print(compare(json.loads(args.before.read_text()), json.loads(args.after.read_text())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,40 @@
-"""Modules for phitoduck-projen."""
+"""
+Modules for phitoduck-projen.
 
-from .python_package import PythonPackage
+Attributes are loaded lazily, so importing ``phito_projen`` (or e.g.
+``phito_projen.validate_python_module_name``) does not start the ``projen``
+runtime until ``PythonPackage`` is actually used.
+"""
 
-__all__ = ["PythonPackage"]
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+from phito_projen._lazy import make_lazy_module_attributes
+
+if TYPE_CHECKING:
+    from .extras import flatten_extras, merge_extras, union_extras_dicts
+    from .python_package import PythonPackage
+    from .requirement_set import RequirementSet
+    from .validators import InvalidPythonModuleNameError, validate_python_module_name
+
+__all__ = [
+    "PythonPackage",
+    "InvalidPythonModuleNameError",
+    "validate_python_module_name",
+    "RequirementSet",
+    "merge_extras",
+    "union_extras_dicts",
+    "flatten_extras",
+]
+
+__getattr__, __dir__ = make_lazy_module_attributes(
+    __name__,
+    {
+        "PythonPackage": ".python_package",
+        "InvalidPythonModuleNameError": ".validators",
+        "validate_python_module_name": ".validators",
+        "RequirementSet": ".requirement_set",
+        "merge_extras": ".extras",
+        "union_extras_dicts": ".extras",
+        "flatten_extras": ".extras",
+    },
+)
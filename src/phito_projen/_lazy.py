@@ -0,0 +1,34 @@
+"""Lazy attribute loading for packages (PEP 562)."""
+
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def make_lazy_module_attributes(
+    package_name: str, attribute_modules: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Return ``__getattr__`` and ``__dir__`` functions for a package's ``__init__.py``.
+
+    The submodule defining an attribute is only imported the first time the attribute
+    is accessed, so importing the package itself stays cheap.
+
+    :param package_name: ``__name__`` of the package
+    :param attribute_modules: maps each lazily loaded attribute to the module defining it,
+        relative to the package, e.g. ``{"PythonPackage": ".python_package"}``
+    """
+    package_globals: Dict[str, Any] = import_module(package_name).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module_name: str = attribute_modules.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        value: Any = getattr(import_module(module_name, package_name), name)
+        # cache the attribute so that later lookups do not go through __getattr__
+        package_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(package_globals) | set(attribute_modules))
+
+    return __getattr__, __dir__
@@ -0,0 +1,4 @@
+# ~~ Generated by projen. To modify, edit .projenrc.js and run "npx projen".
+"""The version of the package, as set in ``.projenrc.py``."""
+
+__version__ = "0.1.1"
\ No newline at end of file
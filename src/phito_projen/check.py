@@ -0,0 +1,195 @@
+"""
+Check that a project's synthesized files are up to date, without writing anything.
+
+.. code-block:: bash
+
+    python .projenrc.py --check      # exit with status 1 at the first out-of-date file
+    python .projenrc.py --check-all  # list every out-of-date file, with a diff
+
+The components are prepared for synthesis as usual, but each file is then rendered
+in memory and compared with the file on disk. Nothing in the working tree is created,
+modified or deleted, so the check is safe and fast enough for pre-merge CI.
+
+``PythonPackage.synth()`` runs the check when the flags are passed to a ``.projenrc.py``
+whose root project is a ``PythonPackage``. For a mono-repo whose root is a plain
+``projen.Project``, call ``synth_or_check(repo)`` instead of ``repo.synth()``.
+
+Only files whose contents are computed in Python, or are plain lines, can be rendered
+outside of ``projen``'s own synthesis (e.g. ``setup.cfg``, ``pyproject.toml``, ``MANIFEST.in``
+and ``.gitignore``). Files such as ``.projen/deps.json`` hold values that only ``projen``
+can resolve; they are listed as unchecked. Sample files are only checked for existence.
+"""
+
+import difflib
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from projen import FileBase, GitAttributesFile, IgnoreFile, Project, TextFile
+
+from phito_projen.components.incremental_files import (
+    _PASS_THROUGH_RESOLVER,
+    IncrementalTomlFile,
+    get_file_hash_manifest,
+)
+from phito_projen.components.lazy_sample_file import DirectoryIndex, LazySampleDir, LazySampleFile, get_directory_index
+from phito_projen.file_hash_manifest import FileHashManifest
+from phito_projen.instrumentation import trace_span
+from phito_projen.synth import iter_projects
+
+CHECK_FLAG = "--check"
+"""Check the synthesized files instead of writing them; stop at the first out-of-date file."""
+
+CHECK_ALL_FLAG = "--check-all"
+"""Like ``--check``, but report every out-of-date file."""
+
+CHECKABLE_FILE_TYPES = (TextFile, IgnoreFile, GitAttributesFile, IncrementalTomlFile)
+"""Files whose contents can be rendered with a pass-through resolver, i.e. without ``projen``'s synthesis."""
+
+
+@dataclass
+class FileMismatch:
+    """A file whose contents on disk differ from what synthesis would produce."""
+
+    path: Path
+    reason: str
+    diff: str = ""
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.reason}" + (f"\n{self.diff}" if self.diff else "")
+
+
+@dataclass
+class CheckReport:
+    """The result of ``check_synth()``."""
+
+    checked: int = 0
+    mismatches: List[FileMismatch] = field(default_factory=list)
+    unchecked: List[Path] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    def __str__(self) -> str:
+        lines: List[str] = [str(mismatch) for mismatch in self.mismatches]
+        status = "up to date" if self.ok else f"{len(self.mismatches)} out of date"
+        lines.append(f"{self.checked} files checked, {status}, {len(self.unchecked)} unchecked")
+        return "\n".join(lines)
+
+
+def check_synth(project: Project, report_all: bool = False) -> CheckReport:
+    """
+    Compare the files that synthesizing ``project`` (and its subprojects) would write with those on disk.
+
+    :param report_all: if ``False``, stop at the first mismatch; otherwise, collect a diff of every mismatch
+    """
+    report = CheckReport()
+    with trace_span("check_synth"):
+        for subproject in iter_projects(project):
+            _pre_synthesize(subproject)
+            if _check_project(subproject, report=report, report_all=report_all) and not report_all:
+                break
+    return report
+
+
+def synth_or_check(project: Project, argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Synthesize ``project``, or, if ``--check`` or ``--check-all`` was passed, check it and exit.
+
+    :param argv: command-line arguments; defaults to ``sys.argv``
+    """
+    if not is_check_requested(argv):
+        project.synth()
+        return
+    exit_with_check_report(project, argv)
+
+
+def is_check_requested(argv: Optional[Sequence[str]] = None) -> bool:
+    argv = sys.argv[1:] if argv is None else argv
+    return CHECK_FLAG in argv or CHECK_ALL_FLAG in argv
+
+
+def exit_with_check_report(project: Project, argv: Optional[Sequence[str]] = None) -> None:
+    """Check ``project``, print the report, and exit with status 1 if any file is out of date."""
+    argv = sys.argv[1:] if argv is None else argv
+    report: CheckReport = check_synth(project, report_all=CHECK_ALL_FLAG in argv)
+    print(report, file=sys.stderr)
+    sys.exit(0 if report.ok else 1)
+
+
+def _pre_synthesize(project: Project) -> None:
+    """Run the hooks that prepare the contents of the files, as ``Project.synth()`` would."""
+    project.pre_synthesize()
+    for component in project.components:
+        component.pre_synthesize()
+
+
+def _check_project(project: Project, report: CheckReport, report_all: bool) -> bool:
+    """Add the results of checking the files of ``project`` to ``report``; return whether any mismatch was found."""
+    outdir = Path(project.outdir)
+    manifest: Optional[FileHashManifest] = get_file_hash_manifest(project)
+    found_mismatch = False
+
+    for file in project.files:
+        fpath: Path = outdir / file.path
+        if not isinstance(file, CHECKABLE_FILE_TYPES):
+            report.unchecked.append(fpath)
+            continue
+        report.checked += 1
+        mismatch: Optional[FileMismatch] = _check_file(file, fpath, manifest=manifest, with_diff=report_all)
+        if mismatch is not None:
+            report.mismatches.append(mismatch)
+            found_mismatch = True
+            if not report_all:
+                return True
+
+    index: DirectoryIndex = get_directory_index(project)
+    for fpath in _iter_sample_fpaths(project):
+        report.checked += 1
+        if not index.exists(fpath):
+            report.mismatches.append(FileMismatch(fpath, reason="sample file would be created"))
+            found_mismatch = True
+            if not report_all:
+                return True
+    return found_mismatch
+
+
+def _check_file(
+    file: FileBase, fpath: Path, manifest: Optional[FileHashManifest], with_diff: bool
+) -> Optional[FileMismatch]:
+    with trace_span(f"{type(file).__name__}.check", file_path=file.path):
+        contents: Optional[str] = file._synthesize_content(_PASS_THROUGH_RESOLVER)
+        if contents is None:
+            return FileMismatch(fpath, reason="would be deleted") if fpath.exists() else None
+        # a file recorded in the manifest, and untouched since, need not be read
+        if manifest is not None and manifest.is_unchanged(file.path, contents):
+            return None
+        try:
+            on_disk: str = fpath.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return FileMismatch(fpath, reason="would be created")
+        if on_disk == contents:
+            return None
+        diff: str = ""
+        if with_diff:
+            diff = "".join(
+                difflib.unified_diff(
+                    on_disk.splitlines(keepends=True),
+                    contents.splitlines(keepends=True),
+                    fromfile=f"{file.path} (on disk)",
+                    tofile=f"{file.path} (synthesized)",
+                )
+            )
+        return FileMismatch(fpath, reason="differs", diff=diff)
+
+
+def _iter_sample_fpaths(project: Project):
+    outdir = Path(project.outdir)
+    for component in project.components:
+        if isinstance(component, LazySampleFile):
+            yield component.final_fpath
+        elif isinstance(component, LazySampleDir):
+            for _, relative_fpath in component.iter_source_files():
+                yield outdir / component.dest_dir / relative_fpath
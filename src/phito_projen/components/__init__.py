@@ -0,0 +1,50 @@
+"""
+``projen`` components for Python projects.
+
+Components are loaded lazily, so that e.g. the ``pydantic`` models behind ``PylintRc``
+are only imported by projects that use them.
+"""
+
+from typing import TYPE_CHECKING
+
+from phito_projen._lazy import make_lazy_module_attributes
+
+if TYPE_CHECKING:
+    from .commentable_files.ini_file import CommentableIniFile
+    from .commentable_files.object_file import CommentableObjectFile
+    from .commentable_files.yaml_file import CommentableYamlFile
+    from .file_writer_flush import FileWriterFlush
+    from .incremental_files import IncrementalTextFile, IncrementalTomlFile
+    from .lazy_sample_file import LazySampleDir, LazySampleFile
+    from .manifest_in import ManifestIn
+    from .pre_commit import PreCommit
+    from .projenrc_py.projenrc_py import ProjenrcPy
+    from .pylint import PylintRc
+    from .pyproject_toml import PyprojectToml
+    from .setup_cfg.setup_cfg import SetupCfg
+    from .setup_py import SetupPy
+    from .templatized_file import TemplatizedFile
+    from .version_py import VersionPy
+
+__getattr__, __dir__ = make_lazy_module_attributes(
+    __name__,
+    {
+        "CommentableIniFile": ".commentable_files.ini_file",
+        "CommentableObjectFile": ".commentable_files.object_file",
+        "CommentableYamlFile": ".commentable_files.yaml_file",
+        "FileWriterFlush": ".file_writer_flush",
+        "IncrementalTextFile": ".incremental_files",
+        "IncrementalTomlFile": ".incremental_files",
+        "LazySampleDir": ".lazy_sample_file",
+        "LazySampleFile": ".lazy_sample_file",
+        "ManifestIn": ".manifest_in",
+        "PreCommit": ".pre_commit",
+        "ProjenrcPy": ".projenrc_py.projenrc_py",
+        "PylintRc": ".pylint",
+        "PyprojectToml": ".pyproject_toml",
+        "SetupCfg": ".setup_cfg.setup_cfg",
+        "SetupPy": ".setup_py",
+        "TemplatizedFile": ".templatized_file",
+        "VersionPy": ".version_py",
+    },
+)
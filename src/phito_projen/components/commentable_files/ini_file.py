@@ -1,84 +1,79 @@
-# from ctypes import Union
-# from pathlib import Path
-# from projen import Project
-# from components.commentable_files.object_file import CommentableObjectFile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+from projen import Project
+from phito_projen.components.commentable_files.object_file import CommentableObjectFile, TRenderedLine
 
+INI_LIST_ITEM_INDENT = "    "
 
-# class CommentableIniFile(CommentableObjectFile):
-#     def __init__(self, project: Project, file_path: Union[str, Path]):
-#         super().__init__(project, file_path)
+TIniScalar = Union[str, int, float, bool]
+TIniValue = Union[TIniScalar, List[TIniScalar]]
+TIniSection = Dict[str, TIniValue]
 
-#         self.__doc = ...
 
+class CommentableIniFile(CommentableObjectFile):
+    """
+    An INI file (e.g. ``setup.cfg``) that supports comments before, and at the end of, any section,
+    key or item of a multi-line value.
+
+    ``obj`` maps section names to the keys of each section. Lists, and strings containing newlines,
+    are written as multi-line values, one item per indented line, the way ``setuptools`` reads them:
+
+    .. code-block:: ini
+
+        [options]
+        install_requires =
+            pandas
+            requests>=2
 
-if __name__ == "__main__":
-    from configupdater import ConfigUpdater
-    from configparser import ConfigParser
+    Section names often contain dots, so paths in this file are not in dot-notation. Instead:
 
-    cfg_text = """\
-    [metadata]
-    name = cool-package
-    value = brub
+    - ``options`` is the ``[options]`` section header
+    - ``options:install_requires`` is the ``install_requires`` key of ``[options]``
+    - ``options:install_requires.[1]`` is the second line of its value
 
-    [options.extras.etc]
-    install_requires = 
-        package-1
-        package-2>=1.0.0, <2.0.0
+    Sections and values are streamed into the output one line at a time, so that memory and time
+    stay linear in the number of lines even for thousands of requirements.
+
+    :param obj: the sections to render, in order
     """
 
-    updater = ConfigUpdater()
-    cfg = updater.read_string(cfg_text)
-
-    data = {
-        "metadata": {
-            "name": "cool-package",
-            "value": "eric",
-        },
-        "options.extras.etc": {
-            "install_requires": [
-                "package-1",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-                "package-2>=1.0.0, <2.0.0",
-            ]
-        },
-    }
-
-    # b = benedict(
-    #     data,
-    #     format="ini",
-    #     keypath_separator="/",
-    # )
-
-    # cfg = updater.read_string(b.to_toml())
-    # cfg["options.extras.etc"].add_before.comment("section")
-
-    # cfg["options.extras.etc"]["install_requires"].add_before.comment("key")
-
-    # cfg["options.extras.etc"][
-    #     "install_requires"
-    # .  #.set_values(values=["1", "2", "3"])
-    cfg = ConfigParser()
-    cfg.read_string(cfg_text)
-    cfg.add_section("sec")
-    # cfg["sec"]["yolo.my.bro"] = str(["impart", "wisdom", "on", "the", "bro"])
-
-    from io import StringIO
-
-    s = StringIO()
-    cfg.write(fp=s)
-    out = s.getvalue()
-    print(out)
+    supports_eol_comments = False
+    """``setuptools`` and ``configparser`` read inline comments as part of the value by default."""
+
+    def __init__(
+        self,
+        project: Project,
+        file_path: Union[str, Path],
+        obj: Optional[Dict[str, TIniSection]] = None,
+    ):
+        super().__init__(project, file_path)
+        self.obj: Dict[str, TIniSection] = obj if obj is not None else {}
+
+    def render_lines(self) -> Iterator[TRenderedLine]:
+        for i, (section_name, section) in enumerate(self.obj.items()):
+            if i > 0:
+                yield (), ""
+            yield (section_name,), f"[{section_name}]"
+            for key, value in section.items():
+                yield from _render_key_lines(path=f"{section_name}:{key}", key=key, value=value)
+
+    def make_single_line_comment(self, comment: str) -> str:
+        return f"# {comment}" if comment else "#"
+
+
+def _render_key_lines(path: str, key: str, value: TIniValue) -> Iterator[TRenderedLine]:
+    if isinstance(value, str) and "\n" in value:
+        value = value.splitlines()
+    if not isinstance(value, list):
+        yield (path,), f"{key} = {_format_scalar(value)}"
+        return
+
+    yield (path,), f"{key} ="
+    for i, item in enumerate(value):
+        yield (f"{path}.[{i}]",), f"{INI_LIST_ITEM_INDENT}{_format_scalar(item)}"
+
+
+def _format_scalar(value: TIniScalar) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
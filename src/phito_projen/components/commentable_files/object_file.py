@@ -1,47 +1,110 @@
-from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Union
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from projen import Component, Project, TextFile
+from phito_projen.components.incremental_files import IncrementalTextFile
+from phito_projen.instrumentation import trace_span
 
+TRenderedLine = Tuple[Sequence[str], str]
+"""A line of output, and the paths of the keys or list items that begin on that line."""
+
+
+class CommentableObjectFile(Component):
+    """
+    An object file (YAML, INI, TOML, ...) that supports comments at arbitrary paths in the object.
+
+    Subclasses serialize the object in ``render_lines()``, tagging each output line with the
+    paths that begin on it. That tagging *is* the path-to-line index: comments are merged into
+    the output in the same single pass that consumes the rendered lines, so rendering stays
+    linear in the size of the output no matter how many comments are set.
+
+    Paths use the dot-notation of ``object_file_utils``, e.g. ``repos.[0].hooks.[1].id``,
+    unless the subclass documents its own (INI section names, for one, contain dots).
+
+    Subclasses must implement ``render_lines()`` and ``make_single_line_comment()``. (``ABC``
+    cannot be mixed in: its metaclass conflicts with the jsii metaclass of ``Component``.)
+    """
+
+    supports_eol_comments: bool = True
+    """If ``False``, end-of-line comments are written on their own line, just before the line they annotate."""
 
-class CommentableObjectFile(Component, ABC):
     def __init__(self, project: Project, file_path: Union[str, Path]):
         super().__init__(project)
-        self.__file = TextFile(self, file_path=str(file_path))
+        self.__file = IncrementalTextFile(project, file_path=str(file_path))
+        self.__header_comment: Optional[str] = None
+        self.__comments_before: Dict[str, List[str]] = {}
+        self.__eol_comments: Dict[str, str] = {}
+
+        self.line_index: Dict[str, int] = {}
+        """Maps each path to its (0-based) line in the output of the last ``synthesize_lines()``."""
 
     def pre_synthesize(self):
-        """Add all lines to the final text file."""
-        contents: str = self.synthesize_contents()
-        lines = contents.splitlines()
+        """Hand the complete contents to the final text file."""
+        with trace_span(f"{type(self).__name__}.synthesize_contents"):
+            lines: List[str] = self.synthesize_lines()
         projen_marker_comment: str = self.make_single_line_comment(self.__file.marker)
+        self.__file.set_lines([projen_marker_comment, "", *lines])
 
-        self.__file.add_line(projen_marker_comment)
-        self.__file.add_line("")
-        for line in lines:
-            self.__file.add_line(line)
-
-    @abstractmethod
     def synthesize_contents(self) -> str:
-        """Generate the final contents of the object file."""
-        ...
+        """Generate the final contents of the object file, with all comments merged in."""
+        return "\n".join(self.synthesize_lines()) + "\n"
+
+    def synthesize_lines(self) -> List[str]:
+        """Generate the lines of the object file, with all comments merged in."""
+        lines: List[str] = []
+        line_index: Dict[str, int] = {}
+
+        if self.__header_comment:
+            lines.extend(
+                self.make_single_line_comment(line)
+                for line in self.__header_comment.splitlines()
+            )
+            lines.append("")
+
+        for paths, line in self.render_lines():
+            indentation: str = line[: len(line) - len(line.lstrip())]
+            eol_comments: List[str] = []
+            for path in paths:
+                lines.extend(
+                    indentation + self.make_single_line_comment(comment_line)
+                    for comment in self.__comments_before.get(path, [])
+                    for comment_line in comment.splitlines()
+                )
+                if path in self.__eol_comments:
+                    eol_comments.append(self.__eol_comments[path])
+            if eol_comments and self.supports_eol_comments:
+                line = f"{line} {self.make_single_line_comment(' '.join(eol_comments))}"
+            elif eol_comments:
+                lines.append(indentation + self.make_single_line_comment(" ".join(eol_comments)))
+            for path in paths:
+                line_index[path] = len(lines)
+            lines.append(line)
+
+        self.line_index = line_index
+        return lines
+
+    def render_lines(self) -> Iterator[TRenderedLine]:
+        """
+        Serialize the object one output line at a time.
+
+        Yield each line together with the paths of the keys or list items that begin on it,
+        e.g. ``(("repos.[0]", "repos.[0].repo"), "  - repo: local")``. Lines that do not
+        begin a key, such as closing brackets or continuation lines, yield an empty sequence.
+        """
+        raise NotImplementedError
 
-    @abstractmethod
     def set_header_comment(self, comment: str):
         """Set a comment at the beginning of the file."""
-        ...
+        self.__header_comment = comment
 
-    @abstractmethod
     def set_comment_before_key_at_path(self, path: str, comment: str):
         """Set a comment just before a key or list item in the object."""
-        ...
+        self.__comments_before.setdefault(path, []).append(comment)
 
-    @abstractmethod
     def set_eol_comment_at_path(self, path: str, comment: str):
         """Set a end-of-line comment in-line after the key or list item at the path."""
-        ...
+        self.__eol_comments[path] = comment
 
-    @abstractmethod
-    def make_single_line_comment(comment: str) -> str:
+    def make_single_line_comment(self, comment: str) -> str:
         """
         Return a commented out version of ``comment``.
 
@@ -49,11 +112,5 @@ class CommentableObjectFile(Component, ABC):
 
         YAML:        ``hi there`` -> ``# hi there``
         JavaScript:  ``hi there`` -> ``// hi there``
-
-        .. code-block:: yaml
-
-            hi: there
-
-        Yes no?
         """
-        ...
+        raise NotImplementedError
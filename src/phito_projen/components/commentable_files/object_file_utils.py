@@ -1,4 +1,62 @@
-from typing import Any, List, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+
+TPathKey = Union[str, int, slice]
+"""A single step of a path: a dict key, a list index or a list slice."""
+
+
+class CompiledPath:
+    """
+    A dot-notation path string, parsed once into the keys it traverses.
+
+    Use ``compile_path()`` rather than instantiating this directly, so that
+    compiled paths are cached and shared.
+
+    :param path: a string supporting dot-notation and array indices (like the ``jq`` CLI),
+        e.g. ``friends.[1].name`` or ``friends.[0:2]``
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.parts: Tuple[str, ...] = tuple(path.split("."))
+        self.keys: Tuple[TPathKey, ...] = tuple(parse_path_part(part) for part in self.parts)
+
+        array_parts: List[str] = [part for part in self.parts if is_array_idx(part)]
+        self.__n_array_parts: int = len(array_parts)
+        self.__n_distinct_non_array_parts: int = len(set(self.parts) - set(array_parts))
+
+    def get(self, dictlike: Any) -> Any:
+        """Return a reference to the value at this path."""
+        value = dictlike
+        for key in self.keys:
+            value = value[key]
+        return value
+
+    def get_container(self, dictlike: Any) -> Any:
+        """Return a reference to the object holding the value at this path."""
+        value = dictlike
+        for key in self.keys[:-1]:
+            value = value[key]
+        return value
+
+    @property
+    def final_key(self) -> Union[int, str]:
+        return get_scalar_key(self.parts[-1])
+
+    def calc_indentation(self, indent: int, list_item_indent: int) -> int:
+        total_indentation_from_list_items = self.__n_array_parts * list_item_indent
+        total_indentation_from_non_list_items = (self.__n_distinct_non_array_parts - 1) * indent
+        return total_indentation_from_list_items + total_indentation_from_non_list_items
+
+    def __repr__(self) -> str:
+        return f"CompiledPath({self.path!r})"
+
+
+@lru_cache(maxsize=4096)
+def compile_path(path: str) -> CompiledPath:
+    """Parse ``path`` into a ``CompiledPath``; each distinct path is parsed once."""
+    return CompiledPath(path)
 
 
 def get_reference_by_path(path: str, dictlike: dict) -> Any:
@@ -22,46 +80,68 @@ def get_reference_by_path(path: str, dictlike: dict) -> Any:
 
     Should return a reference to ``jobillydoo``.
     """
+    return compile_path(path).get(dictlike)
 
-    parts = path.split(".")
-    value = get_value(parts[0], dictlike)
 
-    if len(parts) > 1:
-        for part in parts[1:]:
-            value = get_value(key=part, obj=value)
-
-    return value
+def get_references_by_paths(paths: Iterable[str], dictlike: dict) -> Dict[str, Any]:
+    """
+    Get references to the values at many paths in a single traversal of ``dictlike``.
 
+    Paths are merged into a trie, so a prefix shared by several paths
+    (e.g. ``repos.[0].hooks`` in ``repos.[0].hooks.[0].id`` and ``repos.[0].hooks.[1].id``)
+    is only traversed once.
 
-def calc_indentation_of_path(path: str, indent: int, list_item_indent: int) -> int:
-    parts: List[str] = path.split(".")
-
-    parts_that_are_array_indices = [part for part in parts if is_array_idx(part)]
-    parts_that_are_not_array_indices = set(parts) - set(parts_that_are_array_indices)
+    :return: a dict mapping each path to the value at that path
+    """
+    root = _PathTrie()
+    for path in paths:
+        node = root
+        compiled = compile_path(path)
+        for part, key in zip(compiled.parts, compiled.keys):
+            child: Optional[Tuple[TPathKey, _PathTrie]] = node.children.get(part)
+            if child is None:
+                child = node.children[part] = (key, _PathTrie())
+            node = child[1]
+        node.paths.append(path)
+
+    references: Dict[str, Any] = {}
+    stack: List[Tuple[_PathTrie, Any]] = [(root, dictlike)]
+    while stack:
+        node, value = stack.pop()
+        for path in node.paths:
+            references[path] = value
+        for key, child_node in node.children.values():
+            stack.append((child_node, value[key]))
+    return references
+
+
+class _PathTrie:
+    def __init__(self) -> None:
+        # keyed by the unparsed part, since slices are not hashable
+        self.children: Dict[str, Tuple[TPathKey, "_PathTrie"]] = {}
+        self.paths: List[str] = []
 
-    total_indentation_from_list_items = (
-        len(parts_that_are_array_indices)
-    ) * list_item_indent
-    total_indentation_from_non_list_items = (
-        len(parts_that_are_not_array_indices) - 1
-    ) * indent
 
-    return total_indentation_from_list_items + total_indentation_from_non_list_items
+def calc_indentation_of_path(path: str, indent: int, list_item_indent: int) -> int:
+    return compile_path(path).calc_indentation(indent=indent, list_item_indent=list_item_indent)
 
 
 def get_reference_container_by_path(path: str, obj: dict) -> Any:
-    parts = path.split(".")
-    if len(parts) == 1:
-        return obj
-
-    parts = path.split(".")
-    path_ = ".".join(parts[:-1])
-    return get_reference_by_path(path_, obj)
+    return compile_path(path).get_container(obj)
 
 
 def get_final_key_in_path(path: str):
-    last_part: str = path.split(".")[-1]
-    return get_scalar_key(last_part)
+    return compile_path(path).final_key
+
+
+def parse_path_part(part: str) -> TPathKey:
+    """Convert one part of a path into the key used to index into an object."""
+    if not is_array_idx(part):
+        return part
+    if is_slice(part):
+        lower, upper = get_slice_bounds(part)
+        return slice(lower, upper)
+    return get_array_idx(part)
 
 
 def is_array_idx(part: str) -> bool:
@@ -0,0 +1,108 @@
+import json
+import math
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+from projen import Project
+from phito_projen.components.commentable_files.object_file import CommentableObjectFile, TRenderedLine
+
+YAML_INDENT = 2
+
+PLAIN_YAML_STRING_REGEX = re.compile(r"^[A-Za-z_./][A-Za-z0-9_./@+\- ]*(?<! )$")
+"""Strings that can be written without quotes, as long as YAML would not read them as another type."""
+
+YAML_RESERVED_WORDS = {"true", "false", "yes", "no", "on", "off", "y", "n", "null", "~"}
+
+YAML_SPECIAL_FLOATS = {".inf", "+.inf", "-.inf", ".nan"}
+"""Infinity and not-a-number, which YAML reads as floats in any case, e.g. ``.Inf`` or ``.NAN``."""
+
+
+class CommentableYamlFile(CommentableObjectFile):
+    """
+    A YAML file that supports comments before, and at the end of, any key or list item.
+
+    ``obj`` is kept in Python and can be modified in place until the file is synthesized.
+
+    .. code-block:: python
+
+        config = CommentableYamlFile(project, ".pre-commit-config.yaml", obj={"repos": [{"repo": "local"}]})
+        config.set_header_comment("hooks run by the pre-commit framework")
+        config.set_comment_before_key_at_path("repos.[0]", "hooks that run in the project's virtual environment")
+        config.set_eol_comment_at_path("repos.[0].repo", "no need to clone anything")
+
+    :param obj: the object to render; must consist of dicts, lists and scalars
+    """
+
+    def __init__(self, project: Project, file_path: Union[str, Path], obj: Optional[Dict[str, Any]] = None):
+        super().__init__(project, file_path)
+        self.obj: Dict[str, Any] = obj if obj is not None else {}
+
+    def render_lines(self) -> Iterator[TRenderedLine]:
+        yield from _render_value_lines(self.obj, path="", indent=0)
+
+    def make_single_line_comment(self, comment: str) -> str:
+        return f"# {comment}" if comment else "#"
+
+
+def _render_value_lines(value: Any, path: str, indent: int) -> Iterator[TRenderedLine]:
+    """Render a non-empty dict or list, one line at a time, tagging each line with the paths that begin on it."""
+    padding: str = " " * indent
+    if isinstance(value, dict):
+        for key, child in value.items():
+            child_path: str = f"{path}.{key}" if path else str(key)
+            if _is_inline(child):
+                yield (child_path,), f"{padding}{_format_scalar(key)}: {_format_inline(child)}"
+            else:
+                yield (child_path,), f"{padding}{_format_scalar(key)}:"
+                yield from _render_value_lines(child, path=child_path, indent=indent + YAML_INDENT)
+        return
+
+    for i, item in enumerate(value):
+        item_path: str = f"{path}.[{i}]" if path else f"[{i}]"
+        if _is_inline(item):
+            yield (item_path,), f"{padding}- {_format_inline(item)}"
+            continue
+        # the first line of a nested dict or list shares the line of the "- " marker
+        item_lines = _render_value_lines(item, path=item_path, indent=indent + YAML_INDENT)
+        first_paths, first_line = next(item_lines)
+        yield (item_path, *first_paths), f"{padding}- {first_line[indent + YAML_INDENT:]}"
+        yield from item_lines
+
+
+def _is_inline(value: Any) -> bool:
+    return not isinstance(value, (dict, list)) or not value
+
+
+def _format_inline(value: Any) -> str:
+    if isinstance(value, dict):
+        return "{}"
+    if isinstance(value, list):
+        return "[]"
+    return _format_scalar(value)
+
+
+def _format_scalar(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and not math.isfinite(value):
+        # json.dumps() would give Infinity or NaN, which YAML reads as strings
+        return ".nan" if math.isnan(value) else (".inf" if value > 0 else "-.inf")
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+    value = str(value)
+    if _is_plain_string(value):
+        return value
+    # a JSON string is a valid double-quoted YAML string
+    return json.dumps(value)
+
+
+def _is_plain_string(value: str) -> bool:
+    if not PLAIN_YAML_STRING_REGEX.match(value) or value.lower() in YAML_RESERVED_WORDS | YAML_SPECIAL_FLOATS:
+        return False
+    try:
+        float(value)
+    except ValueError:
+        return True
+    return False
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from projen import Component, Project
+
+from phito_projen.file_writer import FileWriter, WriteReport, get_file_writer
+
+
+class FileWriterFlush(Component):
+    """
+    Write the files submitted to the project's ``FileWriter`` at the end of the synthesize phase.
+
+    Must be the last component of the project, so that the files of every other component
+    have been submitted when it is synthesized. Flushing during synthesis, rather than in
+    ``post_synthesize()``, means the files are written even if ``PROJEN_DISABLE_POST`` is set,
+    and that the ``post_synthesize()`` hooks of components see the generated files on disk.
+    """
+
+    def __init__(self, project: "Project") -> None:
+        super().__init__(project)
+        self.last_report = WriteReport()
+
+    def synthesize(self) -> None:
+        writer: Optional[FileWriter] = get_file_writer(self.project)
+        if writer is not None:
+            self.last_report = writer.flush()
@@ -0,0 +1,118 @@
+"""
+``projen`` file types that skip writing files whose contents have not changed.
+
+These files consult the ``FileHashManifest`` of the project they belong to. Projects
+without a manifest (anything other than a ``PythonPackage``) get the normal projen behavior.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional
+
+import jsii
+from projen import FileBase, IResolver, Project, TextFile, TomlFile
+
+from phito_projen.file_hash_manifest import FileHashManifest
+from phito_projen.file_writer import FileWriter, get_file_permissions, get_file_writer
+from phito_projen.instrumentation import record_bytes_written, trace_span
+
+
+@jsii.implements(IResolver)
+class PassThroughResolver:
+    """
+    Resolve values to themselves.
+
+    Sufficient for files whose contents are plain data, i.e. that do not contain
+    lazily-evaluated values such as functions.
+    """
+
+    def resolve(self, value: Any, *, args: Any = None, omit_empty: Optional[bool] = None) -> Any:
+        return value
+
+
+_PASS_THROUGH_RESOLVER = PassThroughResolver()
+
+
+class IncrementalTextFile(TextFile):
+    """
+    A ``projen.TextFile`` that is not rewritten if its contents are unchanged.
+
+    Unlike ``projen.TextFile``, the lines are kept in Python. Adding a line is not
+    a call into the jsii runtime; projen receives the complete contents in a single
+    call when the file is synthesized. If the project has a ``FileWriter``, the file
+    is written by it rather than by projen.
+    """
+
+    def __init__(
+        self,
+        project: Project,
+        file_path: str,
+        *,
+        lines: Optional[List[str]] = None,
+        **options: Any,
+    ) -> None:
+        super().__init__(project, file_path, **options)
+        self.__lines: List[str] = list(lines or [])
+
+    def add_line(self, line: str) -> None:
+        self.__lines.append(line)
+
+    def add_lines(self, lines: Iterable[str]) -> None:
+        self.__lines.extend(lines)
+
+    def set_lines(self, lines: Iterable[str]) -> None:
+        """Replace all lines of the file."""
+        self.__lines = list(lines)
+
+    def _synthesize_content(self, _: IResolver) -> Optional[str]:
+        return "\n".join(self.__lines)
+
+    def synthesize(self) -> None:
+        synthesize_incrementally(file=self, write_fn=super().synthesize, contents_are_final=True)
+
+
+class IncrementalTomlFile(TomlFile):
+    """A ``projen.TomlFile`` that is not rewritten if its contents are unchanged."""
+
+    def synthesize(self) -> None:
+        synthesize_incrementally(file=self, write_fn=super().synthesize)
+
+
+def synthesize_incrementally(file: FileBase, write_fn: Callable[[], None], contents_are_final: bool = False) -> None:
+    """
+    Call ``write_fn`` to write ``file`` unless the project's ``FileHashManifest`` shows it is unchanged.
+
+    :param contents_are_final: whether ``file._synthesize_content()`` returns exactly what ``write_fn`` would
+        write; if so, and the project has a ``FileWriter``, the contents are submitted to it instead
+    """
+    manifest: Optional[FileHashManifest] = get_file_hash_manifest(file.project)
+    if manifest is None:
+        write_fn()
+        return
+
+    file_path: str = file.path
+    with trace_span(f"{type(file).__name__}.synthesize", file_path=file_path):
+        with trace_span(f"{type(file).__name__}.render", file_path=file_path):
+            contents: Optional[str] = file._synthesize_content(_PASS_THROUGH_RESOLVER)
+        if contents is not None and manifest.is_unchanged(file_path, contents):
+            manifest.mark_skipped(file_path)
+            return
+
+        writer: Optional[FileWriter] = get_file_writer(file.project)
+        if contents is not None and contents_are_final and writer is not None:
+            writer.write(
+                Path(file.project.outdir) / file_path,
+                contents.encode("utf-8"),
+                mode=get_file_permissions(readonly=file.readonly, executable=file.executable),
+                on_written=lambda: manifest.mark_written(file_path, contents),
+            )
+            return
+
+        with trace_span(f"{type(file).__name__}.write", file_path=file_path):
+            write_fn()
+        if contents is not None:
+            record_bytes_written(len(contents.encode("utf-8")))
+            manifest.mark_written(file_path, contents)
+
+
+def get_file_hash_manifest(project: Project) -> Optional[FileHashManifest]:
+    return getattr(project, "file_hash_manifest", None)
@@ -1,6 +1,11 @@
+import os
 from pathlib import Path
-from typing import Callable, Optional, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from weakref import WeakKeyDictionary
 from projen import Component, Project
+from phito_projen.instrumentation import record_bytes_written, trace_span
+from phito_projen.file_writer import FileWriter, copy_file_contents, get_file_writer
+from phito_projen.template_manifest import Traversable
 
 TGetContentsFn = Callable[[], str]
 """A function that will be called during synthesis of a component to get the contents that will be written to the file."""
@@ -48,16 +53,176 @@ class LazySampleFile(Component):
         self.file_path: Union[str, Path] = file_path
         """File path relative to ``project.outdir`` where the final sample file will be created."""
 
+    @property
+    def final_fpath(self) -> Path:
+        """Absolute path of the sample file."""
+        return Path(self.project.outdir) / Path(self.file_path)
+
+    def pre_synthesize(self) -> None:
+        # the files on disk may have changed since the project was last synthesized
+        get_directory_index(self.project).clear()
+
+    def synthesize(self) -> None:
+        """
+        Write the file contents to disk if file is not already present.
+
+        The existence check happens first, so ``get_contents_fn()`` is only called
+        if the file actually needs to be written.
+        """
+        with trace_span("LazySampleFile.synthesize", file_path=str(self.file_path)):
+            final_fpath: Path = self.final_fpath
+            index: DirectoryIndex = get_directory_index(self.project)
+            if index.exists(final_fpath):
+                return
+
+            with trace_span("LazySampleFile.get_contents", file_path=str(self.file_path)):
+                contents: str = self.get_contents_fn()
+            writer: Optional[FileWriter] = get_file_writer(self.project)
+            if writer is not None:
+                writer.write(final_fpath, contents.encode(self.file_encoding or "utf-8"), exclusive=True)
+            else:
+                with trace_span("LazySampleFile.write", file_path=str(self.file_path)):
+                    write_file_if_not_exists(
+                        contents=contents, path=final_fpath, encoding=self.file_encoding
+                    )
+            index.add(final_fpath)
+
+
+class LazySampleDir(Component):
+    """
+    A directory of sample files, copied from ``source_dir`` into the project at synth time.
+
+    Nothing is read while the project is constructed. During synthesis, each file
+    of the sample that does not already exist in the project is copied. Existing
+    files are skipped without opening their source.
+
+    Files are copied byte-for-byte, so binary assets (images, notebooks, ...) can be
+    part of a sample. See ``phito_projen.file_writer.copy_file_contents()`` for how.
+
+    :param source_dir: directory whose files make up the sample; may be inside a zip file
+        if it is a ``Traversable`` from ``importlib.resources``
+    :param dest_dir: directory relative to ``project.outdir`` that the files are copied into
+    :param source_files: paths of the sample files relative to ``source_dir``, e.g. from
+        ``phito_projen.template_manifest``; if not given, ``source_dir`` is walked at synth time
+    :param exclude_dir_names: names of directories that are skipped when walking ``source_dir``
+    """
+
+    def __init__(
+        self,
+        project: "Project",
+        source_dir: Union[str, Path, Traversable],
+        dest_dir: Union[str, Path],
+        source_files: Optional[Iterable[str]] = None,
+        exclude_dir_names: Tuple[str, ...] = ("__pycache__",),
+    ):
+        super().__init__(project)
+        self.source_dir: Union[Path, Traversable] = Path(source_dir) if isinstance(source_dir, str) else source_dir
+        self.dest_dir = Path(dest_dir)
+        self.source_files: Optional[List[str]] = list(source_files) if source_files is not None else None
+        self.exclude_dir_names = exclude_dir_names
+
+    def pre_synthesize(self) -> None:
+        get_directory_index(self.project).clear()
+
     def synthesize(self) -> None:
-        """Write the file contents to disk if file is not already present."""
-        contents: str = self.get_contents_fn()
-        final_fpath = Path(self.project.outdir) / Path(self.file_path)
-        write_file_if_not_exists(
-            contents=contents, path=final_fpath, encoding=self.file_encoding
-        )
+        with trace_span("LazySampleDir.synthesize", dest_dir=str(self.dest_dir)):
+            index: DirectoryIndex = get_directory_index(self.project)
+            writer: Optional[FileWriter] = get_file_writer(self.project)
+            final_dest_dir: Path = Path(self.project.outdir) / self.dest_dir
+            for source_fpath, relative_fpath in self.iter_source_files():
+                final_fpath: Path = final_dest_dir / relative_fpath
+                if index.exists(final_fpath):
+                    continue
+                if writer is not None:
+                    writer.copy(source_fpath, final_fpath, exclusive=True)
+                else:
+                    copy_file_if_not_exists(source=source_fpath, dest=final_fpath)
+                index.add(final_fpath)
+
+    def iter_source_files(self) -> Iterator[Tuple[Union[Path, Traversable], Path]]:
+        """Yield the source and the relative path of each sample file."""
+        if self.source_files is not None:
+            for relative_fpath in self.source_files:
+                yield self.source_dir.joinpath(*Path(relative_fpath).parts), Path(relative_fpath)
+            return
+        for dirpath, dirnames, filenames in os.walk(self.source_dir):
+            dirnames[:] = sorted(name for name in dirnames if name not in self.exclude_dir_names)
+            for filename in sorted(filenames):
+                source_fpath = Path(dirpath) / filename
+                yield source_fpath, source_fpath.relative_to(self.source_dir)
+
+
+class DirectoryIndex:
+    """
+    A cache of directory listings for answering "does this file exist?" without a ``stat`` per file.
+
+    Each directory is listed at most once, with ``os.scandir``, no matter how many
+    files in it are checked. Sample files of the same project share one index;
+    see ``get_directory_index()``.
+    """
+
+    def __init__(self) -> None:
+        self.__listings: Dict[Path, Set[str]] = {}
+
+    def exists(self, path: Path) -> bool:
+        return path.name in self.__list_dir(path.parent)
+
+    def add(self, path: Path) -> None:
+        """Record that ``path`` was created after its directory was listed."""
+        self.__list_dir(path.parent).add(path.name)
+
+    def clear(self) -> None:
+        self.__listings.clear()
+
+    def __list_dir(self, directory: Path) -> Set[str]:
+        names: Optional[Set[str]] = self.__listings.get(directory)
+        if names is None:
+            try:
+                with os.scandir(directory) as entries:
+                    names = {entry.name for entry in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                names = set()
+            self.__listings[directory] = names
+        return names
+
+
+_DIRECTORY_INDEXES: "WeakKeyDictionary[Project, DirectoryIndex]" = WeakKeyDictionary()
+
+
+def get_directory_index(project: Project) -> DirectoryIndex:
+    """Return the ``DirectoryIndex`` shared by all sample files in ``project``."""
+    index: Optional[DirectoryIndex] = _DIRECTORY_INDEXES.get(project)
+    if index is None:
+        index = _DIRECTORY_INDEXES[project] = DirectoryIndex()
+    return index
 
 
 def write_file_if_not_exists(path: Path, contents: str, encoding: Optional[str] = None):
     if not path.exists():
         path.parent.mkdir(exist_ok=True, parents=True)
-        path.write_text(data=contents, encoding=encoding)
+        n_bytes: int = path.write_bytes(contents.encode(encoding or "utf-8"))
+        record_bytes_written(n_bytes)
+
+
+def copy_file_if_not_exists(source: Union[Path, Traversable], dest: Path) -> None:
+    """
+    Copy ``source`` to ``dest``, unless ``dest`` exists, without reading the contents into Python.
+
+    See ``phito_projen.file_writer.copy_file_contents()`` for how the file is copied. Hard links
+    are never used: sample files are meant to be edited, and editing a hard link would edit the
+    sample in the installed ``phito_projen`` package too.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        dest_fd: int = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        return
+    try:
+        copy_file_contents(source, dest_fd)
+        n_bytes: int = os.fstat(dest_fd).st_size
+    except BaseException:
+        os.close(dest_fd)
+        dest.unlink()
+        raise
+    os.close(dest_fd)
+    record_bytes_written(n_bytes)
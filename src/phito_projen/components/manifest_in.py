@@ -1,6 +1,7 @@
 from pathlib import Path
 from typing import Optional, Union
-from projen import Component, TextFile, Project, JsonPatch
+from projen import Component, Project
+from phito_projen.components.incremental_files import IncrementalTextFile
 
 class ManifestIn(Component):
     def __init__(
@@ -37,18 +38,27 @@ class ManifestIn(Component):
         https://packaging.python.org/en/latest/guides/using-manifest-in/#manifest-in-commands
         """
         super().__init__(project)
-        self.__file = TextFile(project=self.project, file_path=str(file_path))
+        self.__file = IncrementalTextFile(project=self.project, file_path=str(file_path))
         _add_projen_marker_comment(text_file=self.__file)
 
 
+    def add_include(self, *file_glob_patterns: str, comment: Optional[str] = None):
+        if comment:
+            self.__file.add_line(_make_comment(comment))
+        self.__file.add_line(f"include {' '.join(file_glob_patterns)}")
+
     def add_recursive_include(self, dir_glob_pattern: str, *file_glob_patterns: str, comment: Optional[str] = None):
         if comment:
             self.__file.add_line(_make_comment(comment))
         self.__file.add_line(f"recursive-include {dir_glob_pattern} {' '.join(file_glob_patterns)}")
 
-def _add_projen_marker_comment(text_file: TextFile):
-    text_file.add_line(_make_comment(text_file.marker))
-    text_file.add_line("")
+    def add_global_exclude(self, *file_glob_patterns: str, comment: Optional[str] = None):
+        if comment:
+            self.__file.add_line(_make_comment(comment))
+        self.__file.add_line(f"global-exclude {' '.join(file_glob_patterns)}")
+
+def _add_projen_marker_comment(text_file: IncrementalTextFile):
+    text_file.add_lines([_make_comment(text_file.marker), ""])
 
 def _make_comment(comment: str) -> str:
     comment_text = comment.strip("#").strip()
@@ -0,0 +1,133 @@
+"""
+Models for a ``.pre-commit-config.yaml``; see https://pre-commit.com/#adding-pre-commit-plugins-to-your-project
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+LOCAL_REPO = "local"
+"""``repo`` of hooks defined in the config itself, which need no clone."""
+
+
+class PreCommitConfig(BaseModel):
+    repos: List[Repo]
+    """:param repos2: A list of repository mappings."""
+    default_install_hook_types: Any = None
+    """(optional: default [pre-commit]) a list of `--hook-types` which will be used by default when running pre-commit install."""
+    default_language_version: Any = None
+    """
+    (optional: default {}) a mapping from language to the default language_version 
+    that should be used for that language. 
+    This will only override individual hooks that do not set language_version.
+    
+    For example to use python3.7 for language: python hooks:
+
+    ```yaml
+    default_language_version:
+        python: python3.7
+    ```
+    """
+    default_stages: Any = None
+    """
+    (optional: default (all stages)) a configuration-wide default for the stages property of hooks. This will only override individual hooks that do not set stages. For example:
+
+    ```yaml
+    default_stages: [commit, push]
+    ```
+    """
+    files: Any = None
+    """(optional: default '') global file include pattern. new in 1.21.0."""
+    exclude: Any = None
+    """(optional: default ^$) global file exclude pattern. new in 1.1.0."""
+    fail_fast: Any = None
+    """(optional: default false) set to true to have pre-commit stop running hooks after the first failure. new in 1.1.0."""
+    minimum_pre_commit_version: Any = None
+    """(optional: default '0') require a minimum version of pre-commit. new in 1.15.0."""
+
+
+class Repo(BaseModel):
+    """
+    The repository mapping tells pre-commit where to get the code for the hook from.
+
+    A sample repository:
+
+    ```yaml
+    repos:
+    -   repo: https://github.com/pre-commit/pre-commit-hooks
+        rev: v1.2.3
+        hooks:
+        -   ...
+    ```
+    """
+
+    repo: str
+    """the repository url to git clone from, or ``local`` for hooks defined in the config itself"""
+    rev: Optional[str] = None
+    """
+    the revision or tag to clone at. new in 1.7.0: previously sha
+
+    Pin a tag or sha: a moving ref such as ``stable`` makes pre-commit clone the repository
+    and build the hook's environment again whenever the ref moves. ``local`` repos have no ``rev``.
+    """
+    hooks: List[Hook] = Field(default_factory=list)
+    """A list of hook mappings."""
+
+
+class Hook(BaseModel):
+
+    id: str
+    """which hook from the repository to use."""
+    alias: Optional[str] = None
+    """(Optional) allows the hook to be referenced using an additional id when using pre-commit run <hookid>. new in 1.14.0."""
+    name: Optional[str] = None
+    """(Optional) override the name of the hook - shown during hook execution."""
+    entry: Optional[str] = None
+    """(``local`` hooks only) the executable to run, optionally with arguments, e.g. ``python -m black``."""
+    language: Optional[str] = None
+    """
+    (``local`` hooks only) how to install and run the hook. ``system`` runs ``entry`` from the current
+    ``PATH``, e.g. the project's virtualenv, so pre-commit never builds an environment for the hook.
+    """
+    language_version: Optional[str] = None
+    """(Optional) override the language version for the hook. See Overriding Language Version."""
+    files: Optional[str] = None
+    """(Optional) override the default pattern for files to run on."""
+    exclude: Optional[str] = None
+    """(Optional) file exclude pattern."""
+    types: Optional[List[str]] = None
+    """(Optional) override the default file types to run on (AND). See Filtering files with types."""
+    types_or: Optional[List[str]] = None
+    """(Optional) override the default file types to run on (OR). See Filtering files with types. new in 2.9.0."""
+    exclude_types: Optional[List[str]] = None
+    """(Optional) file types to exclude."""
+    args: Optional[List[str]] = None
+    """(Optional) list of additional parameters to pass to the hook."""
+    stages: Optional[List[str]] = None
+    """(Optional) confines the hook to the commit, merge-commit, push, prepare-commit-msg, commit-msg, post-checkout, post-commit, post-merge, post-rewrite, or manual stage. See Confining hooks to run at certain stages."""
+    additional_dependencies: Optional[List[str]] = None
+    """(Optional) a list of dependencies that will be installed in the environment where this hook gets run. One useful application is to install plugins for hooks such as eslint."""
+    pass_filenames: Optional[bool] = None
+    """(Optional) if false, no filenames will be passed to the hook. Default: true."""
+    require_serial: Optional[bool] = None
+    """(Optional) if true, the hook runs in a single process rather than one per CPU. Default: false."""
+    always_run: Optional[bool] = None
+    """(Optional) if true, this hook will run even if there are no matching files."""
+    verbose: Optional[bool] = None
+    """(Optional) if true, forces the output of the hook to be printed even when the hook passes. new in 1.6.0."""
+    log_file: Optional[str] = None
+    """(Optional) if present, the hook output will additionally be written to a file when the hook fails or verbose is true."""
+
+
+PreCommitConfig.update_forward_refs()
+Repo.update_forward_refs()
+
+
+def to_pre_commit_dict(config: PreCommitConfig) -> Dict[str, Any]:
+    """Return ``config`` as it is written to ``.pre-commit-config.yaml``: unset options omitted, ``repos`` last."""
+    # ``model_dump`` in pydantic 2, ``dict`` in pydantic 1
+    dump = getattr(config, "model_dump", None) or config.dict
+    obj: Dict[str, Any] = dump(exclude_none=True)
+    obj["repos"] = obj.pop("repos")
+    return obj
@@ -0,0 +1,143 @@
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from projen import Component, Project
+from phito_projen.components.commentable_files.yaml_file import CommentableYamlFile
+from phito_projen.components.pre_commit.models import LOCAL_REPO, Hook, PreCommitConfig, Repo, to_pre_commit_dict
+from phito_projen.requirement_set import RequirementSet
+from phito_projen.synth import iter_projects
+
+PRE_COMMIT_HOOKS_REPO = "https://github.com/pre-commit/pre-commit-hooks"
+PRE_COMMIT_HOOKS_REV = "v4.4.0"
+
+LOCAL_HOOKS_REQUIREMENTS = ["pre-commit", "autoflake", "isort", "black", "flake8"]
+"""Installed in the project's virtualenv, where the default ``local`` hooks run them from."""
+
+LOCAL_HOOKS_EXTRA = "lint"
+"""The extra that ``LOCAL_HOOKS_REQUIREMENTS`` are added to; the ``dev`` extra includes every extra."""
+
+LOCAL_REPO_COMMENT = "runs the tools installed in the project's virtualenv: nothing to clone or install"
+
+
+def make_default_pre_commit_config() -> PreCommitConfig:
+    """
+    Return a config whose hooks each see only the files they check, and that builds as few environments as possible.
+
+    - the ``pre-commit-hooks`` repository is pinned, so it is cloned and installed once, not whenever a ref moves
+    - the formatters and linters are ``local`` hooks with ``language: system``, i.e. they run from
+      the project's virtualenv rather than from an environment that pre-commit builds for each hook
+    - every hook is filtered by ``types`` (or ``files``), so e.g. ``black`` is not started for a YAML change
+    """
+    return PreCommitConfig(
+        repos=[
+            Repo(
+                repo=PRE_COMMIT_HOOKS_REPO,
+                rev=PRE_COMMIT_HOOKS_REV,
+                hooks=[
+                    Hook(id="trailing-whitespace", types=["text"]),
+                    Hook(id="end-of-file-fixer", types=["text"]),
+                    Hook(id="mixed-line-ending", args=["--fix=auto"], types=["text"]),
+                    Hook(id="check-merge-conflict", types=["text"]),
+                    Hook(id="check-added-large-files"),
+                    Hook(id="check-ast", types=["python"]),
+                    Hook(id="debug-statements", types=["python"]),
+                    Hook(id="check-json", types=["json"]),
+                    Hook(id="check-toml", types=["toml"]),
+                    Hook(id="check-yaml", types=["yaml"]),
+                    Hook(id="requirements-txt-fixer", files=r"requirements.*\.txt$"),
+                ],
+            ),
+            Repo(
+                repo=LOCAL_REPO,
+                hooks=[
+                    make_local_hook(
+                        "autoflake",
+                        entry="autoflake --in-place --remove-all-unused-imports --remove-unused-variables",
+                    ),
+                    make_local_hook("isort", entry="isort"),
+                    make_local_hook("black", entry="black"),
+                    make_local_hook("flake8", entry="flake8"),
+                ],
+            ),
+        ]
+    )
+
+
+def make_local_hook(hook_id: str, entry: str, types: Optional[List[str]] = None, **kwargs: Any) -> Hook:
+    """
+    Return a hook that runs ``entry`` from the project's virtualenv.
+
+    :param types: file types the hook runs on; defaults to Python files
+    :param kwargs: other ``Hook`` fields, e.g. ``pass_filenames=False``
+    """
+    return Hook(
+        id=hook_id, name=kwargs.pop("name", hook_id), entry=entry, language="system", types=types or ["python"], **kwargs
+    )
+
+
+def make_exclude_pattern(fpaths: List[str]) -> str:
+    """Return a pattern that matches exactly the files in ``fpaths``."""
+    return "^(" + "|".join(re.escape(fpath) for fpath in fpaths) + ")$"
+
+
+class PreCommit(Component):
+    """
+    A ``.pre-commit-config.yaml`` rendered from a ``PreCommitConfig``.
+
+    ``config`` can be changed until the project is synthesized, e.g. with ``add_local_hook()``.
+    If the project has ``extras_require`` (e.g. a ``PythonPackage``), the tools run by the default
+    ``local`` hooks are added to its ``lint`` extra, so that they are installed in its virtualenv.
+
+    Files generated by ``projen`` (in this project and its subprojects) are excluded from all hooks,
+    unless ``config.exclude`` is set: they are read-only, and their formatting is decided by ``projen``,
+    so hooks such as ``end-of-file-fixer`` would otherwise fail on every commit that touches them.
+
+    :param config: defaults to ``make_default_pre_commit_config()``
+    """
+
+    def __init__(
+        self,
+        project: "Project",
+        config: Optional[PreCommitConfig] = None,
+        file_path: Union[str, Path] = ".pre-commit-config.yaml",
+    ) -> None:
+        super().__init__(project)
+        self.config: PreCommitConfig = config or make_default_pre_commit_config()
+        self.yaml_file = CommentableYamlFile(project=self.project, file_path=str(file_path))
+
+        extras_require: Optional[Dict[str, RequirementSet]] = getattr(project, "extras_require", None)
+        if config is None and extras_require is not None:
+            extras_require.setdefault(LOCAL_HOOKS_EXTRA, RequirementSet()).extend(LOCAL_HOOKS_REQUIREMENTS)
+
+    def add_repo(self, repo: Repo) -> None:
+        self.config.repos.append(repo)
+
+    def add_local_hook(self, hook: Hook) -> None:
+        """Add ``hook`` to the ``local`` repo, creating it if needed."""
+        for repo in self.config.repos:
+            if repo.repo == LOCAL_REPO:
+                repo.hooks.append(hook)
+                return
+        self.config.repos.append(Repo(repo=LOCAL_REPO, hooks=[hook]))
+
+    def get_generated_fpaths(self) -> List[str]:
+        """Return the paths of the read-only files generated by ``projen``, relative to this project."""
+        outdir = Path(self.project.outdir)
+        return sorted(
+            Path(os.path.relpath(Path(project.outdir) / file.path, outdir)).as_posix()
+            for project in iter_projects(self.project)
+            for file in project.files
+            if file.readonly
+        )
+
+    def pre_synthesize(self) -> None:
+        # runs before the YAML file's own pre_synthesize, since this component was added first
+        obj: Dict[str, Any] = to_pre_commit_dict(self.config)
+        generated_fpaths: List[str] = self.get_generated_fpaths()
+        if self.config.exclude is None and generated_fpaths:
+            obj = {"exclude": make_exclude_pattern(generated_fpaths), **obj}
+        self.yaml_file.obj = obj
+        for i, repo in enumerate(self.config.repos):
+            if repo.repo == LOCAL_REPO:
+                self.yaml_file.set_eol_comment_at_path(f"repos.[{i}].repo", LOCAL_REPO_COMMENT)
@@ -4,12 +4,9 @@ from phito_projen.components.templatized_file import TemplatizedFile
 from projen import Component
 from projen import Project
 
-from phito_projen.python_package import TPythonExtras
+from phito_projen.extras import TPythonExtras
 
-THIS_DIR = Path(__file__).parent
-PROJENRC_PY_TEMPLATE_FPATH = (
-    THIS_DIR / "./templates/.projenrc.template.py.jinja"
-).resolve()
+PROJENRC_PY_TEMPLATE_RESOURCE = "components/projenrc_py/templates/.projenrc.template.py.jinja"
 
 
 class ProjenrcPy(Component):
@@ -36,7 +33,7 @@ class ProjenrcPy(Component):
             project=project,
             file_path=file_path,
             is_sample=True,
-            template_body=PROJENRC_PY_TEMPLATE_FPATH.read_text(),
+            template_resource=PROJENRC_PY_TEMPLATE_RESOURCE,
             supports_comments=True,
             make_comment_fn=lambda line: f"# {line}",
             get_values_fn=lambda: {
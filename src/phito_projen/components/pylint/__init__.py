@@ -1,11 +1,8 @@
-from pathlib import Path
-from typing import Union
-from projen import IniFile, Component, Project
-
-
-class PylintRc(Component):
-    def __init__(
-        self, project: "Project", file_path: Union[str, Path] = ".pylintrc"
-    ) -> None:
-        super().__init__(project)
-        self.ini_file = IniFile(project=self.project, file_path=str(file_path))
+from phito_projen.components.pylint.pylintrc import (
+    DEFAULT_IGNORE,
+    DEFAULT_IGNORE_PATHS,
+    EXPENSIVE_RULES,
+    PylintRc,
+    make_fast_pylint_profile,
+)
+from phito_projen.components.pylint.models import PylintRc as PylintRcOptions, PylintRule
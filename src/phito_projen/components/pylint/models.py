@@ -1,15 +1,17 @@
 """
-Models for 
+Models for the options of a ``.pylintrc``.
+
+Each ``*Options`` model is one section of the file. Fields are named like the pylint
+options they set, with underscores instead of dashes, e.g. ``max_line_length`` sets
+``max-line-length``. Fields left at ``None`` (or at an empty list) are omitted from
+the file, so pylint's default applies.
 """
 
 from __future__ import annotations
-from typing import List, Optional
-from pydantic import BaseModel, Field
-
 
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Tuple
 
-class PylintRc(BaseModel):
-    messages_control: MessagesControlOptions
+from pydantic import BaseModel, Field
 
 
 class PylintRule(BaseModel):
@@ -22,79 +24,255 @@ class PylintRule(BaseModel):
     reason: Optional[str] = None
 
 
-class MessagesControlOptions(BaseModel):
+class PylintOptions(BaseModel):
+    """Base class of the models of each section."""
+
+    section: ClassVar[str]
+    """Name of the section of the ``.pylintrc``, e.g. ``MAIN``."""
+
+    def iter_options(self) -> Iterator[Tuple[str, Any]]:
+        """Yield the name of each option that is set, as in the ``.pylintrc``, and its value."""
+        for field_name in _get_field_names(self):
+            value: Any = getattr(self, field_name)
+            if value is None or value == []:
+                continue
+            yield field_name.replace("_", "-"), value
+
+
+class MainOptions(PylintOptions):
+    section: ClassVar[str] = "MAIN"
+
+    jobs: Optional[int] = None
+    """Number of processes to lint with; ``0`` uses one per CPU."""
+
+    load_plugins: List[str] = Field(default_factory=list)
+    """Plugins to load, e.g. ``pylint.extensions.docparams``; every plugin adds checks to every file."""
+
+    ignore: List[str] = Field(default_factory=list)
+    """Base names of files or directories not to lint."""
+
+    ignore_paths: List[str] = Field(default_factory=list)
+    """Regular expressions matched against the full paths of files or directories not to lint."""
+
+    ignore_patterns: List[str] = Field(default_factory=list)
+    """Regular expressions matched against the base names of files not to lint."""
+
+    persistent: Optional[bool] = None
+    """Whether to save the results of each run, to compare the next run with."""
+
+    limit_inference_results: Optional[int] = None
+    """Maximum number of values inferred for a single node; lower is faster but less thorough."""
+
+    extension_pkg_allow_list: List[str] = Field(default_factory=list)
+    """C extensions that may be imported, to be introspected."""
+
+    fail_under: Optional[float] = None
+    py_version: Optional[str] = None
+    recursive: Optional[bool] = None
+    suggestion_mode: Optional[bool] = None
+    unsafe_load_any_extension: Optional[bool] = None
+
+
+class MessagesControlOptions(PylintOptions):
     """Settings for the pylint "messages control"."""
 
-    disable: List[PylintRule] = Field(list)
+    section: ClassVar[str] = "MESSAGES CONTROL"
+
+    disable: List[PylintRule] = Field(default_factory=list)
     """Pylint rules to disable"""
 
-    enable: List[PylintRule] = Field(list)
+    enable: List[PylintRule] = Field(default_factory=list)
     """Pylint rules to enable"""
 
 
-class MainOptions(BaseModel):
-    ...
+class ReportsOptions(PylintOptions):
+    section: ClassVar[str] = "REPORTS"
+
+    reports: Optional[bool] = None
+    """Whether to print the full report, rather than only the messages."""
 
+    score: Optional[bool] = None
+    output_format: Optional[str] = None
+    msg_template: Optional[str] = None
 
-class ReportsOptions(BaseModel):
-    ...
 
+class LoggingOptions(PylintOptions):
+    section: ClassVar[str] = "LOGGING"
 
-class LoggingOptions(BaseModel):
-    ...
+    logging_format_style: Optional[str] = None
+    """``old`` for ``%`` formatting, ``new`` for ``{}`` formatting."""
 
+    logging_modules: List[str] = Field(default_factory=list)
 
-class SpellingOptions(BaseModel):
-    ...
 
+class SpellingOptions(PylintOptions):
+    """The spelling checker only runs if ``spelling_dict`` is set; it requires ``pyenchant``."""
 
-class MiscellaneousOptions(BaseModel):
-    ...
+    section: ClassVar[str] = "SPELLING"
 
+    spelling_dict: Optional[str] = None
+    spelling_ignore_words: List[str] = Field(default_factory=list)
+    spelling_private_dict_file: Optional[str] = None
+    max_spelling_suggestions: Optional[int] = None
 
-class TypeCheckOptions(BaseModel):
-    ...
 
+class MiscellaneousOptions(PylintOptions):
+    section: ClassVar[str] = "MISCELLANEOUS"
 
-class ClassesOptions(BaseModel):
-    ...
+    notes: List[str] = Field(default_factory=list)
+    """Tags that mark a comment as a ``fixme``, e.g. ``TODO``."""
 
 
-class VariablesOptions(BaseModel):
-    ...
+class TypeCheckOptions(PylintOptions):
+    section: ClassVar[str] = "TYPECHECK"
 
+    ignored_modules: List[str] = Field(default_factory=list)
+    """Modules whose members are not checked, e.g. because they are generated at runtime."""
 
-class FormatOptions(BaseModel):
-    ...
+    ignored_classes: List[str] = Field(default_factory=list)
+    generated_members: List[str] = Field(default_factory=list)
+    ignore_none: Optional[bool] = None
+    ignore_on_opaque_inference: Optional[bool] = None
 
 
-class ImportsOptions(BaseModel):
-    ...
+class ClassesOptions(PylintOptions):
+    section: ClassVar[str] = "CLASSES"
 
+    defining_attr_methods: List[str] = Field(default_factory=list)
+    exclude_protected: List[str] = Field(default_factory=list)
+    valid_classmethod_first_arg: List[str] = Field(default_factory=list)
+    valid_metaclass_classmethod_first_arg: List[str] = Field(default_factory=list)
 
-class MethodArgsOptions(BaseModel):
-    ...
 
+class VariablesOptions(PylintOptions):
+    section: ClassVar[str] = "VARIABLES"
 
-class ExceptionsOptions(BaseModel):
-    ...
+    dummy_variables_rgx: Optional[str] = None
+    ignored_argument_names: Optional[str] = None
+    allow_global_unused_variables: Optional[bool] = None
+    callbacks: List[str] = Field(default_factory=list)
+    init_import: Optional[bool] = None
 
 
-class RefactoringOptions(BaseModel):
-    ...
+class FormatOptions(PylintOptions):
+    section: ClassVar[str] = "FORMAT"
 
+    max_line_length: Optional[int] = None
+    max_module_lines: Optional[int] = None
+    ignore_long_lines: Optional[str] = None
+    indent_string: Optional[str] = None
 
-class SimilaritiesOptions(BaseModel):
-    ...
 
+class ImportsOptions(PylintOptions):
+    section: ClassVar[str] = "IMPORTS"
 
-class DesignOptions(BaseModel):
-    ...
+    allow_wildcard_with_all: Optional[bool] = None
+    deprecated_modules: List[str] = Field(default_factory=list)
+    known_third_party: List[str] = Field(default_factory=list)
+    preferred_modules: List[str] = Field(default_factory=list)
 
 
-class StringOptions(BaseModel):
-    ...
+class MethodArgsOptions(PylintOptions):
+    section: ClassVar[str] = "METHOD_ARGS"
 
+    timeout_methods: List[str] = Field(default_factory=list)
+    """Methods that should be called with a ``timeout`` argument, e.g. ``requests.api.get``."""
 
-class BasicOptions(BaseModel):
-    ...
+
+class ExceptionsOptions(PylintOptions):
+    section: ClassVar[str] = "EXCEPTIONS"
+
+    overgeneral_exceptions: List[str] = Field(default_factory=list)
+
+
+class RefactoringOptions(PylintOptions):
+    section: ClassVar[str] = "REFACTORING"
+
+    max_nested_blocks: Optional[int] = None
+    never_returning_functions: List[str] = Field(default_factory=list)
+
+
+class SimilaritiesOptions(PylintOptions):
+    """The similarities checker compares every pair of files; it only runs if ``duplicate-code`` is enabled."""
+
+    section: ClassVar[str] = "SIMILARITIES"
+
+    min_similarity_lines: Optional[int] = None
+    ignore_comments: Optional[bool] = None
+    ignore_docstrings: Optional[bool] = None
+    ignore_imports: Optional[bool] = None
+    ignore_signatures: Optional[bool] = None
+
+
+class DesignOptions(PylintOptions):
+    section: ClassVar[str] = "DESIGN"
+
+    max_args: Optional[int] = None
+    max_attributes: Optional[int] = None
+    max_bool_expr: Optional[int] = None
+    max_branches: Optional[int] = None
+    max_locals: Optional[int] = None
+    max_parents: Optional[int] = None
+    max_public_methods: Optional[int] = None
+    max_returns: Optional[int] = None
+    max_statements: Optional[int] = None
+    min_public_methods: Optional[int] = None
+
+
+class StringOptions(PylintOptions):
+    section: ClassVar[str] = "STRING"
+
+    check_quote_consistency: Optional[bool] = None
+    check_str_concat_over_line_jumps: Optional[bool] = None
+
+
+class BasicOptions(PylintOptions):
+    section: ClassVar[str] = "BASIC"
+
+    good_names: List[str] = Field(default_factory=list)
+    bad_names: List[str] = Field(default_factory=list)
+    include_naming_hint: Optional[bool] = None
+    docstring_min_length: Optional[int] = None
+    no_docstring_rgx: Optional[str] = None
+
+
+class PylintRc(BaseModel):
+    """All sections of a ``.pylintrc``, in the order they are written."""
+
+    main: MainOptions = Field(default_factory=MainOptions)
+    messages_control: MessagesControlOptions = Field(default_factory=MessagesControlOptions)
+    reports: ReportsOptions = Field(default_factory=ReportsOptions)
+    logging: LoggingOptions = Field(default_factory=LoggingOptions)
+    spelling: SpellingOptions = Field(default_factory=SpellingOptions)
+    miscellaneous: MiscellaneousOptions = Field(default_factory=MiscellaneousOptions)
+    typecheck: TypeCheckOptions = Field(default_factory=TypeCheckOptions)
+    classes: ClassesOptions = Field(default_factory=ClassesOptions)
+    variables: VariablesOptions = Field(default_factory=VariablesOptions)
+    format: FormatOptions = Field(default_factory=FormatOptions)
+    imports: ImportsOptions = Field(default_factory=ImportsOptions)
+    method_args: MethodArgsOptions = Field(default_factory=MethodArgsOptions)
+    exceptions: ExceptionsOptions = Field(default_factory=ExceptionsOptions)
+    refactoring: RefactoringOptions = Field(default_factory=RefactoringOptions)
+    similarities: SimilaritiesOptions = Field(default_factory=SimilaritiesOptions)
+    design: DesignOptions = Field(default_factory=DesignOptions)
+    string: StringOptions = Field(default_factory=StringOptions)
+    basic: BasicOptions = Field(default_factory=BasicOptions)
+
+    def iter_sections(self) -> Iterator[PylintOptions]:
+        for field_name in _get_field_names(self):
+            yield getattr(self, field_name)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Return the options that are set, keyed by section and then by option name."""
+        sections: Dict[str, Dict[str, Any]] = {}
+        for section in self.iter_sections():
+            options: Dict[str, Any] = dict(section.iter_options())
+            if options:
+                sections[section.section] = options
+        return sections
+
+
+def _get_field_names(model: BaseModel) -> List[str]:
+    # ``model_fields`` in pydantic 2, ``__fields__`` in pydantic 1
+    fields: Dict[str, Any] = getattr(type(model), "model_fields", None) or model.__fields__
+    return list(fields)
@@ -1,6 +1,7 @@
 from pathlib import Path
 from typing import Union
-from projen import Component, TomlFile, Project, JsonPatch
+from projen import Component, Project, JsonPatch
+from phito_projen.components.incremental_files import IncrementalTomlFile
 
 # docutils is needed if the long_description_... is an rst file (README.rst instead of README.md)
 DEFAULT_PYPROJECT_TOML_OBJ = {
@@ -18,5 +19,5 @@ class PyprojectToml(Component):
         file_path: Union[str, Path] = "pyproject.toml",
     ) -> None:
         super().__init__(project)
-        self.toml_file = TomlFile(project=self.project, file_path=str(file_path))
+        self.toml_file = IncrementalTomlFile(project=self.project, file_path=str(file_path))
         self.toml_file.patch(JsonPatch.add(path="", value=DEFAULT_PYPROJECT_TOML_OBJ))
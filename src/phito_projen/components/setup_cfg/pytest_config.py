@@ -0,0 +1,136 @@
+"""
+The test configuration written to the ``[tool:pytest]`` and ``[coverage:*]`` sections of ``setup.cfg``.
+
+By default, tests run on every core with ``pytest-xdist`` and coverage is measured in
+each worker and combined by ``pytest-cov``. Tests are marked with tiers:
+
+- ``foundational``: tests that must pass for the other tests to be worth running
+- ``slow``: tests that take a long time to execute
+
+``add_test_tasks()`` adds a projen task for each tier, and makes the ``test`` task run
+the ``foundational`` tier first, stopping at its first failure, before all other tests.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Union
+
+from projen import Project, Task
+
+TSetupCfgValue = Union[str, List[str]]
+TSetupCfgSections = Dict[str, Dict[str, TSetupCfgValue]]
+
+XDIST_DIST_MODES = ("load", "loadscope", "loadfile", "loadgroup", "worksteal", "no")
+
+DEFAULT_MARKERS = {
+    "foundational": "Tests that must pass for subsequent tests to run.",
+    "slow": "Tests that take a long time to execute",
+}
+
+NO_TESTS_COLLECTED_EXIT_CODE = 5
+"""Exit code of ``pytest`` when a tier has no tests; not a failure."""
+
+
+@dataclass
+class PytestConfig:
+    """
+    :param workers: ``pytest-xdist`` workers (``-n``): a number, ``auto`` for one per core, or ``None`` to run serially
+    :param dist: how ``pytest-xdist`` distributes tests: ``loadscope`` keeps the tests of a module or class
+        on one worker, so module- and class-scoped fixtures run once; ``loadfile`` groups by file
+    :param coverage: measure coverage of ``coverage_source`` in every worker, and combine the results
+    :param coverage_source: the package to measure; if ``None``, ``PythonPackage`` fills in its ``module_name``
+    :param durations: report the ``durations`` slowest tests, if they take at least ``durations_min`` seconds
+    """
+
+    workers: Optional[Union[int, str]] = "auto"
+    dist: str = "loadscope"
+    coverage: bool = True
+    coverage_source: Optional[str] = None
+    fail_under: Optional[float] = None
+    durations: Optional[int] = 10
+    durations_min: float = 1.0
+    testpaths: List[str] = field(default_factory=lambda: ["tests"])
+    markers: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_MARKERS))
+    extra_addopts: List[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.dist not in XDIST_DIST_MODES:
+            raise ValueError(f"Invalid xdist distribution mode {self.dist!r}; expected one of {XDIST_DIST_MODES}.")
+
+    @property
+    def addopts(self) -> List[str]:
+        opts: List[str] = ["--strict-markers"]
+        if self.workers is not None:
+            opts.extend([f"--numprocesses={self.workers}", f"--dist={self.dist}"])
+        if self.coverage:
+            opts.extend(["--cov", "--cov-report=term-missing:skip-covered"])
+        if self.durations is not None:
+            opts.extend([f"--durations={self.durations}", f"--durations-min={self.durations_min}"])
+        return opts + self.extra_addopts
+
+    def to_setup_cfg_sections(self) -> TSetupCfgSections:
+        """Return the sections of ``setup.cfg`` that configure ``pytest`` and ``coverage``, in order."""
+        sections: TSetupCfgSections = {
+            "tool:pytest": {
+                "testpaths": self.testpaths,
+                "addopts": self.addopts,
+                "markers": [f"{name}: {description}" for name, description in self.markers.items()],
+            }
+        }
+        if not self.coverage:
+            return sections
+
+        coverage_run: Dict[str, TSetupCfgValue] = {"branch": "true", "parallel": "true"}
+        if self.coverage_source:
+            coverage_run["source"] = self.coverage_source
+        sections["coverage:run"] = coverage_run
+        if self.coverage_source:
+            # data measured against an installed copy of the package is combined as if measured in src/
+            sections["coverage:paths"] = {
+                "source": [f"src/{self.coverage_source}", f"*/site-packages/{self.coverage_source}"]
+            }
+        coverage_report: Dict[str, TSetupCfgValue] = {"show_missing": "true", "skip_covered": "true"}
+        if self.fail_under is not None:
+            coverage_report["fail_under"] = str(self.fail_under)
+        sections["coverage:report"] = coverage_report
+        return sections
+
+
+def with_coverage_source(config: PytestConfig, module_name: str) -> PytestConfig:
+    """Return ``config``, with ``coverage_source`` set to ``module_name`` if it is not set."""
+    if config.coverage_source is not None:
+        return config
+    return replace(config, coverage_source=module_name)
+
+
+def add_test_tasks(project: Project, config: PytestConfig) -> None:
+    """
+    Add a ``test:<tier>`` task per marker, plus ``test:fast`` (everything but ``slow``), and make
+    ``test`` run the ``foundational`` tier first, if there is one.
+    """
+    for marker in config.markers:
+        project.add_task(
+            f"test:{marker}",
+            description=f"Run the tests marked '{marker}'",
+            exec=_pytest_command(f'-m "{marker}"'),
+        )
+    if "slow" in config.markers:
+        project.add_task("test:fast", description="Run all tests except the slow ones", exec=_pytest_command('-m "not slow"'))
+
+    test_task: Optional[Task] = project.tasks.try_find("test")
+    if test_task is None:
+        return
+    if "foundational" in config.markers:
+        foundational_args, other_args = '-m "foundational" --exitfirst', '-m "not foundational"'
+        if config.coverage:
+            # coverage of both runs is combined; the threshold only applies to the combined result
+            foundational_args += " --cov-fail-under=0"
+            other_args += " --cov-append"
+        test_task.exec(_pytest_command(foundational_args))
+        test_task.exec(_pytest_command(other_args))
+    else:
+        test_task.exec(_pytest_command(""))
+
+
+def _pytest_command(args: str) -> str:
+    command: str = f"python -m pytest {args}".rstrip()
+    return f"{command} || [ $? -eq {NO_TESTS_COLLECTED_EXIT_CODE} ]"
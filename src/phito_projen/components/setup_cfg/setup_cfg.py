@@ -1,47 +1,70 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Optional, Union
+from phito_projen.components.setup_cfg.pytest_config import PytestConfig
 from phito_projen.components.templatized_file import TemplatizedFile
+from phito_projen.requirement_set import RequirementSet
 from projen import Component
 from projen import Project
 
-THIS_DIR = Path(__file__).parent
-SETUP_CFG_TEMPLATE_FPATH = (
-    THIS_DIR / "./templates/setup.template.cfg.jinja"
-).resolve()
+SETUP_CFG_TEMPLATE_RESOURCE = "components/setup_cfg/templates/setup.template.cfg.jinja"
 
 
 class SetupCfg(Component):
     def __init__(
         self,
         project: "Project",
-        install_requires: List[str],
+        install_requires: Iterable[str],
         package_name: str,
         package_version: str,
-        extras_require: Optional[Dict[str, List[str]]] = None,
+        extras_require: Optional[Dict[str, Iterable[str]]] = None,
         entrypoints: Optional[Dict[str, str]] = None,
         file_path: Union[str, Path] = "setup.cfg",
+        pytest_config: Optional[PytestConfig] = None,
     ) -> None:
+        """
+        :param pytest_config: the ``[tool:pytest]`` and ``[coverage:*]`` sections; by default,
+            tests run in parallel with combined coverage
+        """
         super().__init__(project)
         self.file_path = Path(file_path)
 
-        self.extras_require = extras_require or {}
+        # shared, if possible, so that extras added to the package later also end up in setup.cfg
+        self.extras_require: Dict[str, RequirementSet] = _as_requirement_sets(extras_require or {})
         self.entrypoints = entrypoints or {}
-        self.install_requires = install_requires
+        self.install_requires: RequirementSet = _as_requirement_set(install_requires)
         self.package_name = package_name
         self.package_version = package_version
+        self.pytest_config: PytestConfig = pytest_config or PytestConfig()
 
         self.setup_cfg_file = TemplatizedFile(
             project=project,
             file_path=file_path,
             is_sample=False,
-            template_body=SETUP_CFG_TEMPLATE_FPATH.read_text(),
+            template_resource=SETUP_CFG_TEMPLATE_RESOURCE,
             get_values_fn=lambda: {
                 "name": self.package_name,
-                "install_requires": self.install_requires,
+                "install_requires": self.install_requires.to_list(),
                 "version": self.package_version,
-                "extras_require": self.extras_require,
+                "extras_require": {
+                    extra_name: reqs.to_list() for extra_name, reqs in self.extras_require.items()
+                },
                 "entrypoints": self.entrypoints,
+                "test_sections": self.pytest_config.to_setup_cfg_sections(),
             },
             supports_comments=True,
             make_comment_fn=lambda line: f"# {line}",
         )
+
+
+def _as_requirement_sets(extras_require: Dict[str, Iterable[str]]) -> Dict[str, RequirementSet]:
+    """Use ``extras_require`` as-is if it only holds ``RequirementSet``s, so that it stays shared with its owner."""
+    if all(isinstance(requirements, RequirementSet) for requirements in extras_require.values()):
+        return extras_require
+    return {extra_name: _as_requirement_set(requirements) for extra_name, requirements in extras_require.items()}
+
+
+def _as_requirement_set(requirements: Iterable[str]) -> RequirementSet:
+    """Use ``requirements`` as-is if it is a ``RequirementSet``, so that it stays shared with its owner."""
+    if isinstance(requirements, RequirementSet):
+        return requirements
+    return RequirementSet(requirements)
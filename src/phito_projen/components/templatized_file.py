@@ -1,8 +1,13 @@
+from copy import deepcopy
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Text, Union
+from typing import Any, Callable, Dict, List, Optional, Text, Tuple, Union
 from projen import Component, Project, TextFile, SampleFile
+from phito_projen.components.incremental_files import IncrementalTextFile
 from phito_projen.components.lazy_sample_file import LazySampleFile
 from jinja2 import Template
+from phito_projen.instrumentation import trace_span
+from phito_projen.template_manifest import read_template_resource
+from phito_projen.template_registry import get_template_registry, read_template_source
 
 TGetValuesFn = Callable[[], Dict[str, Any]]
 TMakeCommentFn = Callable[[str], str]
@@ -15,6 +20,7 @@ class TemplatizedFile(Component):
         file_path: Union[str, Path],
         template_body: Optional[str] = None,
         template_fpath: Optional[Path] = None,
+        template_resource: Optional[str] = None,
         initial_values: Optional[Dict[str, Any]] = None,
         get_values_fn: Optional[TGetValuesFn] = None,
         is_sample: bool = False,
@@ -23,9 +29,9 @@ class TemplatizedFile(Component):
     ) -> None:
         super().__init__(project)
 
-        if template_body and template_fpath:
+        if len([source for source in (template_body, template_fpath, template_resource) if source]) > 1:
             raise ValueError(
-                "Parameters 'template_string' and 'template_fpath' cannot both be set."
+                "Only one of the parameters 'template_body', 'template_fpath' and 'template_resource' can be set."
             )
 
         if initial_values is not None and get_values_fn:
@@ -36,10 +42,16 @@ class TemplatizedFile(Component):
         self.file_path = file_path
         self.template_body = template_body
         self.template_fpath = template_fpath
+        self.template_resource = template_resource
+        """Path of a template shipped in ``phito_projen``, relative to the package; see ``phito_projen.template_manifest``."""
         self.values = initial_values or {}
         self.get_values_fn = get_values_fn
         self.supports_comments = supports_comments
         self.make_comment_fn = make_comment_fn
+        self.is_sample = is_sample
+        self.__prerendered: Optional[Tuple[Dict[str, Any], str]] = None
+        self.last_rendered: Optional[Tuple[Dict[str, Any], str]] = None
+        """The values this file was last rendered with, and the resulting contents."""
 
         if is_sample:
             self.__file = LazySampleFile(
@@ -48,22 +60,52 @@ class TemplatizedFile(Component):
                 get_contents_fn=self.__render_template,
             )
         else:
-            self.__file = TextFile(
-                project=project, file_path=file_path, lines=[], marker=True
+            self.__file = IncrementalTextFile(
+                project=project, file_path=str(file_path), lines=[], marker=True
             )
 
+    def get_template_source(self) -> str:
+        """Return the Jinja source this file is rendered from."""
+        if self.template_body:
+            return self.template_body
+        if self.template_resource:
+            return read_template_resource(self.template_resource)
+        return read_template_source(Path(self.template_fpath))
+
+    def get_values(self) -> Dict[str, Any]:
+        """Return the values the template will be rendered with."""
+        return self.get_values_fn() if self.get_values_fn else self.values
+
+    def set_prerendered_contents(self, values: Dict[str, Any], contents: str) -> None:
+        """
+        Use ``contents``, rendered ahead of time from ``values``, instead of rendering during synthesis.
+
+        ``values`` must be what ``get_values()`` returns when the file is synthesized: to avoid evaluating
+        the values twice, they are not checked again. Prerender only once the project is fully configured.
+        """
+        self.__prerendered = (values, contents)
+
+    @property
+    def has_prerendered_contents(self) -> bool:
+        return self.__prerendered is not None
+
     def __render_template(self) -> str:
-        template_body: str = self.template_body or self.template_fpath.read_text()
-        template: Template = Template(source=template_body)
-        values: Dict[str, Any] = (
-            self.get_values_fn() if self.get_values_fn else self.values
-        )
-        return template.render(values)
+        if self.__prerendered is not None:
+            self.last_rendered, self.__prerendered = self.__prerendered, None
+            return self.last_rendered[1]
+        with trace_span("TemplatizedFile.get_values", file_path=str(self.file_path)):
+            values: Dict[str, Any] = self.get_values()
+        with trace_span("TemplatizedFile.render", file_path=str(self.file_path)):
+            template: Template = get_template_registry().get_template(self.get_template_source())
+            contents = template.render(values)
+        self.last_rendered = (deepcopy(values), contents)
+        return contents
 
     def pre_synthesize(self) -> None:
-        if isinstance(self.__file, TextFile):
-            contents: str = self.__render_template()
-            if self.supports_comments:
-                marker_comment = self.make_comment_fn(self.__file.marker)
-                self.__file.add_line(marker_comment)
-            [self.__file.add_line(line) for line in contents.splitlines()]
+        if isinstance(self.__file, IncrementalTextFile):
+            with trace_span("TemplatizedFile.pre_synthesize", file_path=str(self.file_path)):
+                contents: str = self.__render_template()
+                lines: List[str] = contents.splitlines()
+                if self.supports_comments:
+                    lines.insert(0, self.make_comment_fn(self.__file.marker))
+                self.__file.set_lines(lines)
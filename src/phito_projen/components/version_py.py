@@ -0,0 +1,39 @@
+from pathlib import Path
+from typing import Callable, Union
+from phito_projen.components.templatized_file import TemplatizedFile
+from projen import Component
+from projen import Project
+
+VERSION_PY_TEMPLATE_BODY = '''\
+"""The version of the package, as set in ``.projenrc.py``."""
+
+__version__ = "{{ version }}"
+'''
+
+
+class VersionPy(Component):
+    """
+    A generated ``_version.py`` that holds the version of the package as ``__version__``.
+
+    Importing it is much cheaper than ``importlib.metadata.version()``, which searches the
+    distributions on ``sys.path``: a noticeable cost at import time in large virtualenvs,
+    and on every cold start of a CLI tool or serverless function.
+
+    :param file_path: path of the file, e.g. ``src/<module_name>/_version.py``
+    :param get_version_fn: returns the version written to the file; called when the project is synthesized,
+        so that the file follows the package's version, e.g. ``lambda: package.setup_cfg.package_version``
+    """
+
+    def __init__(self, project: "Project", file_path: Union[str, Path], get_version_fn: Callable[[], str]) -> None:
+        super().__init__(project)
+        self.get_version_fn = get_version_fn
+
+        self.version_py_file = TemplatizedFile(
+            project=project,
+            file_path=file_path,
+            is_sample=False,
+            template_body=VERSION_PY_TEMPLATE_BODY,
+            supports_comments=True,
+            make_comment_fn=lambda line: f"# {line}",
+            get_values_fn=lambda: {"version": self.get_version_fn()},
+        )
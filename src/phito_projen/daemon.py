@@ -0,0 +1,440 @@
+"""
+A long-lived synth server that keeps the ``projen`` runtime and the template caches warm.
+
+Running ``python .projenrc.py`` pays for starting Python, booting the ``projen`` (jsii)
+Node runtime and loading the templates before any file is rendered. The daemon pays
+for them once; later synths take a fraction of a second:
+
+.. code-block:: bash
+
+    python -m phito_projen.daemon serve --watch &  # start the daemon next to .projenrc.py
+    python -m phito_projen.daemon synth            # synthesize, like ``python .projenrc.py``
+    python -m phito_projen.daemon synth --check    # arguments are passed on to .projenrc.py
+    python -m phito_projen.daemon stop
+
+The daemon watches ``.projenrc.py`` and the template directories by polling their
+modification times. If ``.projenrc.py`` changed, it is run again from scratch, in the
+daemon's process. If only templates changed, the caches holding them are cleared and
+only the subprojects whose files are rendered from those templates are synthesized
+again. With ``--watch``, changes are synthesized as soon as they are seen; otherwise,
+at the next ``synth`` request.
+
+Modules imported by ``.projenrc.py`` are not reloaded; restart the daemon after changing them.
+
+``synth`` falls back to running ``.projenrc.py`` in the client's own process if no daemon
+is running. The daemon listens on a Unix domain socket, so it is not available on Windows.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import socket
+import socketserver
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+DEFAULT_PROJENRC_FPATH = ".projenrc.py"
+DEFAULT_SOCKET_FPATH = ".projen/synth-daemon.sock"
+"""Relative to the directory of ``.projenrc.py``."""
+
+DEFAULT_POLL_INTERVAL_SECONDS = 0.2
+
+TEMPLATE_DIR_NAME = "templates"
+EXCLUDED_DIR_NAMES = ("__pycache__", ".git", "node_modules")
+
+TFileSnapshot = Dict[Path, int]
+"""Maps each watched file to its ``st_mtime_ns``."""
+
+
+@dataclass
+class SynthResult:
+    """The outcome of one synth by the daemon, as sent to the client."""
+
+    exit_code: int = 0
+    output: str = ""
+    seconds: float = 0.0
+    resynthesized: str = "all"
+    """``"all"`` if ``.projenrc.py`` was run again, otherwise the names of the subprojects synthesized again."""
+
+
+class FileWatcher:
+    """
+    Detect files that were added, changed or removed, by polling their modification times.
+
+    Polling avoids a dependency on a platform-specific file-notification library; for the
+    few hundred files of a ``.projenrc.py`` and its templates, a poll takes about a millisecond.
+
+    :param paths: files, and directories whose files (recursively) are watched
+    """
+
+    def __init__(self, paths: Iterable[Path] = ()) -> None:
+        self.__paths: Set[Path] = set()
+        self.__snapshot: TFileSnapshot = {}
+        self.watch(paths)
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        """Also watch ``paths``; changes to them are reported from now on."""
+        new_paths: Set[Path] = {Path(path).absolute() for path in paths} - self.__paths
+        self.__paths.update(new_paths)
+        self.__snapshot.update(take_snapshot(new_paths))
+
+    def poll(self) -> List[Path]:
+        """Return the files that changed since the last poll."""
+        snapshot: TFileSnapshot = take_snapshot(self.__paths)
+        changed: List[Path] = sorted(
+            path
+            for path in snapshot.keys() | self.__snapshot.keys()
+            if snapshot.get(path) != self.__snapshot.get(path)
+        )
+        self.__snapshot = snapshot
+        return changed
+
+
+class SynthDaemon:
+    """
+    Run ``.projenrc.py`` in this process, and again whenever it or the templates it uses change.
+
+    :param projenrc_fpath: the ``.projenrc.py`` to run; the daemon changes into its directory
+    :param watch_paths: additional files or directories whose changes trigger a re-run of ``.projenrc.py``
+    :param watch: if ``True``, synthesize as soon as a change is seen rather than at the next ``synth`` request
+    """
+
+    def __init__(
+        self,
+        projenrc_fpath: str = DEFAULT_PROJENRC_FPATH,
+        socket_fpath: str = DEFAULT_SOCKET_FPATH,
+        watch_paths: Sequence[Path] = (),
+        watch: bool = False,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ) -> None:
+        self.projenrc_fpath = Path(projenrc_fpath).absolute()
+        self.socket_fpath = socket_fpath
+        self.watch = watch
+        self.poll_interval_seconds = poll_interval_seconds
+        self.last_result: Optional[SynthResult] = None
+        self.__watcher = FileWatcher([self.projenrc_fpath, *watch_paths, *_get_package_template_dirs()])
+        self.__root_projects: List[Any] = []
+        self.__argv: List[str] = []
+        self.__is_stopping = False
+
+    def serve_forever(self) -> None:
+        """Synthesize once, then serve requests from ``synth``/``stop`` clients until stopped."""
+        os.chdir(self.projenrc_fpath.parent)
+        self.synth()
+        _print_result(self.last_result, file=sys.stderr)
+
+        with _make_server(self.socket_fpath, daemon=self) as server:
+            server.timeout = self.poll_interval_seconds
+            print(f"synth daemon listening on {self.socket_fpath}", file=sys.stderr)
+            try:
+                while not self.__is_stopping:
+                    # requests are handled on this thread: the jsii runtime must not be called concurrently
+                    server.handle_request()
+                    if self.watch:
+                        self.__synth_changes(self.__watcher.poll(), announce=True)
+            finally:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(self.socket_fpath)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command: str = request.get("command", "")
+        if command == "stop":
+            self.__is_stopping = True
+            return {"stopped": True}
+        if command == "ping":
+            return {"pid": os.getpid()}
+        if command != "synth":
+            return asdict(SynthResult(exit_code=2, output=f"unknown command: {command!r}\n"))
+
+        argv: List[str] = list(request.get("argv", []))
+        if argv != self.__argv or not self.__root_projects:
+            # different arguments may build a different project tree
+            self.__argv = argv
+            self.__watcher.poll()
+            self.synth()
+        else:
+            if not self.__synth_changes(self.__watcher.poll()):
+                # with warm caches, this is cheap; it also restores generated files deleted by hand
+                self.synth_projects(self.__root_projects)
+        return asdict(self.last_result)
+
+    def synth(self) -> SynthResult:
+        """Run ``.projenrc.py`` from scratch."""
+        _clear_template_caches()
+        self.last_result = self.__run_capturing_output(self.__run_projenrc, resynthesized="all")
+        return self.last_result
+
+    def synth_projects(self, projects: Sequence[Any]) -> SynthResult:
+        """Synthesize ``projects`` again, each with its subprojects, without running ``.projenrc.py``."""
+        _clear_template_caches()
+
+        def run() -> None:
+            for project in projects:
+                project.synth()
+
+        names: str = ", ".join(project.name for project in projects)
+        self.last_result = self.__run_capturing_output(run, resynthesized=names)
+        return self.last_result
+
+    def __synth_changes(self, changed: List[Path], announce: bool = False) -> bool:
+        """Synthesize what ``changed`` affects, if anything; return whether anything was synthesized."""
+        if not changed:
+            return False
+        affected: Optional[List[Any]] = find_affected_projects(self.__root_projects, changed)
+        if affected is None:
+            self.synth()
+        elif affected:
+            self.synth_projects(affected)
+        else:
+            return False
+        if announce:
+            _print_result(self.last_result, file=sys.stderr)
+        return True
+
+    def __run_projenrc(self) -> None:
+        namespace: Dict[str, Any] = runpy.run_path(str(self.projenrc_fpath), run_name="__main__")
+        self.__root_projects = find_root_projects(namespace.values())
+        self.__watcher.watch(_get_template_fpaths(self.__root_projects))
+
+    def __run_capturing_output(self, fn, resynthesized: str) -> SynthResult:
+        # the jsii runtime forwards the output of the projen (Node) process to ``sys.stderr.buffer``
+        output = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", write_through=True)
+        exit_code = 0
+        start: float = time.perf_counter()
+        # components read the arguments of .projenrc.py, e.g. ``--check``, from ``sys.argv``
+        argv, sys.argv = sys.argv, [str(self.projenrc_fpath), *self.__argv]
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                fn()
+            except SystemExit as error:
+                exit_code = error.code if isinstance(error.code, int) else int(error.code is not None)
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                sys.argv = argv
+        if exit_code != 0:
+            # the project tree may be half-built; run .projenrc.py from scratch next time
+            self.__root_projects = []
+        return SynthResult(
+            exit_code=exit_code,
+            output=output.buffer.getvalue().decode("utf-8", errors="replace"),
+            seconds=time.perf_counter() - start,
+            resynthesized=resynthesized,
+        )
+
+
+def find_root_projects(values: Iterable[Any]) -> List[Any]:
+    """Return the projects among ``values``, e.g. the globals of ``.projenrc.py``, that have no parent."""
+    from projen import Project
+
+    roots: List[Any] = []
+    for value in values:
+        if isinstance(value, Project) and value.parent is None and value not in roots:
+            roots.append(value)
+    return roots
+
+
+def find_affected_projects(root_projects: Sequence[Any], changed: Sequence[Path]) -> Optional[List[Any]]:
+    """
+    Return the projects with files rendered from the ``changed`` templates.
+
+    Returns ``None`` if ``.projenrc.py`` must be run again: because something other than a
+    known template changed, or because the project tree could not be found.
+    """
+    if not root_projects:
+        return None
+    from phito_projen.synth import iter_projects
+
+    templates_by_project: Dict[Any, Set[Path]] = {
+        project: set(_iter_template_fpaths(project))
+        for root_project in root_projects
+        for project in iter_projects(root_project)
+    }
+    all_templates: Set[Path] = set().union(*templates_by_project.values())
+    if any(path not in all_templates and not _is_in_template_dir(path) for path in changed):
+        return None
+    return [project for project, templates in templates_by_project.items() if templates.intersection(changed)]
+
+
+def take_snapshot(paths: Iterable[Path]) -> TFileSnapshot:
+    snapshot: TFileSnapshot = {}
+    for path in paths:
+        try:
+            stat: os.stat_result = path.stat()
+        except FileNotFoundError:
+            continue
+        if not path.is_dir():
+            snapshot[path] = stat.st_mtime_ns
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [name for name in dirnames if name not in EXCLUDED_DIR_NAMES]
+            for filename in filenames:
+                fpath = Path(dirpath) / filename
+                with contextlib.suppress(FileNotFoundError):
+                    snapshot[fpath] = fpath.stat().st_mtime_ns
+    return snapshot
+
+
+def request_synth(
+    argv: Sequence[str] = (),
+    socket_fpath: str = DEFAULT_SOCKET_FPATH,
+    projenrc_fpath: str = DEFAULT_PROJENRC_FPATH,
+) -> int:
+    """
+    Ask the daemon to synthesize, print its output and return the exit code of ``.projenrc.py``.
+
+    If no daemon is listening on ``socket_fpath``, ``.projenrc.py`` is run in this process instead.
+    """
+    try:
+        response: Dict[str, Any] = send_request({"command": "synth", "argv": list(argv)}, socket_fpath)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"no synth daemon is listening on {socket_fpath}; running {projenrc_fpath}", file=sys.stderr)
+        sys.argv = [projenrc_fpath, *argv]
+        runpy.run_path(projenrc_fpath, run_name="__main__")
+        return 0
+    result = SynthResult(**response)
+    _print_result(result, file=sys.stdout)
+    return result.exit_code
+
+
+def send_request(request: Dict[str, Any], socket_fpath: str = DEFAULT_SOCKET_FPATH) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_fpath)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request: Dict[str, Any] = json.loads(self.rfile.readline())
+        except ValueError:
+            request = {}
+        response: Dict[str, Any] = self.server.daemon.handle(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def _make_server(socket_fpath: str, daemon: SynthDaemon) -> socketserver.BaseServer:
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("The synth daemon listens on a Unix domain socket, which this platform does not support.")
+    with contextlib.suppress(FileNotFoundError, ConnectionRefusedError):
+        send_request({"command": "ping"}, socket_fpath)
+        raise OSError(f"A synth daemon is already listening on {socket_fpath}.")
+    # a daemon that did not shut down cleanly leaves its socket behind
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_fpath)
+    Path(socket_fpath).parent.mkdir(parents=True, exist_ok=True)
+    server = socketserver.UnixStreamServer(socket_fpath, _RequestHandler)
+    server.daemon = daemon
+    return server
+
+
+def _print_result(result: Optional[SynthResult], file) -> None:
+    if result is None:
+        return
+    print(result.output, end="", file=file)
+    print(f"synthesized {result.resynthesized} in {result.seconds * 1e3:.0f} ms", file=sys.stderr)
+
+
+def _iter_template_fpaths(project: Any) -> Iterable[Path]:
+    from phito_projen.components.lazy_sample_file import LazySampleDir
+    from phito_projen.components.templatized_file import TemplatizedFile
+    from phito_projen.template_manifest import get_package_resource
+
+    for component in project.components:
+        if isinstance(component, TemplatizedFile):
+            if component.template_fpath:
+                yield Path(component.template_fpath).absolute()
+            elif component.template_resource:
+                resource = get_package_resource(component.template_resource)
+                if isinstance(resource, Path):
+                    yield resource.absolute()
+        elif isinstance(component, LazySampleDir):
+            for source, _ in component.iter_source_files():
+                if isinstance(source, Path):
+                    yield source.absolute()
+
+
+def _get_template_fpaths(root_projects: Sequence[Any]) -> List[Path]:
+    from phito_projen.synth import iter_projects
+
+    return [
+        fpath
+        for root_project in root_projects
+        for project in iter_projects(root_project)
+        for fpath in _iter_template_fpaths(project)
+    ]
+
+
+def _get_package_template_dirs() -> List[Path]:
+    """Return the ``templates/`` directories of ``phito_projen`` itself, if it is installed as a directory."""
+    from phito_projen.template_manifest import build_template_manifest, get_package_resource
+
+    package_dir = get_package_resource("")
+    if not isinstance(package_dir, Path):
+        return []
+    template_dirs: Set[Path] = set()
+    for name in build_template_manifest(package_dir):
+        parts: Tuple[str, ...] = Path(name).parts
+        template_dirs.add(package_dir.joinpath(*parts[: parts.index(TEMPLATE_DIR_NAME) + 1]))
+    return sorted(template_dirs)
+
+
+def _is_in_template_dir(path: Path) -> bool:
+    return TEMPLATE_DIR_NAME in path.parts[:-1]
+
+
+def _clear_template_caches() -> None:
+    from phito_projen import template_manifest, template_registry
+
+    template_registry.read_template_source.cache_clear()
+    template_manifest.load_template_manifest.cache_clear()
+    template_manifest.read_template_resource.cache_clear()
+    template_manifest._index_by_directory.cache_clear()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Keep a warm projen runtime for fast, repeated synths.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_FPATH, help="path of the daemon's Unix domain socket")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="start the daemon")
+    serve_parser.add_argument("--projenrc", default=DEFAULT_PROJENRC_FPATH)
+    serve_parser.add_argument("--watch", action="store_true", help="synthesize as soon as a change is seen")
+    serve_parser.add_argument("--watch-path", action="append", default=[], type=Path, help="also watch this path")
+    serve_parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL_SECONDS)
+
+    synth_parser = subparsers.add_parser("synth", help="synthesize through the daemon")
+    synth_parser.add_argument("--projenrc", default=DEFAULT_PROJENRC_FPATH, help="run if no daemon is listening")
+    subparsers.add_parser("stop", help="stop the daemon")
+
+    args, extra_args = parser.parse_known_args(argv)
+    if args.command == "serve":
+        SynthDaemon(
+            projenrc_fpath=args.projenrc,
+            socket_fpath=args.socket,
+            watch_paths=args.watch_path,
+            watch=args.watch,
+            poll_interval_seconds=args.poll_interval,
+        ).serve_forever()
+        return 0
+    if args.command == "synth":
+        return request_synth(extra_args, socket_fpath=args.socket, projenrc_fpath=args.projenrc)
+    if extra_args:
+        parser.error(f"unrecognized arguments: {' '.join(extra_args)}")
+    with contextlib.suppress(FileNotFoundError, ConnectionRefusedError):
+        send_request({"command": "stop"}, args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+Register a package's dependencies with ``projen``.
+
+``project.deps.add_dependency()`` is one call into the jsii runtime per dependency.
+``install_requires`` and ``extras_require`` often name the same requirement many times
+(e.g. ``pytest`` in several extras), so the specs are deduplicated locally first, and
+each unique spec is added once. ``projen`` stays the owner of ``.projen/deps.json``, so
+dependencies that components add later, e.g. in their own ``pre_synthesize()``, end up
+in it too.
+
+The cost still grows with the number of unique specs (about 1 ms per spec): ``projen``'s
+``Dependencies`` has no call that adds many dependencies at once, and writing
+``.projen/deps.json`` ourselves would take it over from ``projen``.
+"""
+
+from typing import Iterable, Mapping
+
+from projen import DependencyType, Project
+
+from phito_projen.instrumentation import trace_span
+from phito_projen.requirement_set import RequirementSet
+
+
+def register_dependencies(project: Project, specs_by_type: Mapping[DependencyType, Iterable[str]]) -> None:
+    """
+    Add the dependencies in ``specs_by_type`` to ``project``, one ``add_dependency()`` call per unique spec.
+
+    Specs of each type are deduplicated as in a ``RequirementSet``.
+
+    :param specs_by_type: dependency specs, in the format accepted by ``project.deps.add_dependency()``
+    """
+    with trace_span("register_dependencies"):
+        for dependency_type, specs in specs_by_type.items():
+            for spec in RequirementSet(specs):
+                project.deps.add_dependency(spec=spec, type=dependency_type)
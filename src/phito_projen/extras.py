@@ -0,0 +1,46 @@
+"""
+Types and helpers for a package's ``install_requires`` and ``extras_require``.
+
+This module only depends on the standard library, so tooling can import it
+without starting the ``projen`` (jsii) runtime.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping
+
+from phito_projen.requirement_set import RequirementSet
+
+TStrDict = Dict[str, Any]
+TPythonExtras = Dict[str, List[str]]
+TExtrasRequirementSets = Dict[str, RequirementSet]
+
+DEFAULT_EXTRAS_REQUIRE = {
+    "test": ["pytest", "pytest-cov", "pytest-xdist"],
+}
+
+
+def merge_extras(*extras: Mapping[str, Iterable[str]]) -> TExtrasRequirementSets:
+    """
+    Merge ``extras_require`` dicts into one ``RequirementSet`` per extra.
+
+    Extras and requirements keep the order in which they are first seen; see ``RequirementSet``
+    for how two requirements with the same (normalized) name are merged.
+    """
+    result: TExtrasRequirementSets = {}
+    for extras_dict in extras:
+        for extra_name, reqs in extras_dict.items():
+            result.setdefault(extra_name, RequirementSet()).update(reqs)
+    return result
+
+
+def union_extras_dicts(
+    extras_a: TPythonExtras, extras_b: TPythonExtras
+) -> TPythonExtras:
+    """Merge two ``extras_require`` dicts; like ``merge_extras()``, but returns plain lists."""
+    return {
+        extra_name: reqs.to_list()
+        for extra_name, reqs in merge_extras(extras_a, extras_b).items()
+    }
+
+
+def flatten_extras(extras: Mapping[str, Iterable[str]]) -> List[str]:
+    return [item for sublist in list(extras.values()) for item in sublist]
@@ -0,0 +1,103 @@
+"""
+A record of the content hashes of a project's synthesized files.
+
+The manifest is stored next to projen's own ``.projen/files.json``. A file whose
+rendered content hashes to the recorded value, and which has not been touched on disk
+since it was recorded, does not need to be written again. Skipping those writes
+keeps mtimes stable, so downstream build caches (Docker layers, make targets, etc.)
+are not invalidated by a synth that changed nothing.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+FILE_HASH_MANIFEST_FPATH = ".projen/file-hashes.json"
+"""Location of the manifest, relative to the project's ``outdir``."""
+
+TFileHashEntry = Dict[str, Union[str, int]]
+
+
+@dataclass
+class SynthReport:
+    """How many files a synth wrote, skipped because they were unchanged, or deleted."""
+
+    written: int = 0
+    skipped: int = 0
+    deleted: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.written} written, {self.skipped} unchanged, {self.deleted} deleted"
+
+
+class FileHashManifest:
+    """
+    Content hashes of the files synthesized into ``outdir``, keyed by path relative to ``outdir``.
+
+    Each entry also stores the size, mtime and mode the file had when it was recorded.
+    A file is only considered unchanged if those still match, so files edited by hand
+    or by another tool are always rewritten.
+    """
+
+    def __init__(self, outdir: Union[str, Path]) -> None:
+        self.outdir = Path(outdir)
+        self.fpath = self.outdir / FILE_HASH_MANIFEST_FPATH
+        self.__previous_entries: Dict[str, TFileHashEntry] = {}
+        self.__entries: Dict[str, TFileHashEntry] = {}
+        self.report = SynthReport()
+
+    def load(self) -> None:
+        """Read the manifest written by the previous synth, if any."""
+        self.__entries = {}
+        self.report = SynthReport()
+        try:
+            self.__previous_entries = json.loads(self.fpath.read_text())
+        except (OSError, ValueError):
+            self.__previous_entries = {}
+
+    def is_unchanged(self, file_path: str, contents: str) -> bool:
+        """Return whether the file on disk already holds ``contents``, without reading the file."""
+        previous: Optional[TFileHashEntry] = self.__previous_entries.get(file_path)
+        if previous is None or previous["sha256"] != hash_contents(contents):
+            return False
+        return previous == self.__make_entry(file_path, sha256=previous["sha256"])
+
+    def mark_skipped(self, file_path: str) -> None:
+        self.__entries[file_path] = self.__previous_entries[file_path]
+        self.report.skipped += 1
+
+    def mark_written(self, file_path: str, contents: str) -> None:
+        entry = self.__make_entry(file_path, sha256=hash_contents(contents))
+        if entry is not None:
+            self.__entries[file_path] = entry
+        self.report.written += 1
+
+    def save(self) -> SynthReport:
+        """Write the manifest for this synth and return the report of what it did."""
+        self.report.deleted = sum(
+            1
+            for file_path in self.__previous_entries
+            if file_path not in self.__entries and not (self.outdir / file_path).exists()
+        )
+        self.fpath.parent.mkdir(parents=True, exist_ok=True)
+        self.fpath.write_text(json.dumps(self.__entries, indent=2, sort_keys=True))
+        return self.report
+
+    def __make_entry(self, file_path: str, sha256: str) -> Optional[TFileHashEntry]:
+        try:
+            stat = os.stat(self.outdir / file_path)
+        except OSError:
+            return None
+        return {
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "mode": stat.st_mode,
+        }
+
+
+def hash_contents(contents: str) -> str:
+    return hashlib.sha256(contents.encode("utf-8")).hexdigest()
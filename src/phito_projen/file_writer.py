@@ -0,0 +1,319 @@
+"""
+Writers that put a project's synthesized files on disk.
+
+Components submit their files to the project's ``FileWriter`` during synthesis;
+nothing is written until ``flush()`` is called by the ``FileWriterFlush`` component,
+which ``PythonPackage`` synthesizes after all of its other components. Flushing
+then
+
+1. creates each missing directory once, rather than once per file,
+2. writes every file to a temporary file next to it and renames it into place,
+   so that a file is never seen half-written, and
+3. if ``fsync`` is enabled, syncs each file, and then each directory once,
+   rather than once per file in it.
+
+``FileWriter`` writes the files one at a time. ``ConcurrentFileWriter`` issues
+them from a bounded thread pool, which hides the per-file latency of network
+filesystems and slow CI disks. ``PythonPackage`` uses a ``ConcurrentFileWriter``
+unless it is given another writer:
+
+.. code-block:: python
+
+    PythonPackage(..., file_writer=ConcurrentFileWriter(max_workers=32, fsync=True))
+"""
+
+import errno
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Union
+
+from phito_projen.instrumentation import record_bytes_written, trace_span
+from phito_projen.template_manifest import Traversable
+
+TOnWrittenFn = Callable[[], None]
+"""Called, on the thread that flushes the writer, once a file has been written."""
+
+DEFAULT_MAX_WORKERS = 8
+
+FICLONE = 0x40049409
+"""``ioctl`` request that makes a file share the data blocks of another (a reflink); Linux only."""
+
+
+@dataclass
+class WriteReport:
+    """What a ``FileWriter.flush()`` wrote, and how fast."""
+
+    files: int = 0
+    bytes: int = 0
+    directories_created: int = 0
+    seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.files} files ({self.bytes / 1e3:.1f} kB) in {self.seconds * 1e3:.1f} ms, "
+            f"{self.files_per_second:.0f} files/s, {self.megabytes_per_second:.1f} MB/s"
+        )
+
+
+@dataclass
+class _PendingWrite:
+    path: Path
+    contents: Optional[bytes]
+    source: Optional[Union[Path, Traversable]]
+    mode: Optional[int]
+    exclusive: bool
+    on_written: Optional[TOnWrittenFn]
+
+
+class FileWriter:
+    """
+    Write submitted files atomically, one at a time, when ``flush()`` is called.
+
+    Subclasses can change how the batch of files is written by overriding ``_write_all()``.
+
+    :param fsync: if ``True``, sync every file and directory to disk before ``flush()`` returns
+    """
+
+    def __init__(self, fsync: bool = False) -> None:
+        self.fsync = fsync
+        self.last_report = WriteReport()
+        self.__pending: List[_PendingWrite] = []
+        self.__default_mode: int = 0o666 & ~_get_umask()
+
+    def write(
+        self,
+        path: Union[str, Path],
+        contents: bytes,
+        *,
+        mode: Optional[int] = None,
+        exclusive: bool = False,
+        on_written: Optional[TOnWrittenFn] = None,
+    ) -> None:
+        """
+        Submit ``contents`` to be written to ``path``.
+
+        :param mode: permissions of the file; by default, those of a new file under the current umask
+        :param exclusive: if ``True``, an existing file at ``path`` is left as it is
+        :param on_written: called once the file has been written, unless it was left as it is
+        """
+        self.__pending.append(
+            _PendingWrite(Path(path), contents=contents, source=None, mode=mode, exclusive=exclusive, on_written=on_written)
+        )
+
+    def copy(
+        self,
+        source: Union[Path, Traversable],
+        path: Union[str, Path],
+        *,
+        mode: Optional[int] = None,
+        exclusive: bool = False,
+        on_written: Optional[TOnWrittenFn] = None,
+    ) -> None:
+        """Submit ``source`` to be copied to ``path``; see ``copy_file_contents()`` for how it is copied."""
+        self.__pending.append(
+            _PendingWrite(Path(path), contents=None, source=source, mode=mode, exclusive=exclusive, on_written=on_written)
+        )
+
+    def flush(self) -> WriteReport:
+        """Write all submitted files and return a report of the throughput achieved."""
+        pending, self.__pending = self.__pending, []
+        report = WriteReport()
+        with trace_span(f"{type(self).__name__}.flush", n_files=len(pending)):
+            start: float = time.perf_counter()
+            directories: List[Path] = sorted({write.path.parent for write in pending})
+            report.directories_created = _make_directories(directories)
+
+            written: List[int] = self._write_all(pending)
+            if self.fsync:
+                for directory in directories:
+                    _fsync_directory(directory)
+            report.seconds = time.perf_counter() - start
+
+            for write, n_bytes in zip(pending, written):
+                if n_bytes < 0:
+                    continue
+                report.files += 1
+                report.bytes += n_bytes
+                if write.on_written:
+                    write.on_written()
+            record_bytes_written(report.bytes)
+        self.last_report = report
+        return report
+
+    def _write_all(self, pending: List[_PendingWrite]) -> List[int]:
+        """Write ``pending``, returning the number of bytes written for each, or ``-1`` if it was left as it was."""
+        return [self._write_one(write) for write in pending]
+
+    def _write_one(self, write: _PendingWrite) -> int:
+        mode: int = write.mode if write.mode is not None else self.__default_mode
+        if write.exclusive and write.path.exists():
+            return -1
+        fd, temp_fpath = tempfile.mkstemp(dir=write.path.parent, prefix=f".{write.path.name}.", suffix=".tmp")
+        try:
+            try:
+                if write.contents is not None:
+                    with open(fd, "wb", closefd=False) as temp_file:
+                        temp_file.write(write.contents)
+                else:
+                    copy_file_contents(write.source, fd)
+                if self.fsync:
+                    os.fsync(fd)
+                n_bytes: int = os.fstat(fd).st_size
+                os.fchmod(fd, mode)
+            finally:
+                os.close(fd)
+            if write.exclusive:
+                return n_bytes if _link_if_not_exists(temp_fpath, write.path) else -1
+            os.replace(temp_fpath, write.path)
+            return n_bytes
+        finally:
+            if os.path.lexists(temp_fpath):
+                os.unlink(temp_fpath)
+
+
+class ConcurrentFileWriter(FileWriter):
+    """
+    Write submitted files atomically, from a bounded pool of threads, when ``flush()`` is called.
+
+    :param max_workers: maximum number of files written at the same time
+    :param fsync: if ``True``, sync every file and directory to disk before ``flush()`` returns
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, fsync: bool = False) -> None:
+        super().__init__(fsync=fsync)
+        self.max_workers = max_workers
+
+    def _write_all(self, pending: List[_PendingWrite]) -> List[int]:
+        if len(pending) <= 1 or self.max_workers <= 1:
+            return super()._write_all(pending)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+            return list(executor.map(self._write_one, pending))
+
+
+def get_file_writer(project: object) -> Optional[FileWriter]:
+    """Return the ``FileWriter`` of ``project``, or ``None`` if files should be written directly."""
+    return getattr(project, "file_writer", None)
+
+
+def get_file_permissions(readonly: bool, executable: bool) -> int:
+    """Return the permissions ``projen`` gives a generated file; mirrors its ``getFilePermissions()``."""
+    if readonly and executable:
+        return 0o544
+    if readonly:
+        return 0o444
+    if executable:
+        return 0o755
+    return 0o644
+
+
+def copy_file_contents(source: Union[Path, Traversable], dest_fd: int) -> None:
+    """
+    Copy the contents of ``source`` into the file open at ``dest_fd``, without reading them into Python.
+
+    The cheapest available method is used:
+
+    1. a reflink (``FICLONE``), which copies no data at all on copy-on-write
+       filesystems such as btrfs or XFS
+    2. ``os.copy_file_range``, which copies within the kernel
+    3. ``shutil.copyfileobj``
+
+    A ``source`` that is not on the filesystem, e.g. inside a zip file, is read and written.
+    """
+    if not isinstance(source, Path):
+        with open(dest_fd, "wb", closefd=False) as dest_file:
+            dest_file.write(source.read_bytes())
+        return
+    with open(source, "rb") as source_file, open(dest_fd, "wb", closefd=False) as dest_file:
+        source_fd: int = source_file.fileno()
+        n_bytes: int = os.fstat(source_fd).st_size
+        if not _try_reflink(source_fd, dest_fd) and not _try_copy_file_range(source_fd, dest_fd, n_bytes):
+            shutil.copyfileobj(source_file, dest_file)
+
+
+def _try_reflink(source_fd: int, dest_fd: int) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        fcntl.ioctl(dest_fd, FICLONE, source_fd)
+    except OSError:
+        return False
+    return True
+
+
+def _try_copy_file_range(source_fd: int, dest_fd: int, n_bytes: int) -> bool:
+    if not hasattr(os, "copy_file_range"):
+        return False
+    n_copied = 0
+    try:
+        while n_copied < n_bytes:
+            n_copied_now: int = os.copy_file_range(source_fd, dest_fd, n_bytes - n_copied)
+            if n_copied_now == 0:
+                # the source shrank since it was stat-ed
+                break
+            n_copied += n_copied_now
+    except OSError as error:
+        # e.g. copying across filesystems on older kernels; nothing has been written yet
+        if n_copied == 0 and error.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+            return False
+        raise
+    return True
+
+
+def _link_if_not_exists(source: str, dest: Path) -> bool:
+    """Atomically create ``dest`` as a copy of ``source`` unless ``dest`` exists; return whether it was created."""
+    try:
+        os.link(source, dest)
+    except FileExistsError:
+        return False
+    except OSError:
+        # the filesystem does not support hard links; the temporary file is removed afterwards
+        if dest.exists():
+            return False
+        os.replace(source, dest)
+    return True
+
+
+def _make_directories(directories: List[Path]) -> int:
+    """Create the missing ``directories`` (sorted, so parents come first) and return how many were created."""
+    existing: Set[Path] = set()
+    n_created = 0
+    for directory in directories:
+        if directory in existing:
+            continue
+        if not directory.is_dir():
+            directory.mkdir(parents=True, exist_ok=True)
+            n_created += 1
+        existing.update((directory, *directory.parents))
+    return n_created
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist the renames in ``directory``; not supported (or needed) on Windows."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd: int = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _get_umask() -> int:
+    umask: int = os.umask(0)
+    os.umask(umask)
+    return umask
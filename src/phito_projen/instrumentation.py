@@ -0,0 +1,219 @@
+"""
+Opt-in timing and jsii-call instrumentation for synthesis.
+
+Components wrap their work in ``trace_span()``. Spans cost next to nothing unless
+tracing is enabled, either for a block of code:
+
+.. code-block:: python
+
+    from phito_projen.instrumentation import tracing
+
+    with tracing("synth-trace.json"):
+        project.synth()
+
+or for a whole ``.projenrc.py`` run by setting ``PHITO_PROJEN_TRACE=synth-trace.json``.
+
+The trace file uses the Chrome trace event format, which can be opened in
+``chrome://tracing``, Perfetto or speedscope (as a flamegraph). Each span records
+its duration, the number of calls made into the jsii runtime while it was open and
+the number of bytes written to disk. ``otherData.summary`` aggregates these per span name.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+TRACE_FPATH_ENV_VAR = "PHITO_PROJEN_TRACE"
+"""If set, every synth in the process is traced and the trace is written to this path at exit."""
+
+JSII_KERNEL_METHODS = ["create", "delete", "get", "set", "sget", "sset", "invoke", "sinvoke", "complete", "sync_complete"]
+"""Methods of ``jsii``'s kernel that each send one request to the node process."""
+
+TEvent = Dict[str, Any]
+
+
+class _Span:
+    def __init__(self, name: str, category: str, args: Dict[str, Any]) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+        self.jsii_calls = 0
+        self.bytes_written = 0
+        self.start = time.perf_counter()
+
+
+class SynthTracer:
+    """Collects spans and jsii call counts, and saves them as a Chrome trace event file."""
+
+    def __init__(self) -> None:
+        self.events: List[TEvent] = []
+        self.jsii_calls: Counter = Counter()
+        self.bytes_written = 0
+        self.__origin = time.perf_counter()
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+    @property
+    def __stack(self) -> List[_Span]:
+        if not hasattr(self.__local, "stack"):
+            self.__local.stack = []
+        return self.__local.stack
+
+    @contextmanager
+    def span(self, name: str, category: str = "synth", **args: Any) -> Iterator[None]:
+        span = _Span(name=name, category=category, args=args)
+        self.__stack.append(span)
+        try:
+            yield
+        finally:
+            self.__stack.pop()
+            end = time.perf_counter()
+            event: TEvent = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (span.start - self.__origin) * 1e6,
+                "dur": (end - span.start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {**args, "jsii_calls": span.jsii_calls, "bytes_written": span.bytes_written},
+            }
+            with self.__lock:
+                self.events.append(event)
+
+    def record_jsii_call(self, method: str) -> None:
+        self.jsii_calls[method] += 1
+        # counts are inclusive, like span durations
+        for span in self.__stack:
+            span.jsii_calls += 1
+
+    def record_bytes_written(self, n_bytes: int) -> None:
+        self.bytes_written += n_bytes
+        for span in self.__stack:
+            span.bytes_written += n_bytes
+
+    def summarize(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate the spans by name: call count, total milliseconds, jsii calls and bytes written."""
+        summary: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"count": 0, "total_ms": 0.0, "jsii_calls": 0, "bytes_written": 0}
+        )
+        for event in self.events:
+            totals = summary[event["name"]]
+            totals["count"] += 1
+            totals["total_ms"] += event["dur"] / 1000
+            totals["jsii_calls"] += event["args"]["jsii_calls"]
+            totals["bytes_written"] += event["args"]["bytes_written"]
+        return dict(sorted(summary.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def save(self, fpath: Union[str, Path]) -> None:
+        trace = {
+            "traceEvents": sorted(self.events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "jsii_calls": dict(self.jsii_calls),
+                "total_jsii_calls": sum(self.jsii_calls.values()),
+                "bytes_written": self.bytes_written,
+                "summary": self.summarize(),
+            },
+        }
+        Path(fpath).parent.mkdir(parents=True, exist_ok=True)
+        Path(fpath).write_text(json.dumps(trace, indent=1))
+
+
+_tracer: Optional[SynthTracer] = None
+
+
+def get_tracer() -> Optional[SynthTracer]:
+    """Return the active tracer, or ``None`` if tracing is disabled."""
+    return _tracer
+
+
+@contextmanager
+def trace_span(name: str, category: str = "synth", **args: Any) -> Iterator[None]:
+    """Record ``name`` as a span if tracing is enabled; do nothing otherwise."""
+    if _tracer is None:
+        yield
+        return
+    with _tracer.span(name, category, **args):
+        yield
+
+
+def record_bytes_written(n_bytes: int) -> None:
+    if _tracer is not None:
+        _tracer.record_bytes_written(n_bytes)
+
+
+def start_tracing() -> SynthTracer:
+    """Enable tracing for the rest of the process, or until ``stop_tracing()``."""
+    global _tracer
+    if _tracer is None:
+        _tracer = SynthTracer()
+        _patch_jsii_kernel()
+    return _tracer
+
+
+def stop_tracing() -> Optional[SynthTracer]:
+    """Disable tracing and return the tracer that was active."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+@contextmanager
+def tracing(fpath: Optional[Union[str, Path]] = None) -> Iterator[SynthTracer]:
+    """Trace the enclosed block; if ``fpath`` is given, save the trace there afterwards."""
+    tracer = start_tracing()
+    try:
+        yield tracer
+    finally:
+        stop_tracing()
+        if fpath:
+            tracer.save(fpath)
+
+
+def start_tracing_from_env() -> None:
+    """Start tracing, and save the trace at exit, if ``PHITO_PROJEN_TRACE`` is set."""
+    fpath: Optional[str] = os.environ.get(TRACE_FPATH_ENV_VAR)
+    if not fpath or _tracer is not None:
+        return
+    tracer = start_tracing()
+    atexit.register(tracer.save, fpath)
+
+
+_jsii_kernel_patched = False
+
+
+def _patch_jsii_kernel() -> None:
+    """Count every request sent to the jsii runtime while a tracer is active."""
+    global _jsii_kernel_patched
+    if _jsii_kernel_patched:
+        return
+    import jsii
+    from jsii._kernel import Kernel
+    from jsii._runtime import kernel
+
+    for method_name in JSII_KERNEL_METHODS:
+        method: Optional[Callable] = getattr(Kernel, method_name, None)
+        if method is not None:
+            setattr(Kernel, method_name, _count_jsii_calls(method_name, method))
+        # generated bindings call e.g. ``jsii.invoke``, an alias bound to the kernel at import time
+        if hasattr(jsii, method_name):
+            setattr(jsii, method_name, getattr(kernel, method_name))
+    _jsii_kernel_patched = True
+
+
+def _count_jsii_calls(method_name: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _tracer is not None:
+            _tracer.record_jsii_call(method_name)
+        return method(*args, **kwargs)
+
+    return wrapper
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from functools import cached_property
 from pathlib import Path
 from textwrap import dedent
@@ -7,19 +6,38 @@ from projen import DependencyType, Project
 from phito_projen.components.manifest_in import ManifestIn
 from phito_projen.components.pyproject_toml import PyprojectToml
 from phito_projen.components.lazy_sample_file import LazySampleFile
+from phito_projen.components.file_writer_flush import FileWriterFlush
 from phito_projen.components.setup_py import SetupPy
+from phito_projen.components.version_py import VersionPy
 from projen import TextFile
-import re
+from phito_projen.components.setup_cfg.pytest_config import PytestConfig, add_test_tasks, with_coverage_source
 from phito_projen.components.setup_cfg.setup_cfg import SetupCfg
-
-TStrDict = Dict[str, Any]
-TPythonExtras = Dict[str, List[str]]
-
-PYTHON_PROJECT_NAME_REGEX = re.compile(r"^[A-Za-z0-9-_\.]+$")
-
-DEFAULT_EXTRAS_REQUIRE = {
-    "test": ["pytest", "pytest-cov", "pytest-xdist"],
-}
+from phito_projen.synth import register_subproject
+from phito_projen.check import exit_with_check_report, is_check_requested
+from phito_projen.dependencies import register_dependencies
+from phito_projen.file_hash_manifest import FILE_HASH_MANIFEST_FPATH, FileHashManifest, SynthReport
+from phito_projen.file_writer import ConcurrentFileWriter, FileWriter, WriteReport
+from phito_projen.components.templatized_file import TemplatizedFile
+from phito_projen.synth_cache import SynthCache, get_default_synth_cache, make_cache_key
+from phito_projen.instrumentation import start_tracing_from_env, trace_span
+from phito_projen.wheel_build import BUILD_WHEELS_COMMAND, BUILD_WHEELS_TASK_NAME
+
+# some of these are re-exported for backwards compatibility; they live in modules that do not import projen
+from phito_projen.extras import (
+    DEFAULT_EXTRAS_REQUIRE,
+    TExtrasRequirementSets,
+    TPythonExtras,
+    TStrDict,
+    flatten_extras,
+    merge_extras,
+    union_extras_dicts,
+)
+from phito_projen.requirement_set import RequirementSet
+from phito_projen.validators import (
+    PYTHON_PROJECT_NAME_REGEX,
+    InvalidPythonModuleNameError,
+    validate_python_module_name,
+)
 
 
 class PythonPackage(Project):
@@ -34,6 +52,9 @@ class PythonPackage(Project):
         entrypoints: Optional[Dict[str, str]] = None,
         outdir: Optional[str] = None,
         parent: Optional["Project"] = None,
+        file_writer: Optional[FileWriter] = None,
+        synth_cache: Optional[SynthCache] = None,
+        pytest_config: Optional[PytestConfig] = None,
     ) -> None:
         """
         :param module_name: Name of the python package as used in imports and filenames. \
@@ -45,7 +66,15 @@ class PythonPackage(Project):
         :param name: This is the name of your project. Default: $BASEDIR
         :param outdir: The root directory of the project. Relative to this directory, all files are synthesized. If this project has a parent, this directory is relative to the parent directory and it cannot be the same as the parent or any of it's other sub-projects. Default: "."
         :param parent: The parent project, if this project is part of a bigger project.
+        :param file_writer: Writes the generated files to disk at the end of the synthesize phase. \
+            Defaults to a ``ConcurrentFileWriter``.
+        :param synth_cache: Caches the rendered templates of this package between synths. \
+            Defaults to a ``SynthCache`` in ``$PHITO_PROJEN_SYNTH_CACHE_DIR``, if it is set.
+        :param pytest_config: How tests run, e.g. the number of ``pytest-xdist`` workers. \
+            Defaults to one worker per core. Coverage is measured for ``module_name``, unless \
+            the config sets another ``coverage_source``.
         """
+        start_tracing_from_env()
         super().__init__(
             name=name,
             commit_generated=True,
@@ -58,13 +87,15 @@ class PythonPackage(Project):
             renovatebot=None,
             renovatebot_options=None,
         )
+        if parent:
+            register_subproject(parent=parent, subproject=self)
 
         validate_python_module_name(module_name)
         self.module_name = module_name
         self.pkg_dir = Path(f"src/{module_name}")
 
-        self.install_requires = install_requires or []
-        self.extras_require = union_extras_dicts(
+        self.install_requires = RequirementSet(install_requires or [])
+        self.extras_require: TExtrasRequirementSets = merge_extras(
             DEFAULT_EXTRAS_REQUIRE, additional_extras_require or {}
         )
 
@@ -81,11 +112,41 @@ class PythonPackage(Project):
             package_version=version,
             extras_require=self.extras_require,
             entrypoints=entrypoints,
-            # TODO: have a more elegant way to keep setup_cfg.install_requires up to date with the package install requires
+            # shared, so requirements added to the package later also end up in setup.cfg
             install_requires=self.install_requires,
+            pytest_config=with_coverage_source(pytest_config or PytestConfig(), module_name=module_name),
         )
+        add_test_tasks(self, self.setup_cfg.pytest_config)
+        self.add_task(
+            BUILD_WHEELS_TASK_NAME,
+            description="Build the wheel of this package, unless its sources are unchanged",
+            exec=f"{BUILD_WHEELS_COMMAND} .",
+        )
+        if parent and parent.tasks.try_find(BUILD_WHEELS_TASK_NAME) is None:
+            parent.add_task(
+                BUILD_WHEELS_TASK_NAME,
+                description="Build the wheels of all packages in parallel, skipping those whose sources are unchanged",
+                exec=BUILD_WHEELS_COMMAND,
+            )
         self.setup_py = SetupPy(self)
+        self.version_py = VersionPy(
+            self, file_path=self.pkg_dir / "_version.py", get_version_fn=lambda: self.setup_cfg.package_version
+        )
+        """``src/<module_name>/_version.py``, from which the package can import its ``__version__`` cheaply."""
         self.gitignore.add_patterns("*.env", "*venv", "*.venv", "*pyc*", "dist", "build", "*.whl", "*egg-info")
+        # written by the coverage configuration in setup.cfg, one data file per test worker
+        self.gitignore.add_patterns(".coverage", ".coverage.*")
+        # the manifest records local mtimes, so it is specific to each checkout
+        self.gitignore.add_patterns(FILE_HASH_MANIFEST_FPATH)
+
+        self.file_hash_manifest = FileHashManifest(outdir=self.outdir)
+        """Content hashes of the generated files; unchanged files are not rewritten during synthesis."""
+        self.file_writer: FileWriter = file_writer or ConcurrentFileWriter()
+        """Writes the files generated by this package's components, all at once, after the last component is synthesized."""
+        self.__file_writer_flush: Optional[FileWriterFlush] = None
+        self.synth_cache: Optional[SynthCache] = synth_cache or get_default_synth_cache()
+        """Caches the rendered templates of this package, keyed by its inputs; ``None`` if disabled."""
+        self.__n_restored_from_cache = 0
 
     @cached_property
     def manifest_in(self) -> ManifestIn:
@@ -99,61 +160,75 @@ class PythonPackage(Project):
 
     # NOTE: pre_synthesize can change state of components, but it should not add or remove components
     # I'm not sure what the behavior would be if you did that
+    def synth(self) -> None:
+        # ``python .projenrc.py --check`` verifies the generated files instead of writing them
+        if self.parent is None and is_check_requested():
+            exit_with_check_report(self)
+        with trace_span("PythonPackage.synth", module_name=self.module_name):
+            super().synth()
+
     def pre_synthesize(self) -> None:
-        # ultimately, all dependencies go in the shared Dependencies instance
-        [
-            self.deps.add_dependency(spec=dep, type=DependencyType.RUNTIME)
-            for dep in self.install_requires
-        ]
-        [
-            self.deps.add_dependency(spec=dep, type=DependencyType.DEVENV)
-            for dep in flatten_extras(self.extras_require)
-        ]
-        return super().pre_synthesize()
-
-
-class InvalidPythonModuleNameError(Exception):
-    """Raise when an invalid module name is thrown."""
-
-    @staticmethod
-    def make_err_msg(invalid_module_name: str) -> str:
-        return f"'{invalid_module_name}' is not a valid Python module_name. Must satisfy regex: '{PYTHON_PROJECT_NAME_REGEX}'"
-
-    @classmethod
-    def from_invalid_module_name(
-        cls: Type["InvalidPythonModuleNameError"], invalid_module_name: str
-    ) -> Type["InvalidPythonModuleNameError"]:
-        return cls(
-            InvalidPythonModuleNameError.make_err_msg(
-                invalid_module_name=invalid_module_name
+        with trace_span("PythonPackage.pre_synthesize", module_name=self.module_name):
+            # ultimately, all dependencies go in the shared Dependencies instance
+            register_dependencies(
+                self,
+                specs_by_type={
+                    DependencyType.RUNTIME: self.install_requires,
+                    DependencyType.DEVENV: flatten_extras(self.extras_require),
+                },
             )
+            self.file_hash_manifest.load()
+            self.restore_from_synth_cache()
+            if self.__file_writer_flush is None:
+                # the project's pre_synthesize() runs before any component is synthesized, so
+                # a component added now is synthesized after all of the others
+                self.__file_writer_flush = FileWriterFlush(self)
+            return super().pre_synthesize()
+
+    def post_synthesize(self) -> None:
+        with trace_span("PythonPackage.post_synthesize", module_name=self.module_name):
+            self.__store_in_synth_cache()
+            write_report: WriteReport = self.__file_writer_flush.last_report
+            report: SynthReport = self.file_hash_manifest.save()
+            self.logger.info(f"{self.name}: {report}" + (f" ({write_report})" if write_report.files else ""))
+            return super().post_synthesize()
+
+    def restore_from_synth_cache(self) -> int:
+        """Prerender the templatized files of this package from the synth cache; return how many were restored."""
+        if self.synth_cache is None:
+            return 0
+        n_restored: int = self.synth_cache.restore(self.synth_cache_key, files=self.__get_templatized_files())
+        self.__n_restored_from_cache += n_restored
+        return n_restored
+
+    @property
+    def synth_cache_key(self) -> str:
+        """Hash of the inputs that determine the rendered templates of this package."""
+        return make_cache_key(
+            {
+                "name": self.name,
+                "module_name": self.module_name,
+                "version": self.setup_cfg.package_version,
+                "install_requires": self.install_requires,
+                "extras_require": self.extras_require,
+                "entrypoints": self.setup_cfg.entrypoints,
+            }
         )
 
+    def __store_in_synth_cache(self) -> None:
+        files: List[TemplatizedFile] = self.__get_templatized_files()
+        n_restored, self.__n_restored_from_cache = self.__n_restored_from_cache, 0
+        if self.synth_cache is None or n_restored == sum(1 for file in files if file.last_rendered):
+            return
+        self.synth_cache.store(self.synth_cache_key, files=files)
 
-def validate_python_module_name(module_name: str):
-    is_exact_match = bool(
-        re.fullmatch(pattern=PYTHON_PROJECT_NAME_REGEX, string=module_name)
-    )
-    if not is_exact_match:
-        raise InvalidPythonModuleNameError.from_invalid_module_name(module_name)
-
-
-def union_extras_dicts(
-    extras_a: TPythonExtras, extras_b: TPythonExtras
-) -> TPythonExtras:
-    result = deepcopy(extras_a)
-    for extra_name, reqs in extras_b.items():
-        if extra_name in extras_a.keys():
-            reqs_a = set(extras_a[extra_name])
-            reqs_b = set(reqs)
-            result[extra_name] = list(reqs_a | reqs_b)
-            continue
-        result[extra_name] = reqs
-    return result
-
+    def __get_templatized_files(self) -> List[TemplatizedFile]:
+        return [component for component in self.components if isinstance(component, TemplatizedFile)]
 
-def flatten_extras(extras: TPythonExtras) -> List[str]:
-    return [item for sublist in list(extras.values()) for item in sublist]
+    @property
+    def synth_report(self) -> SynthReport:
+        """How many generated files the last synth wrote, skipped because they were unchanged, or deleted."""
+        return self.file_hash_manifest.report
 
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+"""
+An ordered set of requirement specifiers, such as a package's ``install_requires``.
+
+Like ``phito_projen.extras``, this module only depends on the standard library.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+REQUIREMENT_NAME_REGEX = re.compile(r"^\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)")
+"""The distribution name at the start of a PEP 508 requirement (or of a ``projen``-style ``<module>@<semver>``)."""
+
+NAMED_REQUIREMENT_REGEX = re.compile(
+    r"^(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*"
+    r"(?:\[(?P<extras>[^\]]*)\])?\s*"
+    r"(?P<specifiers>\(?\s*(?:(?:~=|==|!=|<=|>=|<|>|===)\s*[^,;()\s]+\s*,?\s*)*\)?)$"
+)
+"""A name with optional extras and version specifiers, e.g. ``pandas[sql]>=1,<2``; no URL or ``projen``-style version."""
+
+DIRECT_REFERENCE_REGEX = re.compile(r"^[A-Za-z0-9._\[\],\s-]*@\s*(?P<url>\S+://\S+|file:\S+)$")
+"""A PEP 508 direct reference, e.g. ``pkg @ git+https://...``."""
+
+TRequirementKey = Tuple[str, str]
+
+
+class ParsedRequirement(NamedTuple):
+    """A requirement whose extras and version specifiers can be merged with those of another."""
+
+    name: str
+    extras: List[str]
+    specifiers: List[str]
+    marker: str
+
+    def merge(self, other: "ParsedRequirement") -> "ParsedRequirement":
+        """Combine the extras and specifiers of both requirements, e.g. ``pandas>=1`` and ``pandas[sql]<2``."""
+        return self._replace(
+            extras=_merge_unique(self.extras, other.extras),
+            specifiers=_merge_unique(self.specifiers, other.specifiers),
+        )
+
+    def __str__(self) -> str:
+        extras: str = f"[{','.join(self.extras)}]" if self.extras else ""
+        marker: str = f"; {self.marker}" if self.marker else ""
+        return f"{self.name}{extras}{','.join(self.specifiers)}{marker}"
+
+
+def normalize_requirement_name(name: str) -> str:
+    """Normalize a distribution name as in PEP 503, e.g. ``Foo.Bar_baz`` -> ``foo-bar-baz``."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_requirement_key(requirement: str) -> Tuple[TRequirementKey, bool]:
+    """
+    Return the key identifying ``requirement`` in a ``RequirementSet``, and whether it is a bare name.
+
+    The key of a named requirement is its normalized name plus the environment marker, if any,
+    so that ``pywin32; sys_platform == "win32"`` and an unconditional ``pywin32`` are kept apart.
+    Direct references (``pkg @ git+https://...``) are keyed by their URL, and anything else that is
+    not a named requirement (e.g. ``-e .`` or a bare URL) by the whole line; their names are empty.
+    A bare name (e.g. ``pandas``) carries no version, extras or URL.
+    """
+    specifier, _, marker = requirement.partition(";")
+    direct_reference = DIRECT_REFERENCE_REGEX.match(specifier.strip())
+    if direct_reference:
+        return ("", direct_reference.group("url")), False
+    match = REQUIREMENT_NAME_REGEX.match(specifier)
+    if not match or "://" in specifier or specifier.lstrip().startswith("-"):
+        return ("", " ".join(requirement.split())), False
+    name: str = normalize_requirement_name(match.group(1))
+    normalized_marker: str = re.sub(r"\s+", "", marker).replace("'", '"')
+    is_bare: bool = not specifier[match.end():].strip()
+    return (name, normalized_marker), is_bare
+
+
+def parse_requirement(requirement: str) -> Optional[ParsedRequirement]:
+    """Parse a named requirement with optional extras and specifiers; ``None`` for anything else."""
+    specifier, _, marker = requirement.partition(";")
+    match = NAMED_REQUIREMENT_REGEX.match(specifier.strip())
+    if not match:
+        return None
+    extras: List[str] = [extra.strip() for extra in (match.group("extras") or "").split(",") if extra.strip()]
+    specifiers: List[str] = [
+        re.sub(r"\s+", "", item) for item in match.group("specifiers").strip("() \t").split(",") if item.strip()
+    ]
+    return ParsedRequirement(name=match.group("name"), extras=extras, specifiers=specifiers, marker=marker.strip())
+
+
+def _merge_unique(items: List[str], other_items: List[str]) -> List[str]:
+    return list(dict.fromkeys([*items, *other_items]))
+
+
+class RequirementSet:
+    """
+    Requirement specifiers, deduplicated by normalized name and kept in insertion order.
+
+    Adding a requirement whose name (and marker) is already in the set merges the two in place:
+    their extras and version specifiers are combined, e.g. ``pandas[sql]`` and ``pandas>=1,<2``
+    become ``pandas[sql]>=1,<2``. Requirements that cannot be merged, e.g. a ``projen``-style
+    ``pandas@^1`` and ``pandas>=1``, are both kept. Direct references are deduplicated by URL,
+    and lines that are not PEP 508 requirements (e.g. ``-e .``) are kept as they are.
+
+    .. code-block:: python
+
+        requirements = RequirementSet(["pandas", "Pytest", "pytest>=7", "pandas<2"])
+        list(requirements)  # ["pandas<2", "pytest>=7"]
+
+    ``append()`` and ``extend()`` are aliases of ``add()`` and ``update()``, so that
+    code written against plain lists of requirements keeps working.
+    """
+
+    def __init__(self, requirements: Iterable[str] = ()) -> None:
+        self.__requirements: Dict[TRequirementKey, str] = {}
+        self.update(requirements)
+
+    def add(self, requirement: str) -> None:
+        requirement = requirement.strip()
+        key, is_bare = parse_requirement_key(requirement)
+        existing: Optional[str] = self.__requirements.get(key)
+        if existing is None or not key[0]:
+            self.__requirements.setdefault(key, requirement)
+            return
+        if is_bare or existing == requirement:
+            return
+        if parse_requirement_key(existing)[1]:
+            # the existing requirement is a bare name, which anything more specific replaces
+            self.__requirements[key] = requirement
+            return
+        parsed_existing, parsed = parse_requirement(existing), parse_requirement(requirement)
+        if parsed_existing is not None and parsed is not None:
+            self.__requirements[key] = str(parsed_existing.merge(parsed))
+        else:
+            self.__requirements.setdefault(("", requirement), requirement)
+
+    def update(self, requirements: Iterable[str]) -> None:
+        for requirement in requirements:
+            self.add(requirement)
+
+    append = add
+    extend = update
+
+    def discard(self, requirement: str) -> None:
+        """Remove the requirement with the same name (and marker) as ``requirement``, if present."""
+        key, _ = parse_requirement_key(requirement)
+        self.__requirements.pop(key, None)
+
+    def copy(self) -> "RequirementSet":
+        return RequirementSet(self)
+
+    def to_list(self) -> List[str]:
+        return list(self.__requirements.values())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__requirements.values())
+
+    def __len__(self) -> int:
+        return len(self.__requirements)
+
+    def __contains__(self, requirement: object) -> bool:
+        if not isinstance(requirement, str):
+            return False
+        key, _ = parse_requirement_key(requirement)
+        return key in self.__requirements
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RequirementSet):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __or__(self, other: Union["RequirementSet", Iterable[str]]) -> "RequirementSet":
+        result: RequirementSet = self.copy()
+        result.update(other)
+        return result
+
+    def __repr__(self) -> str:
+        return f"RequirementSet({self.to_list()!r})"
@@ -1,36 +1,84 @@
-from pathlib import Path
-from typing import List
-from projen import Component, SampleFile
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List
+from phito_projen.components.lazy_sample_file import LazySampleDir, LazySampleFile
+from phito_projen.requirement_set import RequirementSet
+from phito_projen.template_manifest import get_package_resource, list_template_resources, read_template_resource
+from phito_projen.template_registry import get_template_registry
 from phito_projen import PythonPackage
 
-THIS_DIR = Path(__file__).parent
-FAST_API_SAMPLE_FILE_TEMPLATES_DIR = (THIS_DIR / "./templates/src").resolve().absolute()
+FAST_API_SAMPLE_FILE_TEMPLATES_RESOURCE = "samples/fastapi_app/templates/src"
+FAST_API_SAMPLE_SCRIPT_TEMPLATES_RESOURCE = "samples/fastapi_app/templates/scripts"
+FAST_API_SAMPLE_SCRIPTS_DIR = Path("scripts")
 
+JINJA_SUFFIX = ".jinja"
 
-class SampleFastAPIApp(Component):
+FAST_API_APP_REQUIREMENTS = ["fastapi", "uvicorn", "httpx"]
+FAST_API_APP_SPEEDUPS_EXTRA = "speedups"
+FAST_API_APP_SPEEDUPS_REQUIREMENTS = ['uvloop; sys_platform != "win32"', "httptools"]
+"""Picked up by ``uvicorn`` when installed: a faster event loop and HTTP parser."""
+
+
+class SampleFastAPIApp(LazySampleDir):
+    """
+    Sample files for a FastAPI app in the package's module directory, plus ``scripts/load_test.py``.
+
+    The sample files are listed in ``phito_projen``'s template manifest, and are
+    only copied when the project is synthesized, and only if they do not exist yet.
+    Files ending in ``.jinja`` are rendered with the package's ``name`` and ``module_name``,
+    and written without the suffix.
+
+    The requirements of the app are added to the package, and so are two tasks:
+    ``serve`` (``python -m <module_name>``) and ``load-test``, which measures the
+    requests per second and latency percentiles of a local instance.
+    """
 
     project: PythonPackage
 
     def __init__(self, project: PythonPackage) -> None:
-        super().__init__(project)
-        print(self.project.outdir)
-
-        self.fastapi_sample_files = self.__make_sample_dir()
-
-    def __make_sample_dir(self):
-        template_fpaths = self.__get_sample_file_template_fpaths()
-        return [
-            SampleFile(
-                project=self.project,
-                file_path=str(
-                    self.project.pkg_dir
-                    / path.relative_to(FAST_API_SAMPLE_FILE_TEMPLATES_DIR)
-                ),
-                contents=path.read_text(),
-            )
-            for path in template_fpaths
-        ]
-
-    def __get_sample_file_template_fpaths(self) -> List[Path]:
-        template_fpaths = list(FAST_API_SAMPLE_FILE_TEMPLATES_DIR.rglob("*.py"))
-        return template_fpaths
+        source_files: List[str] = list_template_resources(FAST_API_SAMPLE_FILE_TEMPLATES_RESOURCE)
+        super().__init__(
+            project,
+            source_dir=get_package_resource(FAST_API_SAMPLE_FILE_TEMPLATES_RESOURCE),
+            dest_dir=project.pkg_dir,
+            source_files=[fpath for fpath in source_files if not fpath.endswith(JINJA_SUFFIX)],
+        )
+        self.template_values: Dict[str, Any] = {"name": project.name, "module_name": project.module_name}
+        """Values the ``.jinja`` sample files are rendered with."""
+        for fpath in source_files:
+            if fpath.endswith(JINJA_SUFFIX):
+                self.__add_rendered_file(FAST_API_SAMPLE_FILE_TEMPLATES_RESOURCE, fpath, dest_dir=project.pkg_dir)
+        for fpath in list_template_resources(FAST_API_SAMPLE_SCRIPT_TEMPLATES_RESOURCE):
+            self.__add_rendered_file(FAST_API_SAMPLE_SCRIPT_TEMPLATES_RESOURCE, fpath, FAST_API_SAMPLE_SCRIPTS_DIR)
+
+        project.install_requires.extend(FAST_API_APP_REQUIREMENTS)
+        project.extras_require.setdefault(FAST_API_APP_SPEEDUPS_EXTRA, RequirementSet()).extend(
+            FAST_API_APP_SPEEDUPS_REQUIREMENTS
+        )
+        project.add_task("serve", description="Serve the app", exec=f"python -m {project.module_name}")
+        project.add_task(
+            "load-test",
+            description="Measure the requests per second and latency percentiles of a local instance",
+            exec=f"python {FAST_API_SAMPLE_SCRIPTS_DIR.as_posix()}/load_test.py",
+        )
+
+    def __add_rendered_file(self, resource_dir: str, fpath: str, dest_dir: Path) -> None:
+        resource = str(PurePosixPath(resource_dir) / fpath)
+        dest_fpath: str = fpath[: -len(JINJA_SUFFIX)] if fpath.endswith(JINJA_SUFFIX) else fpath
+        file_path = str(dest_dir / dest_fpath)
+        get_contents_fn = partial(render_sample_template, resource, values=self.template_values)
+        if file_path == str(self.project.init_py.file_path):
+            # the package already creates its __init__.py; the sample only decides what goes in it
+            self.project.init_py.get_contents_fn = get_contents_fn
+            return
+        LazySampleFile(self.project, file_path=file_path, get_contents_fn=get_contents_fn)
+
+
+def render_sample_template(resource: str, values: Dict[str, Any]) -> str:
+    """Render the sample file at ``resource``; files without the ``.jinja`` suffix are returned as they are."""
+    source: str = read_template_resource(resource)
+    if not resource.endswith(JINJA_SUFFIX):
+        return source
+    contents: str = get_template_registry().get_template(source).render(values)
+    # jinja drops the final newline of the template
+    return contents + "\n" if source.endswith("\n") else contents
@@ -0,0 +1,32 @@
+"""
+Serve the app with ``uvicorn``: ``python -m <package>``.
+
+The server is configured with environment variables; see ``ServerSettings``.
+"""
+
+from .settings import ServerSettings
+
+
+def main() -> None:
+    import uvicorn
+
+    settings = ServerSettings.from_env()
+    uvicorn.run(
+        # an import string, so that each worker process creates its own app
+        f"{__package__}.app:create_app",
+        factory=True,
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        loop=settings.loop,
+        http=settings.http,
+        backlog=settings.backlog,
+        timeout_keep_alive=settings.timeout_keep_alive,
+        limit_concurrency=settings.limit_concurrency,
+        log_level=settings.log_level,
+        access_log=settings.access_log,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Settings of the web server and of the app, read from environment variables."""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def count_usable_cpus() -> int:
+    """Return the number of CPUs this process may run on, which can be fewer than the machine has."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover; not available on macOS and Windows
+        return os.cpu_count() or 1
+
+
+def _get_optional_int(name: str) -> Optional[int]:
+    value: Optional[str] = os.environ.get(name)
+    return int(value) if value else None
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    """
+    How ``uvicorn`` serves the app.
+
+    :param workers: worker processes; each runs its own event loop, so one per CPU keeps every core busy
+    :param loop: ``auto`` uses ``uvloop`` if it is installed (see the ``speedups`` extra), else ``asyncio``
+    :param http: ``auto`` uses the ``httptools`` parser if it is installed, else ``h11``
+    :param backlog: connections the OS queues while all workers are busy, before refusing new ones
+    :param limit_concurrency: requests in flight per worker before answering ``503``; protects the
+        p99 latency of accepted requests under overload. ``None`` for no limit
+    :param access_log: logging every request costs a noticeable share of throughput
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: int = 1
+    loop: str = "auto"
+    http: str = "auto"
+    backlog: int = 2048
+    timeout_keep_alive: int = 5
+    limit_concurrency: Optional[int] = None
+    log_level: str = "info"
+    access_log: bool = False
+
+    @classmethod
+    def from_env(cls) -> "ServerSettings":
+        return cls(
+            host=os.environ.get("HOST", cls.host),
+            port=int(os.environ.get("PORT", cls.port)),
+            # the variable that gunicorn and the uvicorn CLI read, too
+            workers=int(os.environ.get("WEB_CONCURRENCY", count_usable_cpus())),
+            loop=os.environ.get("UVICORN_LOOP", cls.loop),
+            http=os.environ.get("UVICORN_HTTP", cls.http),
+            backlog=int(os.environ.get("BACKLOG", cls.backlog)),
+            timeout_keep_alive=int(os.environ.get("TIMEOUT_KEEP_ALIVE", cls.timeout_keep_alive)),
+            limit_concurrency=_get_optional_int("LIMIT_CONCURRENCY"),
+            log_level=os.environ.get("LOG_LEVEL", cls.log_level),
+            access_log=os.environ.get("ACCESS_LOG", "false").lower() == "true",
+        )
+
+
+@dataclass(frozen=True)
+class AppSettings:
+    """
+    Settings of the app itself, e.g. of the connection pools it shares between requests.
+
+    :param http_max_connections: connections the shared HTTP client keeps open at most, per worker
+    :param http_max_keepalive_connections: idle connections kept for reuse, so that most
+        requests to other services skip the TCP and TLS handshakes
+    :param http_timeout_seconds: timeout of requests to other services; a slow dependency
+        should fail fast instead of holding a connection from the pool
+    """
+
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_timeout_seconds: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "AppSettings":
+        return cls(
+            http_max_connections=int(os.environ.get("HTTP_MAX_CONNECTIONS", cls.http_max_connections)),
+            http_max_keepalive_connections=int(
+                os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", cls.http_max_keepalive_connections)
+            ),
+            http_timeout_seconds=float(os.environ.get("HTTP_TIMEOUT_SECONDS", cls.http_timeout_seconds)),
+        )
@@ -0,0 +1,125 @@
+"""
+Helpers for synthesizing trees of projects.
+
+``projen`` does not expose a project's subprojects to Python, so ``PythonPackage``
+registers itself with its parent via ``register_subproject()``; ``iter_projects()``
+walks the resulting tree.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from projen import Project
+
+from phito_projen.components.lazy_sample_file import get_directory_index
+from phito_projen.components.templatized_file import TemplatizedFile
+from phito_projen.instrumentation import trace_span
+from phito_projen.template_registry import get_template_registry
+
+TRenderJob = Tuple[str, Dict[str, Any]]
+
+_SUBPROJECTS: "WeakKeyDictionary[Project, List[Project]]" = WeakKeyDictionary()
+
+
+def register_subproject(parent: Project, subproject: Project) -> None:
+    """Record ``subproject`` as a child of ``parent`` so that ``iter_projects()`` can find it."""
+    _SUBPROJECTS.setdefault(parent, []).append(subproject)
+
+
+def iter_projects(project: Project) -> Iterator[Project]:
+    """Yield ``project`` and all of its registered subprojects, depth-first, in the order they were created."""
+    yield project
+    for subproject in _SUBPROJECTS.get(project, []):
+        yield from iter_projects(subproject)
+
+
+def synth_in_parallel(
+    project: Project,
+    max_workers: Optional[int] = None,
+    use_processes: bool = False,
+) -> None:
+    """
+    Synthesize ``project`` after rendering the templates of it and all of its subprojects in a worker pool.
+
+    Rendering is the only part of synthesis that is done in parallel. The rendered contents are then
+    handed to ``project.synth()``, which writes every file in the same order as a serial synth,
+    so the output is byte-identical, as long as the project is fully configured when this is called:
+    template values are evaluated once, for the parallel render, so changes made to them later
+    (e.g. in a component's ``pre_synthesize()``) are not picked up.
+
+    :param project: the root project, e.g. the ``Project`` that ``PythonPackage`` subprojects use as ``parent``
+    :param max_workers: size of the worker pool; defaults to the number of CPUs
+    :param use_processes: render in a process pool rather than a thread pool; opt-in. Forking the
+        interpreter that hosts the ``projen`` (jsii) runtime, a Node subprocess talking over pipes, can
+        deadlock, and each job renders a small template, so sending it to another process costs about
+        as much as rendering it. Process pools are only used where ``fork`` is available, since
+        other start methods would re-execute ``.projenrc.py``.
+    """
+    prerender_templatized_files(project, max_workers=max_workers, use_processes=use_processes)
+    project.synth()
+
+
+def prerender_templatized_files(
+    project: Project,
+    max_workers: Optional[int] = None,
+    use_processes: bool = False,
+) -> int:
+    """Render every ``TemplatizedFile`` in the project tree in a worker pool; return the number rendered."""
+    # files restored from a synth cache need no rendering at all
+    for subproject in iter_projects(project):
+        restore_from_synth_cache = getattr(subproject, "restore_from_synth_cache", None)
+        if restore_from_synth_cache is not None:
+            restore_from_synth_cache()
+    files: List[TemplatizedFile] = [
+        file for file in _iter_templatized_files(project) if _needs_render(file)
+    ]
+    if not files:
+        return 0
+
+    # values are snapshotted, so that the files keep the values they were rendered from
+    jobs: List[TRenderJob] = [
+        (file.get_template_source(), deepcopy(file.get_values())) for file in files
+    ]
+    max_workers = max_workers or os.cpu_count() or 1
+    with trace_span("prerender_templatized_files", n_files=len(jobs), max_workers=max_workers):
+        with _make_executor(max_workers=max_workers, use_processes=use_processes) as executor:
+            chunksize = max(1, len(jobs) // (max_workers * 4))
+            rendered: List[str] = list(executor.map(_render, jobs, chunksize=chunksize))
+
+    for file, (_, values), contents in zip(files, jobs, rendered):
+        file.set_prerendered_contents(values=values, contents=contents)
+    return len(files)
+
+
+def _iter_templatized_files(project: Project) -> Iterator[TemplatizedFile]:
+    for subproject in iter_projects(project):
+        for component in subproject.components:
+            if isinstance(component, TemplatizedFile):
+                yield component
+
+
+def _needs_render(file: TemplatizedFile) -> bool:
+    """Sample files are only rendered if they do not exist yet."""
+    if file.has_prerendered_contents:
+        return False
+    if not file.is_sample:
+        return True
+    return not get_directory_index(file.project).exists(Path(file.project.outdir) / file.file_path)
+
+
+def _make_executor(max_workers: int, use_processes: bool) -> Executor:
+    if use_processes and "fork" in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("fork")
+        )
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def _render(job: TRenderJob) -> str:
+    template_source, values = job
+    return get_template_registry().get_template(template_source).render(values)
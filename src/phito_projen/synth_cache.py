@@ -0,0 +1,225 @@
+"""
+A content-addressed cache of the files rendered for each ``PythonPackage``.
+
+Most packages in a mono-repo are constructed with the same arguments from one synth to
+the next, yet their templates are compiled and rendered again every time. With the cache
+enabled, the rendered contents of a package's templatized files (e.g. ``setup.cfg``) are
+stored under a key derived from
+
+- the package's name, module name, version, requirements, extras and entrypoints,
+- the version of ``phito_projen``, and
+- the hash of ``template-manifest.json``, i.e. of every template shipped with ``phito_projen``.
+
+On a hit, the stored contents are handed to the files as if they had been prerendered
+(see ``TemplatizedFile.set_prerendered_contents()``), so no template is compiled or rendered.
+Each stored file also records the hash of its template and of the values it was rendered
+from; a file whose template or values differ from those is rendered as usual, so a hit
+never produces different output than a render would.
+
+The cache is enabled by setting ``PHITO_PROJEN_SYNTH_CACHE_DIR``, or by passing a
+``SynthCache`` to ``PythonPackage``. Entries are evicted, least recently used first, once
+the cache grows beyond ``max_bytes``.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from copy import deepcopy
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from phito_projen.instrumentation import trace_span
+from phito_projen.template_manifest import dump_template_manifest, load_template_manifest
+from phito_projen.template_registry import hash_template_source
+
+if TYPE_CHECKING:
+    from phito_projen.components.templatized_file import TemplatizedFile
+
+SYNTH_CACHE_DIR_ENV_VAR = "PHITO_PROJEN_SYNTH_CACHE_DIR"
+"""Directory in which to cache rendered files between runs."""
+
+DEFAULT_MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+DISTRIBUTION_NAME = "phitoduck-projen"
+ENTRY_SUFFIX = ".json"
+
+TCacheEntry = Dict[str, Dict[str, str]]
+"""Maps the path of each rendered file to its contents and the hashes of its template and values."""
+
+
+@dataclass
+class SynthCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evicted: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {self.evicted} evicted"
+
+
+class SynthCache:
+    """
+    Rendered files of whole projects, stored on disk under a hash of each project's inputs.
+
+    :param cache_dir: directory holding the entries; created on first use
+    :param max_bytes: total size of the entries above which the least recently used are evicted
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = DEFAULT_MAX_CACHE_BYTES) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.stats = SynthCacheStats()
+
+    def restore(self, key: str, files: Sequence["TemplatizedFile"]) -> int:
+        """
+        Hand the cached contents of ``files`` to them, if the entry for ``key`` has them.
+
+        Files that already have prerendered contents are left as they are. If all of them do,
+        e.g. because ``synth_in_parallel()`` restored or rendered them earlier in the synth,
+        the cache is not consulted, and neither a hit nor a miss is counted.
+
+        :return: the number of files restored
+        """
+        pending: List["TemplatizedFile"] = [file for file in files if not file.has_prerendered_contents]
+        if not pending:
+            return 0
+        with trace_span("SynthCache.restore", key=key):
+            entry: Optional[TCacheEntry] = self.__load(key)
+            if entry is None:
+                self.stats.misses += 1
+                return 0
+            n_restored = 0
+            for file in pending:
+                cached: Optional[Dict[str, str]] = entry.get(str(file.file_path))
+                if cached is None or cached["template_sha256"] != hash_template_source(file.get_template_source()):
+                    continue
+                # snapshotted, so that the values stored with the file are the ones it was rendered from
+                values: Dict[str, Any] = deepcopy(file.get_values())
+                if cached["values_sha256"] != hash_values(values):
+                    continue
+                file.set_prerendered_contents(values=values, contents=cached["contents"])
+                n_restored += 1
+            if n_restored:
+                self.stats.hits += 1
+                # the entry was just used, so it is the last to be evicted
+                os.utime(self.__get_entry_fpath(key))
+            else:
+                self.stats.misses += 1
+            return n_restored
+
+    def store(self, key: str, files: Sequence["TemplatizedFile"]) -> None:
+        """Store the contents ``files`` were last rendered with under ``key``, then evict old entries."""
+        entry: TCacheEntry = {}
+        for file in files:
+            if file.last_rendered is None:
+                continue
+            values, contents = file.last_rendered
+            entry[str(file.file_path)] = {
+                "template_sha256": hash_template_source(file.get_template_source()),
+                "values_sha256": hash_values(values),
+                "contents": contents,
+            }
+        if not entry:
+            return
+        with trace_span("SynthCache.store", key=key):
+            entry_fpath: Path = self.__get_entry_fpath(key)
+            entry_fpath.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomically(entry_fpath, json.dumps(entry, sort_keys=True).encode("utf-8"))
+            self.evict()
+
+    def evict(self) -> int:
+        """Remove the least recently used entries until the cache fits in ``max_bytes``; return how many."""
+        entries: List[Tuple[int, int, Path]] = []
+        for fpath in self.cache_dir.glob(f"*/*{ENTRY_SUFFIX}"):
+            try:
+                stat: os.stat_result = fpath.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, fpath))
+
+        total_bytes: int = sum(size for _, size, _ in entries)
+        n_evicted = 0
+        for _, size, fpath in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                fpath.unlink()
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            n_evicted += 1
+        self.stats.evicted += n_evicted
+        return n_evicted
+
+    def __load(self, key: str) -> Optional[TCacheEntry]:
+        try:
+            return json.loads(self.__get_entry_fpath(key).read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def __get_entry_fpath(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+
+def make_cache_key(inputs: Mapping[str, Any]) -> str:
+    """Hash ``inputs``, together with the version of ``phito_projen`` and its templates, into a cache key."""
+    canonical: str = json.dumps(
+        {
+            "inputs": inputs,
+            "phito_projen_version": get_phito_projen_version(),
+            "templates_sha256": get_templates_hash(),
+        },
+        sort_keys=True,
+        default=_to_json,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def hash_values(values: Mapping[str, Any]) -> str:
+    """Hash the values a template is rendered with; values that are not JSON are hashed by their ``repr()``."""
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=_to_json).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_phito_projen_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(DISTRIBUTION_NAME)
+    except PackageNotFoundError:
+        # e.g. a source checkout; the hash of the templates still tells versions apart
+        return "unknown"
+
+
+@lru_cache(maxsize=None)
+def get_templates_hash() -> str:
+    return hashlib.sha256(dump_template_manifest(load_template_manifest()).encode("utf-8")).hexdigest()
+
+
+def get_default_synth_cache() -> Optional[SynthCache]:
+    """Return a ``SynthCache`` in ``PHITO_PROJEN_SYNTH_CACHE_DIR``, or ``None`` if it is not set."""
+    cache_dir: Optional[str] = os.environ.get(SYNTH_CACHE_DIR_ENV_VAR)
+    return SynthCache(cache_dir) if cache_dir else None
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if hasattr(value, "to_list"):
+        # e.g. a ``RequirementSet``
+        return value.to_list()
+    return repr(value)
+
+
+def _write_atomically(fpath: Path, contents: bytes) -> None:
+    fd, temp_fpath = tempfile.mkstemp(dir=fpath.parent, prefix=f".{fpath.name}.", suffix=".tmp")
+    try:
+        with open(fd, "wb") as temp_file:
+            temp_file.write(contents)
+        os.replace(temp_fpath, fpath)
+    finally:
+        if os.path.lexists(temp_fpath):
+            os.unlink(temp_fpath)
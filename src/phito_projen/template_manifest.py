@@ -0,0 +1,159 @@
+"""
+A precomputed listing of the templates and sample files shipped in ``phito_projen``.
+
+Every file in a ``templates/`` directory of the package is listed in
+``template-manifest.json``, with its size and SHA-256, so that finding templates
+is a dict lookup rather than a walk of the filesystem. Templates are read through
+``importlib.resources`` rather than from paths derived from ``__file__``, so
+``phito_projen`` also works when imported from a zip file, e.g. a zipapp.
+
+The manifest is generated at build time, and must be regenerated whenever a
+template is added, removed or changed:
+
+.. code-block:: bash
+
+    python -m phito_projen.template_manifest          # write template-manifest.json
+    python -m phito_projen.template_manifest --check  # fail if it is out of date
+
+Like ``phito_projen.extras``, this module only depends on the standard library.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Tuple
+
+if sys.version_info >= (3, 9):
+    from importlib.resources import files
+else:  # pragma: no cover
+    from importlib_resources import files
+
+if sys.version_info >= (3, 11):
+    from importlib.resources.abc import Traversable
+elif sys.version_info >= (3, 9):
+    from importlib.abc import Traversable
+else:  # pragma: no cover
+    from importlib_resources.abc import Traversable
+
+PACKAGE_NAME = "phito_projen"
+TEMPLATE_MANIFEST_FNAME = "template-manifest.json"
+TEMPLATE_DIR_NAME = "templates"
+EXCLUDED_DIR_NAMES = ("__pycache__",)
+GENERATE_MANIFEST_COMMAND = "python -m phito_projen.template_manifest"
+
+
+@dataclass(frozen=True)
+class TemplateManifestEntry:
+    size: int
+    sha256: str
+
+
+TTemplateManifest = Dict[str, TemplateManifestEntry]
+"""Maps the path of each template, relative to the ``phito_projen`` package and in POSIX form, to its entry."""
+
+
+def build_template_manifest(package_dir: Path) -> TTemplateManifest:
+    """List the files in every ``templates/`` directory under ``package_dir``."""
+    manifest: TTemplateManifest = {}
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        dirnames[:] = sorted(name for name in dirnames if name not in EXCLUDED_DIR_NAMES)
+        relative_dir = PurePosixPath(Path(dirpath).relative_to(package_dir).as_posix())
+        if TEMPLATE_DIR_NAME not in relative_dir.parts:
+            continue
+        for filename in sorted(filenames):
+            contents: bytes = (Path(dirpath) / filename).read_bytes()
+            manifest[str(relative_dir / filename)] = TemplateManifestEntry(
+                size=len(contents), sha256=hashlib.sha256(contents).hexdigest()
+            )
+    return manifest
+
+
+def dump_template_manifest(manifest: TTemplateManifest) -> str:
+    return json.dumps({name: asdict(entry) for name, entry in sorted(manifest.items())}, indent=2) + "\n"
+
+
+def get_package_resource(name: str) -> Traversable:
+    """Return the file or directory at ``name``, relative to the ``phito_projen`` package."""
+    return files(PACKAGE_NAME).joinpath(*PurePosixPath(name).parts)
+
+
+@lru_cache(maxsize=None)
+def load_template_manifest() -> TTemplateManifest:
+    """Load ``template-manifest.json``, once per process."""
+    manifest_resource: Traversable = get_package_resource(TEMPLATE_MANIFEST_FNAME)
+    try:
+        data: Dict[str, Dict[str, object]] = json.loads(manifest_resource.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        # e.g. a source checkout in which the manifest has not been generated yet
+        package_dir = files(PACKAGE_NAME)
+        if not isinstance(package_dir, Path):
+            raise
+        return build_template_manifest(package_dir)
+    return {name: TemplateManifestEntry(**entry) for name, entry in data.items()}
+
+
+def get_template_manifest_entry(name: str) -> TemplateManifestEntry:
+    """
+    Return the manifest entry of the template at ``name``.
+
+    :raises FileNotFoundError: if ``name`` is not in the manifest
+    """
+    try:
+        return load_template_manifest()[name]
+    except KeyError:
+        raise FileNotFoundError(
+            f"{name!r} is not listed in {TEMPLATE_MANIFEST_FNAME}; regenerate it with "
+            f"'{GENERATE_MANIFEST_COMMAND}' if the template was added recently."
+        ) from None
+
+
+@lru_cache(maxsize=None)
+def read_template_resource(name: str) -> str:
+    """Read the template at ``name``, at most once per process."""
+    get_template_manifest_entry(name)
+    return get_package_resource(name).read_text(encoding="utf-8")
+
+
+def list_template_resources(directory: str) -> List[str]:
+    """Return the paths, relative to ``directory``, of all templates in ``directory`` and its subdirectories."""
+    return list(_index_by_directory().get(str(PurePosixPath(directory)), ()))
+
+
+@lru_cache(maxsize=None)
+def _index_by_directory() -> Dict[str, Tuple[str, ...]]:
+    index: Dict[str, List[str]] = {}
+    for name in load_template_manifest():
+        path = PurePosixPath(name)
+        for directory in path.parents:
+            index.setdefault(str(directory), []).append(str(path.relative_to(directory)))
+    return {directory: tuple(names) for directory, names in index.items()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=f"Generate the {TEMPLATE_MANIFEST_FNAME} of {PACKAGE_NAME}.")
+    parser.add_argument("--check", action="store_true", help="fail if the manifest is out of date instead of writing it")
+    args = parser.parse_args(argv)
+
+    package_dir = files(PACKAGE_NAME)
+    if not isinstance(package_dir, Path):
+        parser.error(f"{PACKAGE_NAME} must be installed as a directory, not as {package_dir!r}")
+    manifest_fpath: Path = package_dir / TEMPLATE_MANIFEST_FNAME
+    contents: str = dump_template_manifest(build_template_manifest(package_dir))
+
+    if args.check:
+        if not manifest_fpath.exists() or manifest_fpath.read_text(encoding="utf-8") != contents:
+            print(f"{manifest_fpath} is out of date; run '{GENERATE_MANIFEST_COMMAND}'", file=sys.stderr)
+            return 1
+        return 0
+    manifest_fpath.write_text(contents, encoding="utf-8")
+    print(f"wrote {manifest_fpath}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
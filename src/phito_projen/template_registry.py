@@ -0,0 +1,140 @@
+"""
+Process-wide registry of compiled Jinja templates.
+
+Every ``TemplatizedFile`` in a project renders through the same ``jinja2.Environment``.
+Templates are registered under the hash of their source, so identical templates
+(e.g. the ``setup.cfg`` template used by hundreds of ``PythonPackage`` subprojects)
+are parsed and compiled once per process.
+
+Setting the ``PHITO_PROJEN_TEMPLATE_CACHE_DIR`` environment variable additionally
+persists the compiled bytecode to disk, so templates are compiled once per machine
+across runs.
+"""
+
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, Template, TemplateNotFound
+
+TEMPLATE_CACHE_DIR_ENV_VAR = "PHITO_PROJEN_TEMPLATE_CACHE_DIR"
+"""Directory in which to persist compiled template bytecode between runs."""
+
+DEFAULT_MAX_CACHED_TEMPLATES = 128
+"""Number of compiled templates to hold in memory before evicting the least recently used."""
+
+
+class _ContentHashLoader(BaseLoader):
+    """
+    Resolve a template name, which is a content hash, to the source being looked up under it.
+
+    Sources are only held while ``TemplateRegistry.get_template()`` runs, in the calling thread;
+    the compiled templates are kept in the environment's LRU, which bounds the memory used. A
+    template that has been evicted is compiled again from the source passed on its next lookup.
+    """
+
+    def __init__(self) -> None:
+        self.__pending = threading.local()
+
+    @contextmanager
+    def providing(self, name: str, source: str) -> Iterator[None]:
+        """Make ``source`` loadable under ``name`` in this thread, for the duration of the block."""
+        self.__pending.name, self.__pending.source = name, source
+        try:
+            yield
+        finally:
+            self.__pending.name = self.__pending.source = None
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> Tuple[str, Optional[str], Callable[[], bool]]:
+        if getattr(self.__pending, "name", None) != template:
+            raise TemplateNotFound(template)
+        source: str = self.__pending.source
+        # a template's name is the hash of its source, so it can never go stale
+        return source, None, lambda: True
+
+
+class TemplateRegistry:
+    """
+    A shared ``jinja2.Environment`` that compiles each distinct template source once.
+
+    :param max_cached_templates: size of the in-memory LRU of compiled templates
+    :param bytecode_cache_dir: if set, compiled templates are also cached on disk in this directory
+    """
+
+    def __init__(
+        self,
+        max_cached_templates: int = DEFAULT_MAX_CACHED_TEMPLATES,
+        bytecode_cache_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.bytecode_cache_dir = Path(bytecode_cache_dir) if bytecode_cache_dir else None
+        bytecode_cache = None
+        if self.bytecode_cache_dir:
+            self.bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(directory=str(self.bytecode_cache_dir))
+
+        self.__loader = _ContentHashLoader()
+        # the remaining options are left at their defaults so that rendering is
+        # identical to ``jinja2.Template(source=...)``
+        self.environment = Environment(
+            loader=self.__loader,
+            cache_size=max_cached_templates,
+            auto_reload=False,
+            bytecode_cache=bytecode_cache,
+        )
+
+    def get_template(self, source: str) -> Template:
+        """Return the compiled template for ``source``, compiling it only if it has not been seen before."""
+        name: str = hash_template_source(source)
+        with self.__loader.providing(name, source):
+            return self.environment.get_template(name)
+
+    def get_template_from_path(self, template_fpath: Union[str, Path]) -> Template:
+        """Return the compiled template stored at ``template_fpath``; the file is read once per process."""
+        return self.get_template(read_template_source(Path(template_fpath)))
+
+
+def hash_template_source(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def read_template_source(template_fpath: Path) -> str:
+    """Read a template file from disk, at most once per process."""
+    return template_fpath.read_text()
+
+
+_registry: Optional[TemplateRegistry] = None
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Return the process-wide ``TemplateRegistry``, creating it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = TemplateRegistry(
+            bytecode_cache_dir=os.environ.get(TEMPLATE_CACHE_DIR_ENV_VAR) or None
+        )
+    return _registry
+
+
+def configure_template_registry(
+    max_cached_templates: int = DEFAULT_MAX_CACHED_TEMPLATES,
+    bytecode_cache_dir: Optional[Union[str, Path]] = None,
+) -> TemplateRegistry:
+    """
+    Replace the process-wide ``TemplateRegistry``.
+
+    Call this at the top of a ``.projenrc.py`` to tune the in-memory LRU or to
+    choose an on-disk bytecode cache without setting ``PHITO_PROJEN_TEMPLATE_CACHE_DIR``.
+    """
+    global _registry
+    _registry = TemplateRegistry(
+        max_cached_templates=max_cached_templates,
+        bytecode_cache_dir=bytecode_cache_dir,
+    )
+    return _registry
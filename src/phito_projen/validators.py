@@ -0,0 +1,37 @@
+"""
+Validation of user-provided names.
+
+This module only depends on the standard library, so tooling can import it
+without starting the ``projen`` (jsii) runtime.
+"""
+
+import re
+from typing import Type
+
+PYTHON_PROJECT_NAME_REGEX = re.compile(r"^[A-Za-z0-9-_\.]+$")
+
+
+class InvalidPythonModuleNameError(Exception):
+    """Raise when an invalid module name is thrown."""
+
+    @staticmethod
+    def make_err_msg(invalid_module_name: str) -> str:
+        return f"'{invalid_module_name}' is not a valid Python module_name. Must satisfy regex: '{PYTHON_PROJECT_NAME_REGEX}'"
+
+    @classmethod
+    def from_invalid_module_name(
+        cls: Type["InvalidPythonModuleNameError"], invalid_module_name: str
+    ) -> Type["InvalidPythonModuleNameError"]:
+        return cls(
+            InvalidPythonModuleNameError.make_err_msg(
+                invalid_module_name=invalid_module_name
+            )
+        )
+
+
+def validate_python_module_name(module_name: str):
+    is_exact_match = bool(
+        re.fullmatch(pattern=PYTHON_PROJECT_NAME_REGEX, string=module_name)
+    )
+    if not is_exact_match:
+        raise InvalidPythonModuleNameError.from_invalid_module_name(module_name)
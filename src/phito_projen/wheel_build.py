@@ -0,0 +1,292 @@
+"""
+Build the wheels of the Python packages in a repository, in parallel, reusing build environments.
+
+``python -m build --wheel`` creates a fresh isolated environment for every build, and installs
+the package's ``build-system.requires`` into it, every time. Here instead:
+
+- each distinct set of ``build-system.requires`` is installed into a virtualenv once, in a cache
+  directory, under a key derived from the requirements and the Python version. Packages with the
+  same requirements (e.g. all ``PythonPackage`` subprojects of a mono-repo) share one environment,
+  and builds run in it with ``python -m build --wheel --no-isolation``;
+- the sources of each package are hashed; a package whose sources are unchanged since the wheel in
+  its ``dist/`` directory was built is skipped;
+- the remaining packages are built in parallel.
+
+.. code-block:: bash
+
+    python -m phito_projen.wheel_build                    # every package under the current directory
+    python -m phito_projen.wheel_build pkg-a pkg-b --max-workers 4
+    python -m phito_projen.wheel_build --force            # rebuild even if the sources are unchanged
+
+The cache directory is ``$PHITO_PROJEN_BUILD_CACHE_DIR``, or ``phito-projen/build-envs`` in the user's
+cache directory. ``PythonPackage`` adds a ``build:wheels`` task that runs this module.
+
+Like ``phito_projen.template_manifest``, this module only depends on the standard library.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import venv
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from phito_projen.requirement_set import parse_requirement_key
+
+BUILD_CACHE_DIR_ENV_VAR = "PHITO_PROJEN_BUILD_CACHE_DIR"
+"""Directory in which build environments are kept between builds."""
+
+BUILD_STAMP_FNAME = ".wheel-build.json"
+"""Written to ``dist/`` after a build; records the hash of the sources the wheel was built from."""
+
+BUILD_WHEELS_TASK_NAME = "build:wheels"
+BUILD_WHEELS_COMMAND = "python -m phito_projen.wheel_build"
+
+EXCLUDED_DIR_NAMES = ("__pycache__", "build", "dist", "node_modules")
+"""Directories that are not part of a package's sources, besides hidden directories, virtualenvs and ``*.egg-info``."""
+
+BUILT_WHEEL_REGEX = re.compile(r"Successfully built .*?(\S+\.whl)")
+
+
+@dataclass(frozen=True)
+class WheelBuildResult:
+    package_dir: Path
+    status: str
+    """``built``, ``skipped`` (the sources are unchanged) or ``failed``."""
+    seconds: float = 0.0
+    wheel: Optional[Path] = None
+    output: str = ""
+
+    def __str__(self) -> str:
+        return f"{self.status:>7} {self.package_dir} ({self.seconds:.1f} s)" + (f": {self.wheel.name}" if self.wheel else "")
+
+
+class BuildEnvCache:
+    """
+    Virtualenvs with the ``build-system.requires`` of packages installed, one per distinct set of requirements.
+
+    An environment is created in a temporary directory and renamed into place once it is complete,
+    so a build never sees a half-installed environment, even if several processes build at once.
+    """
+
+    def __init__(self, cache_dir: os.PathLike) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.__locks: Dict[str, threading.Lock] = {}
+        self.__locks_lock = threading.Lock()
+
+    def get_env_python(self, requires: Sequence[str]) -> Path:
+        """Return the Python executable of the environment for ``requires``, creating it if needed."""
+        key: str = make_build_env_key(requires)
+        env_dir: Path = self.cache_dir / key
+        with self.__locks_lock:
+            lock: threading.Lock = self.__locks.setdefault(key, threading.Lock())
+        with lock:
+            if not env_dir.is_dir():
+                self.__create_env(env_dir, requires=with_build_frontend(requires))
+        return get_env_python(env_dir)
+
+    def __create_env(self, env_dir: Path, requires: List[str]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=f".{env_dir.name}-"))
+        try:
+            venv.create(tmp_dir, with_pip=True)
+            subprocess.run(
+                [str(get_env_python(tmp_dir)), "-m", "pip", "install", "--quiet", "--disable-pip-version-check", *requires],
+                check=True,
+                capture_output=True,
+            )
+            (tmp_dir / "requires.json").write_text(json.dumps(requires, indent=2))
+            try:
+                tmp_dir.rename(env_dir)
+            except OSError:
+                # another process created the same environment first
+                if not env_dir.is_dir():
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def make_build_env_key(requires: Sequence[str]) -> str:
+    """Hash ``requires``, and the Python version and platform the environment is created for."""
+    key_data: Dict[str, object] = {
+        "requires": sorted(requires),
+        "python": list(sys.version_info[:3]),
+        "implementation": sys.implementation.name,
+        "platform": sys.platform,
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def with_build_frontend(requires: Sequence[str]) -> List[str]:
+    """Return ``requires`` plus ``build``, which runs the build, if it is not among them."""
+    names = {parse_requirement_key(requirement)[0][0] for requirement in requires}
+    return list(requires) if "build" in names else [*requires, "build"]
+
+
+def get_env_python(env_dir: Path) -> Path:
+    if sys.platform == "win32":
+        return env_dir / "Scripts" / "python.exe"
+    return env_dir / "bin" / "python"
+
+
+def get_default_build_cache_dir() -> Path:
+    cache_dir: Optional[str] = os.environ.get(BUILD_CACHE_DIR_ENV_VAR)
+    if cache_dir:
+        return Path(cache_dir)
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "phito-projen" / "build-envs"
+
+
+def read_build_requires(package_dir: Path) -> List[str]:
+    """Return the ``build-system.requires`` of the package in ``package_dir``."""
+    pyproject_toml: str = (package_dir / "pyproject.toml").read_text(encoding="utf-8")
+    try:
+        import tomllib  # Python >= 3.11
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return _parse_build_requires(pyproject_toml)
+    return list(tomllib.loads(pyproject_toml).get("build-system", {}).get("requires", []))
+
+
+def _parse_build_requires(pyproject_toml: str) -> List[str]:
+    """
+    Read ``requires`` from the ``[build-system]`` table without a TOML parser.
+
+    Sufficient for the ``pyproject.toml`` written by ``PyprojectToml``: a TOML array of
+    strings without comments is also a Python literal.
+    """
+    match = re.search(r"^\[build-system\][^\[]*?^requires\s*=\s*(\[.*?\])", pyproject_toml, re.MULTILINE | re.DOTALL)
+    return list(ast.literal_eval(match.group(1))) if match else []
+
+
+def hash_package_sources(package_dir: Path) -> str:
+    """Hash the path and contents of every file that can end up in the package's wheel."""
+    digest = hashlib.sha256()
+    for fpath in iter_package_sources(package_dir):
+        digest.update(fpath.relative_to(package_dir).as_posix().encode("utf-8") + b"\0")
+        digest.update(hashlib.sha256(fpath.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def iter_package_sources(package_dir: Path) -> Iterator[Path]:
+    """Yield the files of the package in ``package_dir``, in a stable order, skipping those of nested packages."""
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        dirnames[:] = sorted(
+            name
+            for name in dirnames
+            if not _is_excluded_dir(name) and not (Path(dirpath) / name / "pyproject.toml").is_file()
+        )
+        for filename in sorted(filenames):
+            if not filename.endswith((".pyc", ".pyo")):
+                yield Path(dirpath) / filename
+
+
+def _is_excluded_dir(name: str) -> bool:
+    return name.startswith(".") or name in EXCLUDED_DIR_NAMES or name.endswith((".egg-info", "venv"))
+
+
+def find_package_dirs(root_dir: Path) -> List[Path]:
+    """Return ``root_dir`` and the directories under it that contain a package with a ``[build-system]``."""
+    package_dirs: List[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        dirnames[:] = sorted(name for name in dirnames if not _is_excluded_dir(name))
+        if "pyproject.toml" in filenames and ({"setup.py", "setup.cfg"} & set(filenames)):
+            package_dirs.append(Path(dirpath))
+    return package_dirs
+
+
+def build_wheel(
+    package_dir: Path, env_cache: BuildEnvCache, dist_dir: Optional[Path] = None, force: bool = False
+) -> WheelBuildResult:
+    """Build the wheel of the package in ``package_dir`` into ``dist_dir``, unless its sources are unchanged."""
+    start: float = time.perf_counter()
+    dist_dir = dist_dir or package_dir / "dist"
+    requires: List[str] = read_build_requires(package_dir)
+    source_hash: str = hashlib.sha256(
+        (make_build_env_key(requires) + hash_package_sources(package_dir)).encode("utf-8")
+    ).hexdigest()
+
+    stamp_fpath: Path = dist_dir / BUILD_STAMP_FNAME
+    if not force and stamp_fpath.is_file():
+        stamp: Dict[str, str] = json.loads(stamp_fpath.read_text())
+        wheel = dist_dir / stamp.get("wheel", "")
+        if stamp.get("source_hash") == source_hash and wheel.is_file():
+            return WheelBuildResult(package_dir, status="skipped", seconds=time.perf_counter() - start, wheel=wheel)
+
+    try:
+        env_python: Path = env_cache.get_env_python(requires)
+    except subprocess.CalledProcessError as error:
+        output: str = (error.stdout or b"").decode() + (error.stderr or b"").decode()
+        return WheelBuildResult(package_dir, status="failed", seconds=time.perf_counter() - start, output=output)
+    process = subprocess.run(
+        [str(env_python), "-m", "build", "--wheel", "--no-isolation", "--outdir", str(dist_dir), str(package_dir)],
+        capture_output=True,
+        text=True,
+    )
+    output = process.stdout + process.stderr
+    match = BUILT_WHEEL_REGEX.search(process.stdout)
+    if process.returncode != 0 or not match:
+        return WheelBuildResult(package_dir, status="failed", seconds=time.perf_counter() - start, output=output)
+
+    wheel = dist_dir / match.group(1)
+    stamp_fpath.write_text(json.dumps({"source_hash": source_hash, "wheel": wheel.name}, indent=2))
+    return WheelBuildResult(package_dir, status="built", seconds=time.perf_counter() - start, wheel=wheel, output=output)
+
+
+def build_wheels(
+    package_dirs: Sequence[Path],
+    cache_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+) -> List[WheelBuildResult]:
+    """
+    Build the wheels of the packages in ``package_dirs`` in parallel; see the module docstring.
+
+    :param cache_dir: directory of the build environments; see ``get_default_build_cache_dir()``
+    :param max_workers: packages built at once; defaults to the number of CPUs
+    :param force: build every package, even if its sources are unchanged
+    """
+    env_cache = BuildEnvCache(cache_dir or get_default_build_cache_dir())
+    # the builds are separate processes, so threads are enough to run them in parallel
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        return list(executor.map(lambda package_dir: build_wheel(package_dir, env_cache, force=force), package_dirs))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "dirs", nargs="*", type=Path, default=[Path(".")], help="packages, or directories to search for packages"
+    )
+    parser.add_argument("--cache-dir", type=Path, help=f"default: ${BUILD_CACHE_DIR_ENV_VAR}, or the user's cache directory")
+    parser.add_argument("--max-workers", type=int)
+    parser.add_argument("--force", action="store_true", help="rebuild packages whose sources are unchanged")
+    args = parser.parse_args(argv)
+
+    package_dirs: List[Path] = [package_dir for root_dir in args.dirs for package_dir in find_package_dirs(root_dir)]
+    if not package_dirs:
+        sys.exit(f"No Python packages found in {', '.join(map(str, args.dirs))}.")
+    results: List[WheelBuildResult] = build_wheels(
+        package_dirs, cache_dir=args.cache_dir, max_workers=args.max_workers, force=args.force
+    )
+    for result in results:
+        print(result)
+        if result.status == "failed":
+            print(result.output, file=sys.stderr)
+    if any(result.status == "failed" for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import json
+import os
+
+from phito_projen.file_hash_manifest import FILE_HASH_MANIFEST_FPATH, FileHashManifest, SynthReport
+
+CONTENTS = "[metadata]\nname = example\n"
+
+
+def synth(outdir, files):
+    """Write ``files`` like a synth would, skipping the unchanged ones; return the manifest afterwards."""
+    manifest = FileHashManifest(outdir)
+    manifest.load()
+    for file_path, contents in files.items():
+        if manifest.is_unchanged(file_path, contents):
+            manifest.mark_skipped(file_path)
+            continue
+        (outdir / file_path).write_text(contents)
+        manifest.mark_written(file_path, contents)
+    manifest.save()
+    return manifest
+
+
+def test_unchanged_file_is_skipped(tmp_path):
+    assert synth(tmp_path, {"setup.cfg": CONTENTS}).report == SynthReport(written=1)
+    mtime_ns: int = (tmp_path / "setup.cfg").stat().st_mtime_ns
+
+    assert synth(tmp_path, {"setup.cfg": CONTENTS}).report == SynthReport(skipped=1)
+    assert (tmp_path / "setup.cfg").stat().st_mtime_ns == mtime_ns
+    # a skipped file stays in the manifest, so it is skipped again by the next synth
+    assert synth(tmp_path, {"setup.cfg": CONTENTS}).report == SynthReport(skipped=1)
+
+
+def test_changed_contents_are_rewritten(tmp_path):
+    synth(tmp_path, {"setup.cfg": CONTENTS})
+    assert synth(tmp_path, {"setup.cfg": CONTENTS + "version = 1\n"}).report == SynthReport(written=1)
+
+
+def test_file_edited_on_disk_is_rewritten(tmp_path):
+    synth(tmp_path, {"setup.cfg": CONTENTS})
+    fpath = tmp_path / "setup.cfg"
+    fpath.write_text(CONTENTS.upper())
+
+    assert synth(tmp_path, {"setup.cfg": CONTENTS}).report == SynthReport(written=1)
+    assert fpath.read_text() == CONTENTS
+
+
+def test_touched_file_is_rewritten(tmp_path):
+    synth(tmp_path, {"setup.cfg": CONTENTS})
+    stat = (tmp_path / "setup.cfg").stat()
+    os.utime(tmp_path / "setup.cfg", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    manifest = FileHashManifest(tmp_path)
+    manifest.load()
+    assert not manifest.is_unchanged("setup.cfg", CONTENTS)
+
+
+def test_file_with_changed_mode_is_rewritten(tmp_path):
+    synth(tmp_path, {"setup.cfg": CONTENTS})
+    os.chmod(tmp_path / "setup.cfg", 0o444)
+
+    manifest = FileHashManifest(tmp_path)
+    manifest.load()
+    assert not manifest.is_unchanged("setup.cfg", CONTENTS)
+
+
+def test_deleted_file_is_rewritten_and_reported(tmp_path):
+    synth(tmp_path, {"setup.cfg": CONTENTS, "MANIFEST.in": "include README.md\n"})
+    (tmp_path / "setup.cfg").unlink()
+    (tmp_path / "MANIFEST.in").unlink()
+
+    # setup.cfg is still generated, MANIFEST.in no longer is
+    assert synth(tmp_path, {"setup.cfg": CONTENTS}).report == SynthReport(written=1, deleted=1)
+
+
+def test_missing_or_invalid_manifest_rewrites_everything(tmp_path):
+    synth(tmp_path, {"setup.cfg": CONTENTS})
+    (tmp_path / FILE_HASH_MANIFEST_FPATH).write_text("{not json")
+    assert synth(tmp_path, {"setup.cfg": CONTENTS}).report == SynthReport(written=1)
+
+    (tmp_path / FILE_HASH_MANIFEST_FPATH).unlink()
+    assert synth(tmp_path, {"setup.cfg": CONTENTS}).report == SynthReport(written=1)
+    assert set(json.loads((tmp_path / FILE_HASH_MANIFEST_FPATH).read_text())) == {"setup.cfg"}
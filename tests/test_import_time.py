@@ -0,0 +1,61 @@
+"""
+``import phito_projen`` must stay cheap: see ``benchmarks/import_time.py`` for a breakdown by module.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import phito_projen
+
+IMPORT_TIME_BUDGET_MS = 100.0
+
+HEAVY_MODULES = ["projen", "jsii", "jinja2", "pydantic", "constructs"]
+"""Top-level modules that ``import phito_projen`` must not import."""
+
+IMPORT_SCRIPT = f"""\
+import json, sys
+import phito_projen
+print(json.dumps([module for module in {HEAVY_MODULES!r} if module in sys.modules]))
+"""
+
+
+def run_import_script() -> subprocess.CompletedProcess:
+    """Import ``phito_projen`` in a fresh interpreter with ``-X importtime``."""
+    env: Dict[str, str] = dict(os.environ)
+    # the same phito_projen as this test imports, whether installed or from ``src/``
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(phito_projen.__file__).parents[1]), *filter(None, [env.get("PYTHONPATH")])]
+    )
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+
+
+def get_cumulative_import_ms(importtime_output: str, module: str) -> float:
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        if name.strip() == module:
+            return int(cumulative_us) / 1000
+    raise AssertionError(f"{module} was not imported")
+
+
+def test_import_is_within_budget():
+    completed = run_import_script()
+    elapsed_ms: float = get_cumulative_import_ms(completed.stderr, "phito_projen")
+    assert elapsed_ms <= IMPORT_TIME_BUDGET_MS, f"import phito_projen took {elapsed_ms:.1f} ms"
+
+
+def test_import_does_not_import_heavy_modules():
+    completed = run_import_script()
+    heavy_imports: List[str] = json.loads(completed.stdout)
+    assert heavy_imports == []
@@ -0,0 +1,73 @@
+import pytest
+
+from phito_projen.components.commentable_files.object_file_utils import (
+    compile_path,
+    get_reference_by_path,
+    get_reference_container_by_path,
+    get_references_by_paths,
+)
+
+OBJ = {
+    "repos": [
+        {"repo": "local", "hooks": [{"id": "black"}, {"id": "isort", "args": ["--profile", "black"]}]},
+        {"repo": "https://github.com/pre-commit/pre-commit-hooks", "hooks": [{"id": "check-yaml"}]},
+    ],
+    "fail_fast": True,
+}
+
+
+def test_compile_path_parses_keys_indices_and_slices():
+    compiled = compile_path("repos.[0].hooks.[0:2]")
+    assert compiled.parts == ("repos", "[0]", "hooks", "[0:2]")
+    assert compiled.keys == ("repos", 0, "hooks", slice(0, 2))
+
+
+def test_final_key():
+    assert compile_path("repos.[0]").final_key == 0
+    assert compile_path("repos.[0].hooks").final_key == "hooks"
+
+
+def test_compile_path_is_cached():
+    assert compile_path("repos.[1].hooks") is compile_path("repos.[1].hooks")
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("fail_fast", True),
+        ("repos.[0].repo", "local"),
+        ("repos.[0].hooks.[1].args.[1]", "black"),
+        ("repos.[0].hooks.[0:1]", [{"id": "black"}]),
+    ],
+)
+def test_get_reference_by_path(path, expected):
+    assert get_reference_by_path(path, OBJ) == expected
+
+
+def test_get_reference_returns_a_reference():
+    obj = {"a": [{"b": []}]}
+    get_reference_by_path("a.[0].b", obj).append(1)
+    get_reference_container_by_path("a.[0].c", obj)["c"] = 2
+    assert obj == {"a": [{"b": [1], "c": 2}]}
+
+
+def test_get_references_by_paths_matches_get_reference_by_path():
+    paths = [
+        "repos.[0].hooks.[0].id",
+        "repos.[0].hooks.[1].id",
+        "repos.[0].hooks",
+        "repos.[1].hooks.[0].id",
+        "repos.[0:1]",
+        "fail_fast",
+    ]
+    assert get_references_by_paths(paths, OBJ) == {path: get_reference_by_path(path, OBJ) for path in paths}
+
+
+def test_get_references_by_paths_with_repeated_and_no_paths():
+    assert get_references_by_paths(["fail_fast", "fail_fast"], OBJ) == {"fail_fast": True}
+    assert get_references_by_paths([], OBJ) == {}
+
+
+def test_get_references_by_paths_raises_for_a_missing_path():
+    with pytest.raises(KeyError):
+        get_references_by_paths(["repos.[0].missing"], OBJ)
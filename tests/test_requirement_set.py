@@ -0,0 +1,96 @@
+import pytest
+
+from phito_projen.requirement_set import (
+    RequirementSet,
+    normalize_requirement_name,
+    parse_requirement,
+    parse_requirement_key,
+)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("pandas", "pandas"),
+        ("Foo.Bar_baz", "foo-bar-baz"),
+        ("foo__bar--baz", "foo-bar-baz"),
+        ("Zope.Interface", "zope-interface"),
+    ],
+)
+def test_normalize_requirement_name(name, expected):
+    assert normalize_requirement_name(name) == expected
+
+
+def test_names_are_compared_after_pep_503_normalization():
+    requirements = RequirementSet(["Foo.Bar>=1", "foo_bar<2", "FOO-BAR"])
+    assert requirements.to_list() == ["Foo.Bar>=1,<2"]
+    assert "foo-bar" in requirements
+
+
+def test_bare_name_is_replaced_by_a_more_specific_requirement():
+    assert RequirementSet(["pandas", "Pandas>=1"]).to_list() == ["Pandas>=1"]
+
+
+def test_bare_name_does_not_replace_a_more_specific_requirement():
+    assert RequirementSet(["pandas>=1", "pandas"]).to_list() == ["pandas>=1"]
+
+
+def test_specifiers_are_merged():
+    assert RequirementSet(["pandas>=1", "pandas<2", "pandas >= 1"]).to_list() == ["pandas>=1,<2"]
+
+
+def test_extras_are_merged():
+    assert RequirementSet(["pandas[sql]>=1", "pandas[excel, sql]<2"]).to_list() == ["pandas[sql,excel]>=1,<2"]
+
+
+def test_requirements_with_different_markers_are_kept_apart():
+    requirements = RequirementSet(
+        ['pywin32; sys_platform == "win32"', "pywin32>=300", "pywin32<400; sys_platform=='win32'"]
+    )
+    assert requirements.to_list() == ["pywin32<400; sys_platform=='win32'", "pywin32>=300"]
+
+
+def test_marker_is_kept_when_merging():
+    requirements = RequirementSet(['tomli>=1; python_version<"3.11"', 'tomli<3; python_version < "3.11"'])
+    assert requirements.to_list() == ['tomli>=1,<3; python_version<"3.11"']
+
+
+def test_insertion_order_is_preserved():
+    requirements = RequirementSet(["requests", "pandas", "attrs", "pandas>=1", "requests<3", "numpy"])
+    assert requirements.to_list() == ["requests<3", "pandas>=1", "attrs", "numpy"]
+
+
+def test_requirements_that_cannot_be_merged_are_all_kept():
+    assert RequirementSet(["pandas>=1", "pandas@^1"]).to_list() == ["pandas>=1", "pandas@^1"]
+
+
+def test_direct_references_are_deduplicated_by_url():
+    requirements = RequirementSet(
+        ["pkg @ git+https://github.com/org/pkg.git", "other-name @ git+https://github.com/org/pkg.git", "-e ."]
+    )
+    assert requirements.to_list() == ["pkg @ git+https://github.com/org/pkg.git", "-e ."]
+
+
+def test_set_operations():
+    requirements = RequirementSet(["pandas>=1"])
+    combined = requirements | ["pytest"]
+    assert combined == ["pandas>=1", "pytest"]
+    assert requirements == ["pandas>=1"]
+    combined.discard("Pytest")
+    assert combined == RequirementSet(["pandas>=1"])
+
+
+def test_parse_requirement():
+    assert parse_requirement("pandas[sql] >= 1, <2; python_version>'3.8'") == (
+        "pandas",
+        ["sql"],
+        [">=1", "<2"],
+        "python_version>'3.8'",
+    )
+    assert parse_requirement("pkg @ https://example.com/pkg.zip") is None
+
+
+def test_parse_requirement_key():
+    assert parse_requirement_key("Pandas") == (("pandas", ""), True)
+    assert parse_requirement_key("pandas>=1; python_version < '3.9'") == (("pandas", 'python_version<"3.9"'), False)
+    assert parse_requirement_key("-e  .") == (("", "-e ."), False)
@@ -0,0 +1,30 @@
+import math
+
+import pytest
+from projen import Project
+
+from phito_projen.components.commentable_files.yaml_file import CommentableYamlFile
+
+yaml = pytest.importorskip("yaml")
+
+
+def round_trip(obj, tmp_path):
+    project = Project(name="test-project", outdir=str(tmp_path))
+    return yaml.safe_load(CommentableYamlFile(project, "test.yaml", obj=obj).synthesize_contents())
+
+
+def test_non_finite_floats_round_trip(tmp_path):
+    loaded = round_trip({"inf": float("inf"), "neg_inf": float("-inf"), "nan": float("nan")}, tmp_path)
+    assert loaded["inf"] == math.inf
+    assert loaded["neg_inf"] == -math.inf
+    assert math.isnan(loaded["nan"])
+
+
+@pytest.mark.parametrize("value", [".inf", "-.inf", ".NaN", "Infinity", "NaN", "1e3", "yes", "null", "a: b"])
+def test_strings_that_look_like_other_types_stay_strings(value, tmp_path):
+    assert round_trip({"key": value}, tmp_path) == {"key": value}
+
+
+def test_nested_values_round_trip(tmp_path):
+    obj = {"repos": [{"repo": "local", "hooks": [{"id": "black", "args": ["--line-length", 120]}]}], "empty": []}
+    assert round_trip(obj, tmp_path) == obj